@@ -0,0 +1,334 @@
+"""
+Hardware Autotune
+Benchmarks HandTracker on a short clip (with a hand in it), picks the best configuration that meets the
+latency target and caches it per CPU and camera in hardware_profiles.json
+"""
+
+import json
+import os
+import platform
+import time
+import cv2
+import numpy as np
+from core.hand_tracker import HandTracker
+from utils.logger import log_info, log_warning, log_error
+from utils.config import (
+    CAMERA_INDEX,
+    CAMERA_WIDTH,
+    CAMERA_HEIGHT,
+    FPS,
+    MODEL_COMPLEXITY,
+    HARDWARE_PROFILES_FILE,
+    AUTOTUNE_CLIP_PATH,
+    AUTOTUNE_LATENCY_TARGET_MS,
+    AUTOTUNE_FRAMES,
+    AUTOTUNE_WARMUP_FRAMES,
+    AUTOTUNE_MODEL_COMPLEXITIES,
+    AUTOTUNE_INFERENCE_SIZES,
+    AUTOTUNE_THREAD_COUNTS,
+    AUTOTUNE_FOURCCS
+)
+
+
+def get_cpu_name():
+	"""Human readable CPU model (falls back to the architecture name)"""
+	try:
+		with open("/proc/cpuinfo") as f:
+			for line in f:
+				if line.startswith("model name"):
+					return line.split(":", 1)[1].strip()
+	except OSError:
+		pass
+	return platform.processor() or platform.machine() or "unknown CPU"
+
+
+def get_camera_name(camera_index=CAMERA_INDEX):
+	"""Camera device name where the OS exposes it, otherwise its index"""
+	try:
+		with open(f"/sys/class/video4linux/video{camera_index}/name") as f:
+			return f.read().strip()
+	except OSError:
+		return f"Camera {camera_index}"
+
+
+def get_hardware_key(camera_index=CAMERA_INDEX):
+	"""Key a hardware profile is stored under"""
+	return f"{get_cpu_name()} | {get_camera_name(camera_index)}"
+
+
+def load_profile(key):
+	"""
+	Load the cached profile for this hardware
+
+	Args:
+		key: Value from get_hardware_key()
+
+	Returns:
+		Profile dictionary, or None if this hardware was never tuned
+	"""
+	try:
+		if os.path.exists(HARDWARE_PROFILES_FILE):
+			with open(HARDWARE_PROFILES_FILE, 'r') as f:
+				return json.load(f).get(key)
+	except Exception as e:
+		log_error("Error loading hardware profiles", e)
+	return None
+
+
+def save_profile(key, profile):
+	"""
+	Store a profile next to the other hardware profiles
+
+	Args:
+		key: Value from get_hardware_key()
+		profile: Dictionary produced by run_autotune()
+	"""
+	profiles = {}
+	try:
+		if os.path.exists(HARDWARE_PROFILES_FILE):
+			with open(HARDWARE_PROFILES_FILE, 'r') as f:
+				profiles = json.load(f)
+	except Exception as e:
+		log_warning(f"Hardware profiles unreadable, starting a new file: {e}")
+
+	profiles[key] = profile
+	try:
+		with open(HARDWARE_PROFILES_FILE, 'w') as f:
+			json.dump(profiles, f, indent=4)
+	except Exception as e:
+		log_error("Error saving hardware profile", e)
+
+
+def apply_cv_threads(thread_count):
+	"""Set OpenCV's worker thread count (None restores the OpenCV default)"""
+	cv2.setNumThreads(-1 if thread_count is None else thread_count)
+
+
+def record_clip(camera_index=CAMERA_INDEX, frame_count=AUTOTUNE_FRAMES):
+	"""
+	Record benchmark frames from the camera (the user's hand should be in view)
+
+	Returns:
+		List of BGR frames at camera resolution (empty if the camera could not be opened)
+	"""
+	frames = []
+	camera = cv2.VideoCapture(camera_index)
+	try:
+		if not camera.isOpened():
+			return frames
+		camera.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_WIDTH)
+		camera.set(cv2.CAP_PROP_FRAME_HEIGHT, CAMERA_HEIGHT)
+		for _ in range(AUTOTUNE_WARMUP_FRAMES):
+			camera.read()  # Let exposure settle
+		while len(frames) < frame_count:
+			success, frame = camera.read()
+			if not success:
+				break
+			frames.append(frame)
+	finally:
+		camera.release()
+	return frames
+
+
+def load_clip(path=AUTOTUNE_CLIP_PATH, frame_count=AUTOTUNE_FRAMES, camera_index=None):
+	"""
+	Frames to benchmark on - the bundled clip if present, otherwise a few seconds from the
+	camera, otherwise a synthetic one (which MediaPipe never finds a hand in)
+
+	Args:
+		path: Recorded clip
+		frame_count: Number of frames
+		camera_index: Camera to record from, or None to never open the camera
+
+	Returns:
+		List of BGR frames at camera resolution
+	"""
+	frames = []
+	if path and os.path.exists(path):
+		clip = cv2.VideoCapture(path)
+		while len(frames) < frame_count:
+			success, frame = clip.read()
+			if not success:
+				break
+			if frame.shape[:2] != (CAMERA_HEIGHT, CAMERA_WIDTH):
+				frame = cv2.resize(frame, (CAMERA_WIDTH, CAMERA_HEIGHT))
+			frames.append(frame)
+		clip.release()
+
+	if not frames and camera_index is not None:
+		frames = record_clip(camera_index, frame_count)
+
+	if frames:
+		return frames
+
+	# Synthetic clip: a skin-coloured palm with fingers sweeping across a noisy background
+	rng = np.random.default_rng(0)
+	background = rng.integers(40, 90, (CAMERA_HEIGHT, CAMERA_WIDTH, 3), dtype=np.uint8)
+	skin = (110, 150, 200)
+	for index in range(frame_count):
+		frame = background.copy()
+		phase = index / frame_count
+		center_x = int(CAMERA_WIDTH * (0.3 + 0.4 * phase))
+		center_y = int(CAMERA_HEIGHT * (0.6 + 0.1 * np.sin(phase * 2 * np.pi)))
+		cv2.ellipse(frame, (center_x, center_y), (60, 75), 0, 0, 360, skin, -1)
+		for finger in range(5):
+			angle = np.radians(-150 + finger * 30)
+			tip = (int(center_x + 150 * np.cos(angle)), int(center_y + 150 * np.sin(angle)))
+			cv2.line(frame, (center_x, center_y), tip, skin, 22)
+		frames.append(frame)
+	return frames
+
+
+def benchmark_tracker(tracker, frames):
+	"""
+	Time HandTracker.process_frame over a clip
+
+	Returns:
+		Tuple (90th percentile latency per frame in milliseconds, frames with a hand)
+	"""
+	timings = []
+	detections = 0
+	for index, frame in enumerate(frames):
+		start = time.perf_counter()
+		tracker.process_frame(frame)
+		if index >= AUTOTUNE_WARMUP_FRAMES:
+			timings.append((time.perf_counter() - start) * 1000)
+		if tracker.hand_detected:
+			detections += 1
+	return float(np.percentile(timings, 90)), detections
+
+
+def probe_fourcc(camera_index=CAMERA_INDEX):
+	"""
+	Find the capture format that delivers the highest frame rate
+
+	Returns:
+		FOURCC string, or None if the camera could not be opened
+	"""
+	best_fourcc = None
+	best_fps = 0.0
+	for fourcc in AUTOTUNE_FOURCCS:
+		camera = cv2.VideoCapture(camera_index)
+		try:
+			if not camera.isOpened():
+				return None
+			camera.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+			camera.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_WIDTH)
+			camera.set(cv2.CAP_PROP_FRAME_HEIGHT, CAMERA_HEIGHT)
+			camera.set(cv2.CAP_PROP_FPS, FPS)
+
+			# The driver silently keeps its own format when it does not support ours
+			if int(camera.get(cv2.CAP_PROP_FOURCC)) != cv2.VideoWriter_fourcc(*fourcc):
+				continue
+
+			for _ in range(AUTOTUNE_WARMUP_FRAMES):
+				camera.read()
+			start = time.perf_counter()
+			frames_read = 0
+			for _ in range(AUTOTUNE_FRAMES):
+				success, _frame = camera.read()
+				if success:
+					frames_read += 1
+			fps = frames_read / (time.perf_counter() - start)
+			log_info(f"Autotune: {fourcc} capture at {fps:.1f} FPS")
+
+			if fps > best_fps:
+				best_fourcc, best_fps = fourcc, fps
+		finally:
+			camera.release()
+	return best_fourcc
+
+
+def run_autotune(probe_camera=True, status_callback=None):
+	"""
+	Benchmark the tracker configurations and pick the best one for this machine
+
+	Args:
+		probe_camera: Also try the capture formats (the camera must not be in use)
+		status_callback: Optional function receiving progress messages
+
+	Returns:
+		Profile dictionary with 'model_complexity', 'inference', 'cv_threads',
+		'fourcc', 'latency_ms' and 'landmarks_timed'
+	"""
+	def report(message):
+		log_info(f"Autotune: {message}")
+		if status_callback:
+			status_callback(message)
+
+	if probe_camera:
+		report("recording - hold your hand in front of the camera")
+	frames = load_clip(camera_index=CAMERA_INDEX if probe_camera else None)
+	tracker = HandTracker()
+	tracker.motion_gate = None  # Every benchmark frame must reach the model
+	tracker.propagator = None
+
+	try:
+		# OpenCV threads only affect resizing and colour conversion, so tune them once
+		best_complexity = AUTOTUNE_MODEL_COMPLEXITIES[0]
+		best_size = AUTOTUNE_INFERENCE_SIZES[0]
+		tracker.set_model_complexity(best_complexity)
+		tracker.set_inference_size(*best_size)
+
+		cv_threads = None
+		best_latency = None
+		detections = 0
+		for thread_count in AUTOTUNE_THREAD_COUNTS:
+			report(f"testing {thread_count or 'default'} OpenCV threads")
+			apply_cv_threads(thread_count)
+			latency, found = benchmark_tracker(tracker, frames)
+			detections += found
+			if best_latency is None or latency < best_latency:
+				cv_threads, best_latency = thread_count, latency
+		apply_cv_threads(cv_threads)
+
+		# Without a hand only palm detection ran - the landmark models were never timed
+		landmarks_timed = detections > 0
+		model_complexities = AUTOTUNE_MODEL_COMPLEXITIES
+		if not landmarks_timed:
+			log_warning("Autotune: no hand in the benchmark clip, keeping the configured model complexity")
+			log_warning("Autotune: re-run it from Settings with a hand in view for a complete profile")
+			model_complexities = (MODEL_COMPLEXITY,)
+
+		# Candidates run from best to cheapest - keep the first that meets the target
+		chosen = None
+		fastest = None
+		for model_complexity in model_complexities:
+			tracker.set_model_complexity(model_complexity)
+			for size in AUTOTUNE_INFERENCE_SIZES:
+				report(f"testing model {model_complexity} at {size[0]}x{size[1]}")
+				tracker.set_inference_size(*size)
+				latency, _ = benchmark_tracker(tracker, frames)
+				candidate = (model_complexity, size, latency)
+
+				if fastest is None or latency < fastest[2]:
+					fastest = candidate
+				if latency <= AUTOTUNE_LATENCY_TARGET_MS:
+					chosen = candidate
+					break
+			if chosen:
+				break
+
+		if chosen is None:
+			log_warning(f"Autotune: nothing met {AUTOTUNE_LATENCY_TARGET_MS} ms, using the fastest configuration")
+			chosen = fastest
+	finally:
+		tracker.release()
+
+	fourcc = None
+	if probe_camera:
+		report("testing camera formats")
+		fourcc = probe_fourcc()
+
+	model_complexity, size, latency = chosen
+	profile = {
+		'model_complexity': model_complexity,
+		'inference': list(size),
+		'cv_threads': cv_threads,
+		'fourcc': fourcc,
+		'latency_ms': round(latency, 2),
+		'landmarks_timed': landmarks_timed,
+		'tuned_at': time.strftime("%Y-%m-%d %H:%M:%S")
+	}
+	report(f"model {model_complexity}, {size[0]}x{size[1]}, {latency:.1f} ms per frame")
+	return profile
@@ -0,0 +1,169 @@
+"""
+Pointer Calibration
+Fits a non-linear camera-to-desktop warp from fingertip samples at screen targets and bakes
+it into a lookup grid. Calibrations are cached per user and camera in calibrations.json.
+"""
+
+import getpass
+import json
+import os
+import time
+import numpy as np
+from core.autotune import get_camera_name
+from utils.logger import log_info, log_warning, log_error
+from utils.config import (
+    CAMERA_INDEX,
+    CALIBRATIONS_FILE,
+    CALIBRATION_GRID,
+    CALIBRATION_MARGIN,
+    CALIBRATION_LUT_SIZE,
+    LENS_DISTORTION
+)
+
+
+def get_calibration_key(camera_index=CAMERA_INDEX):
+	"""Key a calibration is stored under"""
+	return f"{getpass.getuser()} | {get_camera_name(camera_index)}"
+
+
+def load_calibration(key):
+	"""
+	Load the saved calibration for this user and camera
+
+	Args:
+		key: Value from get_calibration_key()
+
+	Returns:
+		Calibration dictionary, or None if there is none
+	"""
+	try:
+		if os.path.exists(CALIBRATIONS_FILE):
+			with open(CALIBRATIONS_FILE, 'r') as f:
+				return json.load(f).get(key)
+	except Exception as e:
+		log_error("Error loading calibrations", e)
+	return None
+
+
+def save_calibration(key, calibration):
+	"""
+	Store (or with None, remove) the calibration for this user and camera
+
+	Args:
+		key: Value from get_calibration_key()
+		calibration: Dictionary produced by create_calibration(), or None
+	"""
+	calibrations = {}
+	try:
+		if os.path.exists(CALIBRATIONS_FILE):
+			with open(CALIBRATIONS_FILE, 'r') as f:
+				calibrations = json.load(f)
+	except Exception as e:
+		log_warning(f"Calibrations unreadable, starting a new file: {e}")
+
+	if calibration is None:
+		calibrations.pop(key, None)
+	else:
+		calibrations[key] = calibration
+	try:
+		with open(CALIBRATIONS_FILE, 'w') as f:
+			json.dump(calibrations, f, indent=4)
+	except Exception as e:
+		log_error("Error saving calibration", e)
+
+
+def calibration_targets(grid=CALIBRATION_GRID, margin=CALIBRATION_MARGIN):
+	"""
+	Target positions in normalized desktop coordinates, row by row
+
+	Args:
+		grid: (columns, rows)
+		margin: Distance of the outer targets from the desktop edges (fraction)
+
+	Returns:
+		List of (x, y) in 0-1
+	"""
+	columns, rows = grid
+	xs = np.linspace(margin, 1 - margin, columns)
+	ys = np.linspace(margin, 1 - margin, rows)
+	return [(float(x), float(y)) for y in ys for x in xs]
+
+
+def _polynomial_terms(u, v):
+	"""Second-order polynomial terms of camera coordinates (arrays of any shape)"""
+	return np.stack([np.ones_like(u), u, v, u * v, u * u, v * v], axis=-1)
+
+
+def create_calibration(camera_points, screen_points, desktop_size):
+	"""
+	Fit the warp to recorded samples
+
+	Args:
+		camera_points: (N, 2) fingertip positions, normalized camera coordinates
+		screen_points: (N, 2) target positions, normalized desktop coordinates
+		desktop_size: (width, height) of the desktop in pixels (for the error report)
+
+	Returns:
+		Calibration dictionary ready for save_calibration() and CalibrationWarp
+	"""
+	camera_points = np.asarray(camera_points, dtype=np.float64)
+	screen_points = np.asarray(screen_points, dtype=np.float64)
+
+	terms = _polynomial_terms(camera_points[:, 0], camera_points[:, 1])
+	coefficients, _, _, _ = np.linalg.lstsq(terms, screen_points, rcond=None)
+
+	residuals = (terms @ coefficients - screen_points) * desktop_size
+	rms_error = float(np.sqrt(np.mean(np.sum(residuals ** 2, axis=1))))
+	log_info(f"Calibration fitted on {len(camera_points)} targets, RMS error {rms_error:.1f} px")
+
+	return {
+		'coefficients': coefficients.T.tolist(),
+		'camera_points': camera_points.tolist(),
+		'screen_points': screen_points.tolist(),
+		'rms_error_px': rms_error,
+		'lens_distortion': list(LENS_DISTORTION) if LENS_DISTORTION else None,
+		'calibrated_at': time.strftime("%Y-%m-%d %H:%M:%S")
+	}
+
+
+class CalibrationWarp:
+	"""Calibrated warp baked into a dense grid, looked up bilinearly per frame"""
+
+	def __init__(self, coefficients, lut_size=CALIBRATION_LUT_SIZE):
+		# coefficients: (2, 6) polynomial coefficients for desktop x and y
+		self.columns, self.rows = lut_size  # Lookup grid over the camera frame
+		u, v = np.meshgrid(np.linspace(0, 1, self.columns), np.linspace(0, 1, self.rows))
+		# Unclipped, so cells at the desktop edges interpolate correctly (lookup clips the result)
+		self.table = _polynomial_terms(u, v) @ np.asarray(coefficients, dtype=np.float64).T
+		self.max_u = self.columns - 1
+		self.max_v = self.rows - 1
+
+	@classmethod
+	def from_calibration(cls, calibration):
+		"""Build the lookup grid of a stored calibration"""
+		return cls(calibration['coefficients'])
+
+	def lookup(self, u, v):
+		"""
+		Warp a camera position
+
+		Args:
+			u, v: Normalized camera coordinates
+
+		Returns:
+			Tuple (x, y) of normalized desktop coordinates
+		"""
+		gu = min(max(u, 0.0), 1.0) * self.max_u
+		gv = min(max(v, 0.0), 1.0) * self.max_v
+		column = min(int(gu), self.max_u - 1)
+		row = min(int(gv), self.max_v - 1)
+		fu = gu - column
+		fv = gv - row
+
+		cell = self.table[row:row + 2, column:column + 2]
+		top = cell[0, 0] + (cell[0, 1] - cell[0, 0]) * fu
+		bottom = cell[1, 0] + (cell[1, 1] - cell[1, 0]) * fu
+		x, y = top + (bottom - top) * fv
+
+		# Desktop positions beyond the edges are never reachable anyway
+		return min(max(float(x), 0.0), 1.0), min(max(float(y), 0.0), 1.0)
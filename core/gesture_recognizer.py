@@ -1,67 +1,184 @@
 """
 Gesture Recognition Module
 Identifies hand gestures based on finger positions and timing
+Gestures are rows of config.GESTURE_TABLE, checked in priority order with every pose feature
+computed on first use only
 """
 
-import time
 from utils import config
+from utils.logger import log_warning
+from utils.smoothing import GestureDebouncer, PinchPredictor
+from core.hand_landmarks import THUMB_TIP, INDEX_TIP, MIDDLE_TIP, RING_TIP, PINKY_TIP
 from utils.config import (
     GESTURE_NONE,
-    GESTURE_MOVE,
-    GESTURE_CLICK,
-    GESTURE_DOUBLE_CLICK,
-    GESTURE_RIGHT_CLICK,
-    GESTURE_DRAG,
-    GESTURE_SCROLL
+    GESTURE_MOVE
 )
 
+# Finger names used by pinch poses
+FINGER_TIPS = {
+	'thumb': THUMB_TIP,
+	'index': INDEX_TIP,
+	'middle': MIDDLE_TIP,
+	'ring': RING_TIP,
+	'pinky': PINKY_TIP
+}
+
+# When a row reports its gesture
+EMIT_ENTER = "enter"  # Once when the pose starts
+EMIT_HOLD = "hold"  # Every frame while the pose is held
+EMIT_RELEASE = "release"  # Once when the pose ends
+EMIT_MODES = (EMIT_ENTER, EMIT_HOLD, EMIT_RELEASE)
+
+
+class FrameFeatures:
+	"""Pose features of the current frame, each computed at most once"""
+
+	def __init__(self, hand_tracker):
+		self.hand_tracker = hand_tracker
+		self.cache = {}
+
+	def clear(self):
+		"""Start a new frame"""
+		self.cache.clear()
+
+	def distance(self, finger1_id, finger2_id):
+		"""Fingertip distance ratio (None without a hand)"""
+		key = (finger1_id, finger2_id)
+		if key not in self.cache:
+			self.cache[key] = self.hand_tracker.calculate_distance(finger1_id, finger2_id)
+		return self.cache[key]
+
+	def fist_closed(self):
+		"""Whether the hand is a clenched fist"""
+		if 'fist' not in self.cache:
+			self.cache['fist'] = self.hand_tracker.is_fist_closed()
+		return self.cache['fist']
+
+
+def compile_pose(pose):
+	"""
+	Turn a pose description into a predicate on FrameFeatures
+
+	Args:
+		pose: ("pinch", finger, finger) or ("fist",)
+
+	Returns:
+		Tuple (predicate, fingers) - fingers are the pinched landmark IDs, or None
+	"""
+	if pose[0] == 'pinch':
+		finger1, finger2 = FINGER_TIPS[pose[1]], FINGER_TIPS[pose[2]]
+
+		def pinching(features):
+			distance = features.distance(finger1, finger2)
+			return distance is not None and distance < config.PINCH_THRESHOLD
+
+		return pinching, (finger1, finger2)
+
+	if pose[0] == 'fist':
+		return FrameFeatures.fist_closed, None
+
+	raise ValueError(f"unknown pose {pose[0]!r}")
+
+
+class GestureRule:
+	"""One compiled row of the gesture table"""
+
+	def __init__(self, definition):
+		self.name = definition['name']
+		self.gesture = definition['gesture']
+		self.emit = definition.get('emit', EMIT_HOLD)
+		self.timing = definition.get('timing')  # Prefix of the *_ENTER_MS / *_EXIT_MS settings
+		self.enter_ms = definition.get('enter_ms', 0)
+		self.exit_ms = definition.get('exit_ms', 0)
+		self.double_gesture = definition.get('double')
+		self.press_gesture = definition.get('press')
+		self.button = definition.get('button')
+		self.predicate, self.fingers = compile_pose(definition['pose'])
+
+		if self.emit not in EMIT_MODES:
+			raise ValueError(f"unknown emit mode {self.emit!r}")
+		if self.press_gesture and self.fingers is None:
+			raise ValueError("click on press needs a pinch pose")
+
+		self.debouncer = GestureDebouncer(0, 0)
+		self.last_release_time = None  # For the double gesture
+		self.apply_timings()
+
+	def apply_timings(self):
+		"""Pick up changed *_ENTER_MS / *_EXIT_MS values from config"""
+		if self.timing:
+			self.enter_ms = getattr(config, f'{self.timing}_ENTER_MS')
+			self.exit_ms = getattr(config, f'{self.timing}_EXIT_MS')
+		self.debouncer.enter_ms = self.enter_ms
+		self.debouncer.exit_ms = self.exit_ms
+
+
+def compile_gesture_table(table):
+	"""
+	Compile gesture definitions into rules (invalid rows are skipped with a warning)
+
+	Args:
+		table: List of definitions, highest priority first (see GESTURE_TABLE)
+
+	Returns:
+		List of GestureRule in priority order
+	"""
+	rules = []
+	for definition in table:
+		try:
+			rules.append(GestureRule(definition))
+		except Exception as e:
+			log_warning(f"Skipping gesture {definition.get('name', definition)}: {e}")
+	return rules
+
 
 class GestureRecognizer:
 	"""Recognizes gestures from hand landmark data"""
-	
-	def __init__(self, hand_tracker):
+
+	def __init__(self, hand_tracker, table=None):
 		self.hand_tracker = hand_tracker
-		
-		# Timing trackers
-		self.pinch_start_time = None
-		self.last_click_time = None
-		self.click_count = 0
-		
+		self.features = FrameFeatures(hand_tracker)
+
 		# State trackers
-		self.is_dragging = False
-		self.was_pinched = False
-		self.last_pinch_type = None
 		self.current_gesture = GESTURE_NONE
-		
-		# Scroll state (fist-based)
-		self.is_scrolling = False
-		self.scroll_neutral_y = None  # Y position where fist was clenched
-		
-		# Drag stability
-		self.drag_pinch_frames = 0  # Count consecutive pinch frames
-		self.drag_release_frames = 0  # Count consecutive release frames
-		self.DRAG_START_FRAMES = 3  # Need 3 frames to start drag
-		self.DRAG_STOP_FRAMES = 6  # Need 6 frames to stop drag
-		
-		# Landmark IDs for fingertips
-		self.THUMB_TIP = 4
-		self.INDEX_TIP = 8
-		self.MIDDLE_TIP = 12
-		self.RING_TIP = 16
-		self.PINKY_TIP = 20
-	
+
+		# Hold/release timing per row, in priority order (milliseconds, see apply_timings)
+		self.rules = compile_gesture_table(config.GESTURE_TABLE if table is None else table)
+
+		# Gestures that click a button of their own (added through the table)
+		self.custom_buttons = {rule.gesture: rule.button for rule in self.rules if rule.button}
+
+		# Click on press: pinch onset predicted from the closing speed
+		self.press_rule = next((rule for rule in self.rules if rule.press_gesture), None)
+		self.pinch_predictor = PinchPredictor()
+		self.predicted_press_time = None  # When the current unconfirmed prediction started
+		self.presses_predicted = 0
+		self.presses_cancelled = 0
+
+	def apply_timings(self):
+		"""Pick up changed *_ENTER_MS / *_EXIT_MS values from config"""
+		for rule in self.rules:
+			rule.apply_timings()
+
+	def _reset_rules(self, first=0):
+		"""
+		Reset the rules from a priority on, so e.g. letting go of a right-click pinch never
+		fires a left click
+
+		Args:
+			first: Index of the first rule to reset
+		"""
+		for rule in self.rules[first:]:
+			rule.debouncer.reset()
+			if rule is self.press_rule:
+				self.pinch_predictor.reset()
+				self.predicted_press_time = None
+
 	def _reset_state(self):
 		"""Reset all gesture tracking state"""
-		self.pinch_start_time = None
-		self.is_dragging = False
-		self.was_pinched = False
-		self.last_pinch_type = None
+		self._reset_rules()
 		self.current_gesture = GESTURE_NONE
-		self.is_scrolling = False
-		self.scroll_neutral_y = None
-		self.drag_pinch_frames = 0
-		self.drag_release_frames = 0
-	
+
 	def is_pinching(self, finger1_id, finger2_id):
 		"""
 		Check if two fingers are pinching together
@@ -74,12 +191,12 @@ class GestureRecognizer:
 			Boolean - True if pinching, False otherwise
 		"""
 		distance = self.hand_tracker.calculate_distance(finger1_id, finger2_id)
-		
+
 		if distance is None:
 			return False
-		
+
 		return distance < config.PINCH_THRESHOLD
-	
+
 	def recognize_gesture(self):
 		"""
 		Main method to identify current gesture
@@ -90,123 +207,102 @@ class GestureRecognizer:
 		if not self.hand_tracker.hand_detected:
 			self._reset_state()
 			return GESTURE_NONE
-		
-		current_time = time.time()
-		
-		# Check for different pinch combinations
-		thumb_index_pinch = self.is_pinching(self.THUMB_TIP, self.INDEX_TIP)
-		thumb_middle_pinch = self.is_pinching(self.THUMB_TIP, self.MIDDLE_TIP)
-		thumb_ring_pinch = self.is_pinching(self.THUMB_TIP, self.RING_TIP)
-		thumb_pinky_pinch = self.is_pinching(self.THUMB_TIP, self.PINKY_TIP)
-		
-		# Priority 1: Right-click (thumb + middle)
-		if thumb_middle_pinch:
-			if not self.was_pinched:
-				self.current_gesture = GESTURE_RIGHT_CLICK
-				self.was_pinched = True
-				self.last_pinch_type = "middle"
-				return GESTURE_RIGHT_CLICK
-			return GESTURE_NONE
-		
-		# Priority 2: Scroll (clenched fist)
-		is_fist = self.hand_tracker.is_fist_closed()
-		
-		if is_fist:
-			if not self.is_scrolling:
-				# Just clenched fist - record neutral position (wrist Y)
-				self.is_scrolling = True
-			# Neutral position will be set in mouse controller
-			
-			self.current_gesture = GESTURE_SCROLL
-			return GESTURE_SCROLL
-		else:
-			# Fist opened - stop scrolling
-			if self.is_scrolling:
-				self.is_scrolling = False
-				self.scroll_neutral_y = None
-		
-		# Priority 3: Drag (thumb + pinky) - STABLE DRAG
-		if thumb_pinky_pinch:
-			# Pinch detected - increment counter, reset release counter
-			self.drag_pinch_frames += 1
-			self.drag_release_frames = 0
-			
-			# If not dragging yet, check if we've held pinch long enough
-			if not self.is_dragging:
-				if self.drag_pinch_frames >= self.DRAG_START_FRAMES:
-					# Held pinch for required frames - start drag
-					self.is_dragging = True
-					self.was_pinched = True
-					self.last_pinch_type = "pinky"
-					self.current_gesture = GESTURE_DRAG
-					return GESTURE_DRAG
-				else:
-					# Still building up to drag
-					return GESTURE_NONE
-			else:
-				# Already dragging, continue
-				self.current_gesture = GESTURE_DRAG
-				return GESTURE_DRAG
-		
-		# Pinch NOT detected - handle drag release
-		if self.is_dragging and self.last_pinch_type == "pinky":
-			# Increment release counter
-			self.drag_release_frames += 1
-			self.drag_pinch_frames = 0
-			
-			# Check if released long enough to stop drag
-			if self.drag_release_frames >= self.DRAG_STOP_FRAMES:
-				# Released for required frames - stop drag
-				self.is_dragging = False
-				self.was_pinched = False
-				self.last_pinch_type = None
-				self.drag_pinch_frames = 0
-				self.drag_release_frames = 0
-				self.current_gesture = GESTURE_NONE
-				return GESTURE_NONE
-			else:
-				# Might be temporary loss - keep dragging
-				self.current_gesture = GESTURE_DRAG
-				return GESTURE_DRAG
-		
-		# Priority 4: Click (thumb + index) - SIMPLIFIED, no timing
-		if thumb_index_pinch:
-			if not self.was_pinched:
-				self.was_pinched = True
-				self.last_pinch_type = "index"
-				self.pinch_start_time = current_time
-			# Don't return click yet - wait for release
-			return GESTURE_NONE
-		
-		# No pinch currently active - check if we just released one
-		if self.was_pinched:
-			# Released from click (index)
-			if self.last_pinch_type == "index":
-				# Check for double-click
-				if self.last_click_time and (current_time - self.last_click_time) < config.DOUBLE_CLICK_TIME:
-					# Double-click detected!
-					self.current_gesture = GESTURE_DOUBLE_CLICK
-					self.last_click_time = None
-					self.was_pinched = False
-					self.last_pinch_type = None
-					return GESTURE_DOUBLE_CLICK
-				else:
-					# Single click
-					self.current_gesture = GESTURE_CLICK
-					self.last_click_time = current_time
-					self.was_pinched = False
-					self.last_pinch_type = None
-					return GESTURE_CLICK
-			
-			# Released from middle or ring pinch - just reset
-			else:
-				self.was_pinched = False
-				self.last_pinch_type = None
-		
+
+		# Hold and release times are measured on the camera clock, not in frames
+		timestamp = self.hand_tracker.frame_timestamp
+		self.features.clear()
+
+		# Rows below the first one that claims the frame are reset without looking at their pose
+		for index, rule in enumerate(self.rules):
+			rule.debouncer.update(rule.predicate(self.features), timestamp)
+			gesture = self._evaluate(rule, timestamp)
+			if gesture is not None:
+				self._reset_rules(index + 1)
+				self.current_gesture = gesture
+				return gesture
+
 		# No gesture detected - just move cursor
 		self.current_gesture = GESTURE_MOVE
 		return GESTURE_MOVE
-		
+
+	def _evaluate(self, rule, timestamp):
+		"""
+		Check whether a rule claims the current frame
+
+		Returns:
+			Gesture to report (GESTURE_NONE while waiting for a release), or None to fall through
+		"""
+		if rule is self.press_rule and config.CLICK_ON_PRESS:
+			return self._evaluate_press(rule, timestamp)
+
+		pose = rule.debouncer
+		if pose.active:
+			if rule.emit == EMIT_HOLD:
+				return rule.gesture
+			if rule.emit == EMIT_ENTER and pose.entered:
+				return rule.gesture
+			return GESTURE_NONE
+
+		if pose.exited and rule.emit == EMIT_RELEASE:
+			if rule.double_gesture:
+				# Check for double-click
+				if rule.last_release_time is not None and (timestamp - rule.last_release_time) < config.DOUBLE_CLICK_TIME:
+					rule.last_release_time = None
+					return rule.double_gesture
+				rule.last_release_time = timestamp
+			return rule.gesture
+
+		return None
+
+	def _evaluate_press(self, rule, timestamp):
+		"""
+		Click-on-press variant of a pinch rule: held for exactly as long as the pinch
+		A predicted pinch only skips the enter hold - the press still waits for the fingers to
+		touch, so a prediction that does not come true never reaches the mouse
+
+		Returns:
+			The press gesture while the pinch is closed, else None
+		"""
+		pose = rule.debouncer
+		if config.PINCH_PREDICTION_ENABLED and not pose.active:
+			# Velocity comes from the landmark capture times, not the newest frame
+			self.pinch_predictor.update(self.features.distance(*rule.fingers), self.hand_tracker.timestamp)
+
+			if self.predicted_press_time is None and self.pinch_predictor.will_close(config.PINCH_THRESHOLD):
+				self.predicted_press_time = timestamp
+				self.presses_predicted += 1
+
+			if self.predicted_press_time is not None:
+				expired = (timestamp - self.predicted_press_time) * 1000 > config.PINCH_PREDICTION_TIMEOUT_MS
+				if rule.predicate(self.features):
+					pose.enter_now()  # Closed as predicted - no need to sit out the hold
+				elif self.pinch_predictor.is_opening() or expired:
+					# Fingers separated without pinching - nothing was pressed
+					self.predicted_press_time = None
+					self.presses_cancelled += 1
+
+		if pose.active:
+			# Confirmed (or never predicted) - the next pinch starts from a fresh history
+			self.predicted_press_time = None
+			self.pinch_predictor.reset()
+			return rule.press_gesture
+
+		return None
+
+	def get_stats(self):
+		"""
+		Get recognizer statistics
+
+		Returns:
+			Dictionary with predicted and cancelled press counts (click-on-press prediction only)
+		"""
+		if not (config.CLICK_ON_PRESS and config.PINCH_PREDICTION_ENABLED):
+			return {}
+		return {
+			'presses_predicted': self.presses_predicted,
+			'presses_cancelled': self.presses_cancelled
+		}
+
 	def get_current_gesture(self):
 		"""
 		Get the most recently recognized gesture
@@ -215,4 +311,3 @@ class GestureRecognizer:
 			String representing current gesture state
 		"""
 		return self.current_gesture
-		
\ No newline at end of file
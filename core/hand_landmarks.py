@@ -0,0 +1,98 @@
+"""
+Hand Landmark Data
+Contiguous NumPy representation of the 21 MediaPipe hand landmarks
+"""
+
+import numpy as np
+
+NUM_LANDMARKS = 21
+
+# Landmark IDs
+WRIST = 0
+THUMB_TIP = 4
+INDEX_KNUCKLE = 5
+INDEX_TIP = 8
+MIDDLE_KNUCKLE = 9
+MIDDLE_TIP = 12
+RING_KNUCKLE = 13
+RING_TIP = 16
+PINKY_KNUCKLE = 17
+PINKY_TIP = 20
+
+FINGERTIPS = (THUMB_TIP, INDEX_TIP, MIDDLE_TIP, RING_TIP, PINKY_TIP)
+
+# Skeleton connections (same topology as mp.solutions.hands.HAND_CONNECTIONS)
+HAND_CONNECTIONS = (
+	(0, 1), (1, 2), (2, 3), (3, 4),          # Thumb
+	(0, 5), (5, 6), (6, 7), (7, 8),          # Index
+	(5, 9), (9, 10), (10, 11), (11, 12),     # Middle
+	(9, 13), (13, 14), (14, 15), (15, 16),   # Ring
+	(13, 17), (0, 17), (17, 18), (18, 19), (19, 20)  # Pinky and palm
+)
+
+
+def landmarks_to_array(landmark_list):
+	"""
+	Convert a MediaPipe NormalizedLandmarkList into a (21, 3) array
+
+	Args:
+		landmark_list: MediaPipe hand landmarks (protobuf)
+
+	Returns:
+		float32 array of normalized (x, y, z) coordinates
+	"""
+	return np.array(
+		[(lm.x, lm.y, lm.z) for lm in landmark_list.landmark],
+		dtype=np.float32
+	)
+
+
+def pairwise_distances(points):
+	"""
+	Euclidean (x, y) distance between every pair of landmarks
+	Works on a single hand (21, 3) or a batch of hands (N, 21, 3)
+
+	Args:
+		points: Landmark array(s) in normalized coordinates
+
+	Returns:
+		Distance matrix of shape (21, 21) or (N, 21, 21)
+	"""
+	xy = points[..., :2]
+	diff = xy[..., :, np.newaxis, :] - xy[..., np.newaxis, :, :]
+	return np.sqrt(np.einsum('...ijk,...ijk->...ij', diff, diff))
+
+
+class HandLandmarks:
+	"""Landmarks of one detected hand with lazily computed pairwise distances"""
+
+	def __init__(self, points, handedness=None):
+		self.points = np.ascontiguousarray(points, dtype=np.float32)
+		self.handedness = handedness
+		self._distances = None
+
+	@property
+	def distances(self):
+		"""21x21 distance matrix, computed on first use"""
+		if self._distances is None:
+			self._distances = pairwise_distances(self.points)
+		return self._distances
+
+	def distance(self, landmark1_id, landmark2_id):
+		"""
+		Distance between two landmarks
+
+		Returns:
+			Distance as ratio (0.0-1.0)
+		"""
+		return float(self.distances[landmark1_id, landmark2_id])
+
+	def position(self, landmark_id, frame_width, frame_height):
+		"""
+		Pixel coordinates of a landmark
+
+		Returns:
+			Tuple (x, y) in pixel coordinates
+		"""
+		x, y = self.points[landmark_id, :2]
+		return int(x * frame_width), int(y * frame_height)
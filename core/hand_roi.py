@@ -0,0 +1,113 @@
+"""
+Hand Region of Interest
+Chooses the part of the camera frame handed to MediaPipe and maps landmarks back
+"""
+
+import numpy as np
+from utils.config import (
+    INFERENCE_WIDTH,
+    INFERENCE_HEIGHT,
+    ROI_PADDING,
+    ROI_MIN_SIZE,
+    ROI_MAX_AREA
+)
+
+
+class HandROI:
+	"""Tracks a padded bounding box around the hand from the last landmarks"""
+
+	def __init__(self, enabled=True):
+		self.enabled = enabled
+		self.aspect = INFERENCE_WIDTH / INFERENCE_HEIGHT
+		self.last_points = None  # Raw full-frame normalized landmarks of the last detection
+
+	def update(self, points):
+		"""
+		Remember where the hand was (or forget it)
+
+		Args:
+			points: (21, 3) full-frame normalized landmarks, or None if the hand was lost
+		"""
+		self.last_points = None if points is None else points[:, :2].copy()
+
+	def select(self, frame_width, frame_height):
+		"""
+		Pick the region for the next inference
+
+		Args:
+			frame_width: Camera frame width in pixels
+			frame_height: Camera frame height in pixels
+
+		Returns:
+			Tuple (x0, y0, x1, y1) in pixels, or None for the full frame
+		"""
+		if not self.enabled or self.last_points is None:
+			return None
+
+		# Hand bounding box in pixels
+		xs = self.last_points[:, 0] * frame_width
+		ys = self.last_points[:, 1] * frame_height
+		center_x = (xs.min() + xs.max()) / 2
+		center_y = (ys.min() + ys.max()) / 2
+		box_size = max(xs.max() - xs.min(), ys.max() - ys.min())
+
+		# Pad it and match the inference aspect ratio so the hand is not distorted
+		height = max(box_size * (1 + 2 * ROI_PADDING), frame_height * ROI_MIN_SIZE)
+		width = height * self.aspect
+		if width > frame_width or height > frame_height:
+			return None
+
+		# Most of the frame anyway - not worth cropping
+		if (width * height) / (frame_width * frame_height) > ROI_MAX_AREA:
+			return None
+
+		# Shift (not shrink) the box to keep it inside the frame
+		x0 = int(np.clip(center_x - width / 2, 0, frame_width - width))
+		y0 = int(np.clip(center_y - height / 2, 0, frame_height - height))
+		return x0, y0, x0 + int(width), y0 + int(height)
+
+	def full_frame(self, frame_width, frame_height):
+		"""
+		Letterbox region for a full-frame inference, so a frame of another aspect ratio
+		(e.g. a 16:9 webcam) is padded instead of squashed
+
+		Args:
+			frame_width: Camera frame width in pixels
+			frame_height: Camera frame height in pixels
+
+		Returns:
+			Tuple (x0, y0, x1, y1) reaching past the frame edges, or None if the aspect matches
+		"""
+		if abs(frame_width / frame_height - self.aspect) < 1e-3:
+			return None
+
+		# Grow the short side to the inference aspect, frame centered
+		width = max(frame_width, frame_height * self.aspect)
+		height = width / self.aspect
+		x0 = (frame_width - width) / 2
+		y0 = (frame_height - height) / 2
+		return x0, y0, x0 + width, y0 + height
+
+	# noinspection PyMethodMayBeStatic
+	def to_frame(self, points, roi, frame_width, frame_height):
+		"""
+		Map landmarks from region coordinates back to full-frame normalized coordinates
+
+		Args:
+			points: (21, 3) landmarks normalized to the region (modified in place)
+			roi: Region used for inference (crop or letterbox), or None for the full frame
+			frame_width: Camera frame width in pixels
+			frame_height: Camera frame height in pixels
+
+		Returns:
+			The same array, now in full-frame coordinates
+		"""
+		if roi is None:
+			return points
+
+		x0, y0, x1, y1 = roi
+		region_width = x1 - x0
+		points[:, 0] = (x0 + points[:, 0] * region_width) / frame_width
+		points[:, 1] = (y0 + points[:, 1] * (y1 - y0)) / frame_height
+		points[:, 2] *= region_width / frame_width  # z uses the same scale as x
+		return points
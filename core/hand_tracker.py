@@ -3,75 +3,317 @@ Hand Tracking Module
 Uses MediaPipe to detect hand landmarks and calculate finger positions
 """
 
+import time
+from collections import deque
 import cv2
-import mediapipe as mp
 import numpy as np
+from core.hand_landmarks import (
+    HandLandmarks,
+    WRIST,
+    THUMB_TIP,
+    INDEX_KNUCKLE,
+    INDEX_TIP,
+    MIDDLE_KNUCKLE,
+    MIDDLE_TIP,
+    RING_KNUCKLE,
+    RING_TIP,
+    PINKY_KNUCKLE,
+    PINKY_TIP
+)
+from core.tracker_backends import create_tracker_backend
+from core.motion_gate import MotionGate
+from core.hand_roi import HandROI
+from core.landmark_propagator import LandmarkPropagator
+from core.lens_undistorter import LensUndistorter
+from utils.frame_pool import reserve_buffer
+from utils.smoothing import MovementSmoother, SMOOTHING_ONE_EURO
 from utils.config import (
-    MIN_DETECTION_CONFIDENCE,
-    MIN_TRACKING_CONFIDENCE,
-    MAX_NUM_HANDS
+    MIRROR_IN_LANDMARK_SPACE,
+    TRACKER_BACKEND,
+    MOTION_GATE_ENABLED,
+    INFERENCE_WIDTH,
+    INFERENCE_HEIGHT,
+    ENABLE_HAND_ROI,
+    INFERENCE_INTERVAL,
+    SMOOTHING_MODE
 )
 
 
 class HandTracker:
 	"""Detects and tracks hand landmarks using MediaPipe"""
 	
-	def __init__(self):
-		# Initialize MediaPipe Hands
-		self.mp_hands = mp.solutions.hands
-		self.mp_draw = mp.solutions.drawing_utils
-		self.mp_drawing_styles = mp.solutions.drawing_styles
+	# Fingertips and their knuckles, used for fist detection
+	FIST_TIPS = [INDEX_TIP, MIDDLE_TIP, RING_TIP, PINKY_TIP]
+	FIST_KNUCKLES = [INDEX_KNUCKLE, MIDDLE_KNUCKLE, RING_KNUCKLE, PINKY_KNUCKLE]
+	
+	def __init__(self, mirror=MIRROR_IN_LANDMARK_SPACE, backend=TRACKER_BACKEND):
+		# Mirror x coordinates of landmarks (frames arrive unflipped)
+		self.mirror = mirror
+		
+		# Inference backend (legacy graph, worker process or Tasks live stream)
+		self.backend = create_tracker_backend(backend)
+		
+		# Skip inference while nothing moves in front of the camera
+		self.motion_gate = MotionGate() if MOTION_GATE_ENABLED else None
+		
+		# Optical flow between inferences (asynchronous backends are already pipelined)
+		self.propagator = None
+		if INFERENCE_INTERVAL > 1 and not self.backend.is_async:
+			self.propagator = LandmarkPropagator(INFERENCE_INTERVAL)
 		
-		# Create hands detector
-		self.hands = self.mp_hands.Hands(
-			static_image_mode=False,
-			max_num_hands=MAX_NUM_HANDS,
-			min_detection_confidence=MIN_DETECTION_CONFIDENCE,
-			min_tracking_confidence=MIN_TRACKING_CONFIDENCE
-		)
+		# Inference input: crop around the hand (or the whole frame) scaled to a fixed size
+		self.roi = HandROI(ENABLE_HAND_ROI)
+		self.inference_size = (INFERENCE_WIDTH, INFERENCE_HEIGHT)
+		self.resize_buffer = None
+		self.letterbox_buffer = None  # Full frame scaled to fit inside the inference size
+		self.pending_rois = deque()  # (timestamp_ms, roi) of frames an async backend is still working on
+		self.last_timestamp_ms = -1
+		self.frames_inferred = 0
+		self.frames_cropped = 0
+		
+		# Webcam lens correction of the landmark points (None = uncorrected)
+		self.undistorter = None
+		
+		# One Euro filter over all 21 landmarks (None when the cursor uses the plain EMA)
+		self.smoother = MovementSmoother() if SMOOTHING_MODE == SMOOTHING_ONE_EURO else None
 		
 		# Store latest hand landmarks
-		self.landmarks = None
+		self.hand_landmarks = None  # HandLandmarks array of the latest detection
 		self.hand_detected = False
+		self.handedness = None  # "Left" or "Right" as seen by the user
+		self.timestamp = None  # Capture time (seconds) of the frame the landmarks came from
+		self.frame_timestamp = None  # Capture time of the newest frame processed (landmarks may be older)
 	
-	def process_frame(self, frame):
+	def process_frame(self, frame, timestamp=None):
 		"""
 		Process a video frame to detect hands
+		Only produces landmark data - the skeleton is drawn by the preview
 
 		Args:
 			frame: BGR image from camera (OpenCV format)
+			timestamp: Capture time in time.monotonic() seconds (defaults to now)
 
 		Returns:
-			Processed frame with hand landmarks drawn
+			The unmodified frame
 		"""
-		# Convert BGR to RGB (MediaPipe uses RGB)
-		rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+		if timestamp is None:
+			timestamp = time.monotonic()
+		self.frame_timestamp = timestamp
+		
+		# Cameras do not always deliver the requested resolution
+		if self.undistorter is not None:
+			self.undistorter.set_aspect(frame.shape[1] / frame.shape[0])
+		
+		# Static scene - keep the previous landmarks (and their timestamp)
+		if self.motion_gate is not None and not self.motion_gate.should_infer(frame, timestamp):
+			return frame
+		
+		# In-between frame - follow the tracked landmarks by optical flow
+		if self.propagator is not None and not self.propagator.needs_inference():
+			points = self.propagator.propagate(frame)
+			if points is not None:
+				self.timestamp = timestamp
+				self.roi.update(points)
+				self._publish(points, self.propagator.handedness)
+				return frame
+			# Flow error too high - fall through to a full inference
 		
-		# Process the frame to find hands
-		results = self.hands.process(rgb_frame)
+		# Backends need strictly increasing timestamps to match results to frames
+		timestamp_ms = max(int(timestamp * 1000), self.last_timestamp_ms + 1)
+		self.last_timestamp_ms = timestamp_ms
+		
+		frame_height, frame_width = frame.shape[:2]
+		roi = self.roi.select(frame_width, frame_height)
+		result = self._infer(frame, roi, timestamp_ms)
+		
+		if result is not None and result.points is None and roi is not None and not self.backend.is_async:
+			# Hand left the crop - fall back to full-frame detection right away
+			self.last_timestamp_ms += 1
+			result = self._infer(frame, None, self.last_timestamp_ms)
+		
+		# Asynchronous backends may answer with an earlier frame, or not at all yet
+		if result is None:
+			return frame
+		
+		self.timestamp = result.timestamp_ms / 1000.0
 		
 		# Check if any hands were detected
-		# noinspection PyUnresolvedReferences
-		if results.multi_hand_landmarks:
-			self.hand_detected = True
-			# Take first hand (we only track one hand)
-			# noinspection PyUnresolvedReferences
-			self.landmarks = results.multi_hand_landmarks[0]
-			
-			# Draw hand landmarks on the frame
-			self.mp_draw.draw_landmarks(
-				frame,
-				self.landmarks,
-				self.mp_hands.HAND_CONNECTIONS,
-				self.mp_drawing_styles.get_default_hand_landmarks_style(),
-				self.mp_drawing_styles.get_default_hand_connections_style()
-			)
+		if result.points is not None:
+			points = self.roi.to_frame(result.points, self._pop_roi(result.timestamp_ms), frame_width, frame_height)
+			self.roi.update(points)
+			if self.propagator is not None:
+				self.propagator.anchor(frame, points, result.handedness)
+			self._publish(points, result.handedness)
 		else:
+			self._pop_roi(result.timestamp_ms)
+			if self.propagator is not None:
+				self.propagator.reset()
+			if self.smoother is not None:
+				self.smoother.reset()
+			self.roi.update(None)  # Next frame searches the full frame
 			self.hand_detected = False
-			self.landmarks = None
+			self.hand_landmarks = None
+			self.handedness = None
 		
 		return frame
 	
+	def _infer(self, frame, roi, timestamp_ms):
+		"""
+		Send a region of the frame to the backend at inference resolution
+
+		Args:
+			frame: BGR camera frame
+			roi: (x0, y0, x1, y1) region in pixels, or None for the full frame
+			timestamp_ms: Frame timestamp in milliseconds
+
+		Returns:
+			TrackerResult from the backend (or None)
+		"""
+		width, height = self.inference_size
+		letterbox = None
+		if roi is None:
+			letterbox = self.roi.full_frame(frame.shape[1], frame.shape[0])
+		region = frame if roi is None else frame[roi[1]:roi[3], roi[0]:roi[2]]
+		
+		if letterbox is not None:
+			# Full frame of another aspect ratio - scale it to fit and pad with black
+			scale = width / (letterbox[2] - letterbox[0])
+			offset_x = int(round(-letterbox[0] * scale))
+			offset_y = int(round(-letterbox[1] * scale))
+			fit_width = min(int(round(frame.shape[1] * scale)), width - offset_x)
+			fit_height = min(int(round(frame.shape[0] * scale)), height - offset_y)
+			self.letterbox_buffer = reserve_buffer(self.letterbox_buffer, (fit_height, fit_width, 3))
+			cv2.resize(frame, (fit_width, fit_height), dst=self.letterbox_buffer, interpolation=cv2.INTER_AREA)
+			self.resize_buffer = reserve_buffer(self.resize_buffer, (height, width, 3))
+			self.resize_buffer.fill(0)
+			self.resize_buffer[offset_y:offset_y + fit_height, offset_x:offset_x + fit_width] = self.letterbox_buffer
+			region = self.resize_buffer
+		
+		elif region.shape[1] != width or region.shape[0] != height:
+			# Crop or downscale into a fixed-size buffer (no per-frame allocation)
+			self.resize_buffer = reserve_buffer(self.resize_buffer, (height, width, 3))
+			cv2.resize(region, (width, height), dst=self.resize_buffer, interpolation=cv2.INTER_AREA)
+			region = self.resize_buffer
+		
+		# Convert BGR to RGB (MediaPipe uses RGB) straight into the backend's input buffer
+		input_buffer = self.backend.get_input_buffer(region.shape)
+		cv2.cvtColor(region, cv2.COLOR_BGR2RGB, dst=input_buffer)
+		
+		# Results are mapped back through the letterbox like through a crop
+		self.pending_rois.append((timestamp_ms, roi if letterbox is None else letterbox))
+		self.frames_inferred += 1
+		if roi is not None:
+			self.frames_cropped += 1
+		
+		return self.backend.process(timestamp_ms)
+	
+	def set_inference_size(self, width, height):
+		"""
+		Change the image size handed to MediaPipe
+
+		Args:
+			width: Inference width in pixels
+			height: Inference height in pixels
+		"""
+		self.inference_size = (width, height)
+		self.roi.aspect = width / height
+	
+	def set_model_complexity(self, model_complexity):
+		"""
+		Switch the MediaPipe landmark model
+
+		Args:
+			model_complexity: 0 = lite, 1 = full
+		"""
+		self.backend.set_model_complexity(model_complexity)
+	
+	def set_lens_distortion(self, distortion):
+		"""
+		Correct landmarks for the webcam lens
+
+		Args:
+			distortion: OpenCV coefficients (k1, k2, p1, p2[, k3]), or None to turn correction off
+		"""
+		self.undistorter = LensUndistorter(distortion) if distortion else None
+	
+	def set_smoothing_factor(self, smoothing_factor):
+		"""
+		Update the landmark filter from the smoothing slider
+
+		Args:
+			smoothing_factor: 0 = no smoothing, 1 = max smoothing
+		"""
+		if self.smoother is not None:
+			self.smoother.smoothing_factor = smoothing_factor
+	
+	def _pop_roi(self, timestamp_ms):
+		"""
+		Find the region a result was computed on and forget older ones
+
+		Args:
+			timestamp_ms: Timestamp of the finished frame
+
+		Returns:
+			The region used for that frame, or None for the full frame
+		"""
+		while self.pending_rois:
+			pending_timestamp, roi = self.pending_rois.popleft()
+			if pending_timestamp >= timestamp_ms:
+				return roi
+		return None
+	
+	def get_stats(self):
+		"""
+		Get tracker statistics
+
+		Returns:
+			Dictionary with tracker counters
+		"""
+		stats = self.backend.get_stats()
+		if self.motion_gate is not None:
+			stats['skip_rate'] = self.motion_gate.get_skip_rate()
+		if self.propagator is not None:
+			stats['flow_rate'] = self.propagator.get_propagation_rate()
+			stats['flow_reanchors'] = self.propagator.reanchors
+		if self.frames_inferred:
+			stats['roi_rate'] = self.frames_cropped / self.frames_inferred
+		return stats
+	
+	def _publish(self, points, handedness):
+		"""
+		Store a new detection as a HandLandmarks array
+
+		Args:
+			points: (21, 3) normalized landmark array as produced by MediaPipe
+			handedness: MediaPipe handedness label
+		"""
+		if self.undistorter is not None:
+			# Lens geometry applies to raw camera coordinates, before mirroring
+			self.undistorter.undistort(points)
+		
+		if self.mirror:
+			# Mirror in coordinate space (frame was never flipped)
+			points[:, 0] = 1.0 - points[:, 0]
+			
+			# MediaPipe assumes a mirrored image, so labels must be swapped too
+			handedness = self._swap_handedness(handedness)
+		
+		if self.smoother is not None:
+			self.smoother.smooth_points(points, self.timestamp)
+		
+		self.handedness = handedness
+		self.hand_landmarks = HandLandmarks(points, handedness)
+		self.hand_detected = True
+	
+	# noinspection PyMethodMayBeStatic
+	def _swap_handedness(self, label):
+		"""Swap a MediaPipe handedness label ("Left" <-> "Right")"""
+		if label == "Left":
+			return "Right"
+		if label == "Right":
+			return "Left"
+		return label
+	
 	def get_landmark_position(self, landmark_id, frame_width, frame_height):
 		"""
 		Get screen coordinates of a specific landmark
@@ -84,17 +326,12 @@ class HandTracker:
 		Returns:
 			Tuple (x, y) in pixel coordinates, or None if not detected
 		"""
-		if not self.hand_detected or self.landmarks is None:
+		hand = self.hand_landmarks
+		if not self.hand_detected or hand is None:
 			return None
 		
-		# Get the landmark
-		landmark = self.landmarks.landmark[landmark_id]
-		
 		# Convert normalized coordinates (0.0-1.0) to pixel coordinates
-		x = int(landmark.x * frame_width)
-		y = int(landmark.y * frame_height)
-		
-		return (x, y)
+		return hand.position(landmark_id, frame_width, frame_height)
 	
 	def calculate_distance(self, landmark1_id, landmark2_id):
 		"""
@@ -108,21 +345,12 @@ class HandTracker:
 		Returns:
 			Distance as ratio (0.0-1.0), or None if not detected
 		"""
-		if not self.hand_detected or self.landmarks is None:
+		hand = self.hand_landmarks
+		if not self.hand_detected or hand is None:
 			return None
 		
-		# Get both landmarks
-		lm1 = self.landmarks.landmark[landmark1_id]
-		lm2 = self.landmarks.landmark[landmark2_id]
-		
-		# Calculate Euclidean distance (straight line)
-		# Using normalized coordinates (0.0-1.0), so no frame dimensions needed
-		distance = np.sqrt(
-			(lm1.x - lm2.x) ** 2 +
-			(lm1.y - lm2.y) ** 2
-		)
-		
-		return distance
+		# Read from the cached distance matrix (normalized coordinates, no frame dimensions needed)
+		return hand.distance(landmark1_id, landmark2_id)
 	
 	def get_fingertip_positions(self, frame_width, frame_height):
 		"""
@@ -135,11 +363,11 @@ class HandTracker:
 			return None
 		
 		fingertips = {
-			'thumb': self.get_landmark_position(4, frame_width, frame_height),
-			'index': self.get_landmark_position(8, frame_width, frame_height),
-			'middle': self.get_landmark_position(12, frame_width, frame_height),
-			'ring': self.get_landmark_position(16, frame_width, frame_height),
-			'pinky': self.get_landmark_position(20, frame_width, frame_height)
+			'thumb': self.get_landmark_position(THUMB_TIP, frame_width, frame_height),
+			'index': self.get_landmark_position(INDEX_TIP, frame_width, frame_height),
+			'middle': self.get_landmark_position(MIDDLE_TIP, frame_width, frame_height),
+			'ring': self.get_landmark_position(RING_TIP, frame_width, frame_height),
+			'pinky': self.get_landmark_position(PINKY_TIP, frame_width, frame_height)
 		}
 		
 		return fingertips
@@ -151,46 +379,25 @@ class HandTracker:
 		Returns:
 			Boolean - True if fist is closed
 		"""
-		if not self.hand_detected or self.landmarks is None:
+		hand = self.hand_landmarks
+		if not self.hand_detected or hand is None:
 			return False
 		
-		# Get wrist position (landmark 0) as reference
-		wrist = self.landmarks.landmark[0]
-		
-		# Get fingertip positions
-		thumb_tip = self.landmarks.landmark[4]
-		index_tip = self.landmarks.landmark[8]
-		middle_tip = self.landmarks.landmark[12]
-		ring_tip = self.landmarks.landmark[16]
-		pinky_tip = self.landmarks.landmark[20]
-		
-		# Get knuckle positions (base of fingers)
-		index_knuckle = self.landmarks.landmark[5]
-		middle_knuckle = self.landmarks.landmark[9]
-		ring_knuckle = self.landmarks.landmark[13]
-		pinky_knuckle = self.landmarks.landmark[17]
+		points = hand.points
 		
 		# Check if fingertips are below or at same level as knuckles (closed fingers)
 		# In camera coordinates, Y increases downward
-		index_closed = index_tip.y >= index_knuckle.y
-		middle_closed = middle_tip.y >= middle_knuckle.y
-		ring_closed = ring_tip.y >= ring_knuckle.y
-		pinky_closed = pinky_tip.y >= pinky_knuckle.y
+		fingers_closed = points[self.FIST_TIPS, 1] >= points[self.FIST_KNUCKLES, 1]
 		
 		# Thumb check - should be close to palm
-		thumb_to_wrist_dist = np.sqrt(
-			(thumb_tip.x - wrist.x) ** 2 +
-			(thumb_tip.y - wrist.y) ** 2
-		)
-		thumb_closed = thumb_to_wrist_dist < 0.15  # Threshold for thumb
+		thumb_closed = hand.distance(THUMB_TIP, WRIST) < 0.15  # Threshold for thumb
 		
 		# Fist is closed if at least 4 out of 5 fingers are closed
-		closed_count = sum([index_closed, middle_closed, ring_closed, pinky_closed, thumb_closed])
+		closed_count = int(np.count_nonzero(fingers_closed)) + int(thumb_closed)
 		
 		return closed_count >= 4
 	
 	def release(self):
 		"""Clean up resources"""
-		if self.hands:
-			self.hands.close()
+		self.backend.close()
 
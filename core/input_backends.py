@@ -0,0 +1,297 @@
+"""
+Input Injection Backends
+Interchangeable ways of sending mouse events to the OS behind one small interface
+"""
+
+import ctypes
+import sys
+import time
+from abc import ABC, abstractmethod
+from utils.logger import log_info, log_warning
+from utils.config import INPUT_BACKEND
+
+# Backend names (INPUT_BACKEND values)
+INPUT_PYAUTOGUI = "pyautogui"
+INPUT_XTEST = "xtest"
+INPUT_UINPUT = "uinput"
+INPUT_RECORDING = "recording"
+
+# Win32 mouse_event horizontal wheel (positive = right, amount in raw wheel-delta units)
+MOUSEEVENTF_HWHEEL = 0x1000
+
+
+class InputBackend(ABC):
+	"""
+	Base class for mouse injection backends
+	Buttons are 'left', 'right' or 'middle'; positive scroll amounts scroll up
+	"""
+
+	@abstractmethod
+	def size(self):
+		"""Screen size as (width, height)"""
+
+	@abstractmethod
+	def position(self):
+		"""Current cursor position as (x, y)"""
+
+	@abstractmethod
+	def move_to(self, x, y):
+		"""Move the cursor to an absolute screen position"""
+
+	def click(self, button='left', clicks=1):
+		"""Press and release a button one or more times"""
+		for _ in range(clicks):
+			self.button_down(button)
+			self.button_up(button)
+
+	@abstractmethod
+	def button_down(self, button='left'):
+		"""Press and hold a button"""
+
+	@abstractmethod
+	def button_up(self, button='left'):
+		"""Release a button"""
+
+	@abstractmethod
+	def scroll(self, amount):
+		"""Scroll vertically in the backend's wheel units (raw wheel-delta units for pyautogui on Windows)"""
+
+	@abstractmethod
+	def hscroll(self, amount):
+		"""Scroll horizontally in the same units as scroll (positive = right)"""
+
+	def close(self):
+		"""Release backend resources"""
+		pass
+
+
+class PyAutoGUIBackend(InputBackend):
+	"""Cross-platform pyautogui (keeps its fail-safe corner)"""
+
+	def __init__(self):
+		import pyautogui
+		self.pyautogui = pyautogui
+
+		# Safety settings
+		pyautogui.FAILSAFE = True  # Move mouse to corner to abort
+		pyautogui.PAUSE = 0  # The output thread paces itself; a pause would cap it below OUTPUT_RATE_HZ
+
+	def size(self):
+		return tuple(self.pyautogui.size())
+
+	def position(self):
+		return tuple(self.pyautogui.position())
+
+	def move_to(self, x, y):
+		self.pyautogui.moveTo(x, y, duration=0)
+
+	def click(self, button='left', clicks=1):
+		self.pyautogui.click(button=button, clicks=clicks)
+
+	def button_down(self, button='left'):
+		self.pyautogui.mouseDown(button=button)
+
+	def button_up(self, button='left'):
+		self.pyautogui.mouseUp(button=button)
+
+	def scroll(self, amount):
+		self.pyautogui.scroll(amount)
+
+	def hscroll(self, amount):
+		if sys.platform == 'win32':
+			# pyautogui's Windows hscroll sends a vertical wheel event - send a real horizontal one,
+			# passing the amount through unscaled like pyautogui.scroll does
+			ctypes.windll.user32.mouse_event(MOUSEEVENTF_HWHEEL, 0, 0, int(amount), 0)
+		else:
+			self.pyautogui.hscroll(amount)
+
+
+class XTestBackend(InputBackend):
+	"""X11 XTest extension through python-xlib (no per-call sleeps or checks)"""
+
+	BUTTONS = {'left': 1, 'middle': 2, 'right': 3}
+	SCROLL_UP = 4
+	SCROLL_DOWN = 5
+	SCROLL_LEFT = 6
+	SCROLL_RIGHT = 7
+
+	def __init__(self):
+		# Output, tracking and UI threads share the connection - make python-xlib lock it
+		import Xlib.threaded  # noqa: F401
+		from Xlib import X, display
+		from Xlib.ext import xtest
+		self.X = X
+		self.xtest = xtest
+		self.display = display.Display()
+		if not self.display.has_extension('XTEST'):
+			raise RuntimeError("X server has no XTEST extension")
+		self.root = self.display.screen().root
+
+	def size(self):
+		screen = self.display.screen()
+		return screen.width_in_pixels, screen.height_in_pixels
+
+	def position(self):
+		pointer = self.root.query_pointer()
+		return pointer.root_x, pointer.root_y
+
+	def move_to(self, x, y):
+		self.xtest.fake_input(self.display, self.X.MotionNotify, x=int(x), y=int(y))
+		self.display.flush()
+
+	def button_down(self, button='left'):
+		self.xtest.fake_input(self.display, self.X.ButtonPress, self.BUTTONS[button])
+		self.display.flush()
+
+	def button_up(self, button='left'):
+		self.xtest.fake_input(self.display, self.X.ButtonRelease, self.BUTTONS[button])
+		self.display.flush()
+
+	def scroll(self, amount):
+		# X11 scrolls with button 4/5 presses, one per wheel step
+		self._press_wheel(self.SCROLL_UP if amount > 0 else self.SCROLL_DOWN, amount)
+
+	def hscroll(self, amount):
+		self._press_wheel(self.SCROLL_RIGHT if amount > 0 else self.SCROLL_LEFT, amount)
+
+	def _press_wheel(self, wheel, amount):
+		"""Click a wheel button once per step"""
+		for _ in range(abs(int(amount))):
+			self.xtest.fake_input(self.display, self.X.ButtonPress, wheel)
+			self.xtest.fake_input(self.display, self.X.ButtonRelease, wheel)
+		self.display.flush()
+
+	def close(self):
+		self.display.close()
+
+
+class UInputBackend(InputBackend):
+	"""
+	Linux uinput virtual pointer through python-evdev
+	Works under X11 and Wayland; needs write access to /dev/uinput
+	"""
+
+	def __init__(self, screen_width, screen_height):
+		from evdev import UInput, AbsInfo, ecodes
+		self.ecodes = ecodes
+		self.screen_width = screen_width
+		self.screen_height = screen_height
+		self.cursor = (0, 0)  # uinput cannot read the cursor back
+
+		self.buttons = {'left': ecodes.BTN_LEFT, 'middle': ecodes.BTN_MIDDLE, 'right': ecodes.BTN_RIGHT}
+		capabilities = {
+			ecodes.EV_KEY: list(self.buttons.values()),
+			ecodes.EV_ABS: [
+				(ecodes.ABS_X, AbsInfo(0, 0, screen_width - 1, 0, 0, 0)),
+				(ecodes.ABS_Y, AbsInfo(0, 0, screen_height - 1, 0, 0, 0))
+			],
+			ecodes.EV_REL: [ecodes.REL_WHEEL, ecodes.REL_HWHEEL]
+		}
+		self.device = UInput(capabilities, name="hand-mouse-controller")
+
+	def size(self):
+		return self.screen_width, self.screen_height
+
+	def position(self):
+		return self.cursor
+
+	def move_to(self, x, y):
+		self.device.write(self.ecodes.EV_ABS, self.ecodes.ABS_X, int(x))
+		self.device.write(self.ecodes.EV_ABS, self.ecodes.ABS_Y, int(y))
+		self.device.syn()
+		self.cursor = (int(x), int(y))
+
+	def button_down(self, button='left'):
+		self.device.write(self.ecodes.EV_KEY, self.buttons[button], 1)
+		self.device.syn()
+
+	def button_up(self, button='left'):
+		self.device.write(self.ecodes.EV_KEY, self.buttons[button], 0)
+		self.device.syn()
+
+	def scroll(self, amount):
+		self.device.write(self.ecodes.EV_REL, self.ecodes.REL_WHEEL, int(amount))
+		self.device.syn()
+
+	def hscroll(self, amount):
+		self.device.write(self.ecodes.EV_REL, self.ecodes.REL_HWHEEL, int(amount))
+		self.device.syn()
+
+	def close(self):
+		self.device.close()
+
+
+class RecordingBackend(InputBackend):
+	"""
+	Injects nothing - keeps timestamped events in memory for tests and benchmarks
+	Each entry is (time.monotonic(), kind, arguments)
+	"""
+
+	def __init__(self, screen_width=1920, screen_height=1080):
+		self.screen_width = screen_width
+		self.screen_height = screen_height
+		self.cursor = (0, 0)
+		self.events = []
+
+	def _record(self, kind, *arguments):
+		self.events.append((time.monotonic(), kind, arguments))
+
+	def size(self):
+		return self.screen_width, self.screen_height
+
+	def position(self):
+		return self.cursor
+
+	def move_to(self, x, y):
+		self.cursor = (int(x), int(y))
+		self._record('move', *self.cursor)
+
+	def click(self, button='left', clicks=1):
+		self._record('click', button, clicks)
+
+	def button_down(self, button='left'):
+		self._record('down', button)
+
+	def button_up(self, button='left'):
+		self._record('up', button)
+
+	def scroll(self, amount):
+		self._record('scroll', amount)
+
+	def hscroll(self, amount):
+		self._record('hscroll', amount)
+
+	def clear(self):
+		"""Forget the recorded events"""
+		self.events.clear()
+
+
+def create_input_backend(screen_width, screen_height, name=INPUT_BACKEND):
+	"""
+	Create the configured input backend
+
+	Args:
+		screen_width: Screen width (used by backends that cannot query it)
+		screen_height: Screen height
+		name: "pyautogui", "xtest", "uinput" or "recording"
+
+	Returns:
+		InputBackend instance (falls back to "pyautogui" if the choice is unavailable)
+	"""
+	if name == INPUT_RECORDING:
+		log_info("Mouse input backend: recording (no events reach the OS)")
+		return RecordingBackend(screen_width, screen_height)
+
+	if name in (INPUT_XTEST, INPUT_UINPUT):
+		try:
+			if name == INPUT_XTEST:
+				backend = XTestBackend()
+			else:
+				backend = UInputBackend(screen_width, screen_height)
+			log_info(f"Mouse input backend: {name}")
+			return backend
+		except Exception as e:
+			log_warning(f"Could not start {name} input backend: {e}")
+			log_warning("Falling back to pyautogui")
+
+	return PyAutoGUIBackend()
@@ -0,0 +1,129 @@
+"""
+Landmark Propagator
+Carries landmarks forward with pyramidal Lucas-Kanade optical flow between MediaPipe
+inferences, so full inference only has to run every INFERENCE_INTERVAL frames
+"""
+
+import cv2
+import numpy as np
+from core.hand_landmarks import WRIST, FINGERTIPS
+from utils.config import (
+    INFERENCE_INTERVAL,
+    FLOW_SIZE,
+    FLOW_WINDOW,
+    FLOW_PYRAMID_LEVELS,
+    FLOW_MAX_ERROR
+)
+
+
+class LandmarkPropagator:
+	"""Tracks the wrist and fingertips by optical flow from the last inferred frame"""
+
+	# Landmarks the cursor, click and scroll logic depend on
+	TRACKED = [WRIST] + list(FINGERTIPS)
+
+	def __init__(self, interval=INFERENCE_INTERVAL):
+		self.interval = interval
+		self.width, self.height = FLOW_SIZE
+		self.scale = np.array([self.width, self.height], dtype=np.float32)
+
+		# Preallocated working buffers
+		self.small_buffer = np.empty((self.height, self.width, 3), dtype=np.uint8)
+		self.previous_gray = np.empty((self.height, self.width), dtype=np.uint8)
+		self.current_gray = np.empty((self.height, self.width), dtype=np.uint8)
+
+		self.points = None  # Raw full-frame normalized landmarks of the last frame
+		self.handedness = None  # Raw MediaPipe label of the anchoring detection
+		self.frames_since_inference = 0
+
+		# Statistics
+		self.frames_seen = 0
+		self.frames_propagated = 0
+		self.reanchors = 0
+
+	def _to_gray(self, frame, destination):
+		"""Downscale a BGR frame to grayscale flow resolution"""
+		cv2.resize(frame, (self.width, self.height), dst=self.small_buffer, interpolation=cv2.INTER_AREA)
+		cv2.cvtColor(self.small_buffer, cv2.COLOR_BGR2GRAY, dst=destination)
+
+	def needs_inference(self):
+		"""
+		Check whether the next frame must go through MediaPipe
+
+		Returns:
+			True if there is no anchor or the inference interval is used up
+		"""
+		self.frames_seen += 1
+		return self.points is None or self.frames_since_inference >= self.interval - 1
+
+	def anchor(self, frame, points, handedness):
+		"""
+		Start propagating from a fresh detection
+
+		Args:
+			frame: BGR frame the detection was computed on
+			points: (21, 3) raw full-frame normalized landmarks (copied)
+			handedness: Raw MediaPipe handedness label
+		"""
+		self._to_gray(frame, self.previous_gray)
+		self.points = points.copy()
+		self.handedness = handedness
+		self.frames_since_inference = 0
+
+	def propagate(self, frame):
+		"""
+		Move the landmarks along the optical flow to this frame
+
+		Args:
+			frame: BGR camera frame
+
+		Returns:
+			(21, 3) raw landmark array, or None if the flow is unreliable and the
+			frame needs a full inference instead
+		"""
+		self._to_gray(frame, self.current_gray)
+
+		previous = (self.points[self.TRACKED, :2] * self.scale).reshape(-1, 1, 2)
+		tracked, status, error = cv2.calcOpticalFlowPyrLK(
+			self.previous_gray,
+			self.current_gray,
+			previous,
+			None,
+			winSize=FLOW_WINDOW,
+			maxLevel=FLOW_PYRAMID_LEVELS
+		)
+
+		if tracked is None or not status.all() or error.max() > FLOW_MAX_ERROR:
+			# Lost a point or blurred too much - re-anchor with MediaPipe
+			self.reanchors += 1
+			self.points = None
+			return None
+
+		displacement = (tracked - previous).reshape(-1, 2) / self.scale
+
+		# Tracked points follow their own flow, the rest move with the hand as a whole
+		self.points[:, :2] += displacement.mean(axis=0)
+		self.points[self.TRACKED, :2] = tracked.reshape(-1, 2) / self.scale
+
+		# Flow is frame to frame, so this frame becomes the reference
+		self.previous_gray, self.current_gray = self.current_gray, self.previous_gray
+		self.frames_since_inference += 1
+		self.frames_propagated += 1
+		return self.points.copy()
+
+	def reset(self):
+		"""Forget the anchor so the next frame is inferred"""
+		self.points = None
+		self.handedness = None
+		self.frames_since_inference = 0
+
+	def get_propagation_rate(self):
+		"""
+		Fraction of frames served by optical flow instead of MediaPipe
+
+		Returns:
+			Propagation rate (0.0-1.0)
+		"""
+		if self.frames_seen == 0:
+			return 0.0
+		return self.frames_propagated / self.frames_seen
@@ -0,0 +1,52 @@
+"""
+Lens Undistorter
+Corrects webcam lens distortion on the 21 landmark points instead of remapping whole frames
+"""
+
+import cv2
+import numpy as np
+from core.hand_landmarks import NUM_LANDMARKS
+from utils.config import CAMERA_WIDTH, CAMERA_HEIGHT, CAMERA_HORIZONTAL_FOV
+
+
+class LensUndistorter:
+	"""Removes webcam lens distortion from landmark points (the frame itself is never remapped)"""
+
+	def __init__(self, distortion, fov=CAMERA_HORIZONTAL_FOV, aspect=CAMERA_WIDTH / CAMERA_HEIGHT):
+		# distortion: OpenCV coefficients (k1, k2, p1, p2[, k3]), fov: horizontal degrees
+		# Camera matrix in units of the frame width, so it holds at every capture resolution
+		self.focal = 0.5 / np.tan(np.radians(fov) / 2)
+		self.aspect = None
+		self.camera_matrix = None
+		self.distortion = np.asarray(distortion, dtype=np.float64)
+		self.buffer = np.empty((NUM_LANDMARKS, 1, 2), dtype=np.float64)
+		self.set_aspect(aspect)
+
+	def set_aspect(self, aspect):
+		"""
+		Match the camera matrix to the delivered frame shape (cheap when unchanged)
+
+		Args:
+			aspect: Frame width / height
+		"""
+		if aspect == self.aspect:
+			return
+		self.aspect = aspect
+		self.camera_matrix = np.array([
+			[self.focal, 0, 0.5],
+			[0, self.focal, 0.5 / aspect],
+			[0, 0, 1]
+		], dtype=np.float64)
+
+	def undistort(self, points):
+		"""
+		Undistort raw (unmirrored) normalized landmarks in place
+
+		Args:
+			points: (21, 3) landmark array
+		"""
+		self.buffer[:, 0, 0] = points[:, 0]
+		self.buffer[:, 0, 1] = points[:, 1] / self.aspect
+		undistorted = cv2.undistortPoints(self.buffer, self.camera_matrix, self.distortion, P=self.camera_matrix)
+		points[:, 0] = undistorted[:, 0, 0]
+		points[:, 1] = undistorted[:, 0, 1] * self.aspect
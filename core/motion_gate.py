@@ -0,0 +1,87 @@
+"""
+Motion Gate
+Skips hand inference when the scene has not changed since the last inferred frame
+"""
+
+import cv2
+import numpy as np
+from utils.config import (
+    MOTION_GATE_SIZE,
+    MOTION_PIXEL_THRESHOLD,
+    MOTION_AREA_THRESHOLD,
+    MOTION_GATE_MAX_STALENESS
+)
+
+
+class MotionGate:
+	"""Cheap downsampled frame difference in front of MediaPipe"""
+
+	def __init__(self):
+		self.width, self.height = MOTION_GATE_SIZE
+		shape = (self.height, self.width)
+
+		# Preallocated working buffers
+		self.small_buffer = np.empty((self.height, self.width, 3), dtype=np.uint8)
+		self.gray_buffer = np.empty(shape, dtype=np.uint8)
+		self.reference = np.empty(shape, dtype=np.uint8)
+		self.diff_buffer = np.empty(shape, dtype=np.uint8)
+		self.has_reference = False
+		self.last_inference_time = None
+
+		# Statistics
+		self.frames_seen = 0
+		self.frames_skipped = 0
+
+	def should_infer(self, frame, timestamp):
+		"""
+		Decide whether a frame needs full inference
+
+		Args:
+			frame: BGR camera frame
+			timestamp: Capture time in seconds
+
+		Returns:
+			True to run inference, False to reuse the previous landmarks
+		"""
+		self.frames_seen += 1
+
+		cv2.resize(frame, (self.width, self.height), dst=self.small_buffer, interpolation=cv2.INTER_AREA)
+		cv2.cvtColor(self.small_buffer, cv2.COLOR_BGR2GRAY, dst=self.gray_buffer)
+
+		# Always refresh after the staleness bound, even if nothing moved
+		stale = (
+			self.last_inference_time is None or
+			timestamp - self.last_inference_time >= MOTION_GATE_MAX_STALENESS
+		)
+
+		if self.has_reference and not stale:
+			# Fraction of pixels that changed noticeably since the last inferred frame
+			cv2.absdiff(self.gray_buffer, self.reference, dst=self.diff_buffer)
+			cv2.threshold(self.diff_buffer, MOTION_PIXEL_THRESHOLD, 255, cv2.THRESH_BINARY, dst=self.diff_buffer)
+			changed = cv2.countNonZero(self.diff_buffer) / self.diff_buffer.size
+
+			if changed < MOTION_AREA_THRESHOLD:
+				self.frames_skipped += 1
+				return False
+
+		# Compare future frames against this one
+		self.gray_buffer, self.reference = self.reference, self.gray_buffer
+		self.has_reference = True
+		self.last_inference_time = timestamp
+		return True
+
+	def reset(self):
+		"""Forget the reference frame so the next frame is always inferred"""
+		self.has_reference = False
+		self.last_inference_time = None
+
+	def get_skip_rate(self):
+		"""
+		Fraction of frames that skipped inference
+
+		Returns:
+			Skip rate (0.0-1.0)
+		"""
+		if self.frames_seen == 0:
+			return 0.0
+		return self.frames_skipped / self.frames_seen
@@ -3,9 +3,11 @@ Mouse Controller Module
 Executes mouse actions based on recognized gestures
 """
 
-import pyautogui
+import time
 import numpy as np
-from utils.smoothing import MovementSmoother
+from utils.smoothing import MovementSmoother, CursorPredictor, SMOOTHING_ONE_EURO
+from core.mouse_output import MouseOutput
+from core.screen_layout import ScreenTransform
 from utils import config
 from utils.config import (
     GESTURE_NONE,
@@ -14,35 +16,56 @@ from utils.config import (
     GESTURE_DOUBLE_CLICK,
     GESTURE_RIGHT_CLICK,
     GESTURE_DRAG,
-    GESTURE_SCROLL
+    GESTURE_SCROLL,
+    GESTURE_CLUTCH,
+    GESTURE_PRESS
 )
 
+# Pointer modes (POINTER_MODE values)
+POINTER_ABSOLUTE = "absolute"
+POINTER_RELATIVE = "relative"
+
 
 class MouseController:
 	"""Controls mouse based on hand gestures"""
 	
-	def __init__(self, hand_tracker, gesture_recognizer, camera_width, camera_height):
+	def __init__(self, hand_tracker, gesture_recognizer, camera_width, camera_height, input_backend, screen_layout):
 		self.hand_tracker = hand_tracker
 		self.gesture_recognizer = gesture_recognizer
 		self.camera_width = camera_width
 		self.camera_height = camera_height
 		
-		# Get screen dimensions
-		self.screen_width, self.screen_height = pyautogui.size()
+		# Monitor layout - the camera-to-desktop transform is rebuilt only when it changes
+		self.screen_layout = screen_layout
+		self.transform = None
+		self.layout_version = None
+		self.calibration = None  # CalibrationWarp of this user and camera, if calibrated
+		self.screen_width, self.screen_height = screen_layout.get_primary_size()
 		
 		# Initialize movement smoother
 		self.smoother = MovementSmoother()
 		
+		# Extrapolates the cursor over the pipeline latency
+		self.predictor = CursorPredictor()
+		
+		# Relative pointer state
+		self.input_backend = input_backend
+		self.cursor_position = None  # Float cursor position driven by hand velocity
+		self.last_hand_position = None  # Normalized index tip of the previous frame
+		self.last_hand_timestamp = None
+		
 		# Scroll state (fist-based joystick)
+		self.scroll_neutral_x = None
 		self.scroll_neutral_y = None  # Neutral position when fist clenched
 		self.is_scroll_active = False
 		
 		# Drag state tracking
 		self.is_mouse_button_down = False
+		self.is_click_down = False  # Left button held by a click-on-press pinch
 		
-		# Safety settings
-		pyautogui.FAILSAFE = True  # Move mouse to corner to abort
-		pyautogui.PAUSE = 0.01  # Small pause between actions
+		# Events are injected by the output thread, never by the tracking loop
+		self.output = MouseOutput(input_backend)
+		self.output.start()
 	
 	def map_hand_to_screen(self, hand_x, hand_y):
 		"""
@@ -55,27 +78,36 @@ class MouseController:
 		Returns:
 			Tuple of (screen_x, screen_y)
 		"""
-		# Define the active area in camera view (reduced for comfort)
-		active_width = self.camera_width * config.SCREEN_REDUCTION_FACTOR
-		active_height = self.camera_height * config.SCREEN_REDUCTION_FACTOR
-		
-		# Center the active area
-		offset_x = (self.camera_width - active_width) / 2
-		offset_y = (self.camera_height - active_height) / 2
-		
-		# Normalize hand position within active area
-		normalized_x = (hand_x - offset_x) / active_width
-		normalized_y = (hand_y - offset_y) / active_height
-		
-		# Clamp to 0-1 range
-		normalized_x = np.clip(normalized_x, 0, 1)
-		normalized_y = np.clip(normalized_y, 0, 1)
-		
-		# Map to screen coordinates
-		screen_x = normalized_x * self.screen_width
-		screen_y = normalized_y * self.screen_height
-		
-		return int(screen_x), int(screen_y)
+		return self.get_transform().map(hand_x, hand_y)
+	
+	def set_calibration(self, warp):
+		"""
+		Use a calibrated camera-to-desktop warp
+
+		Args:
+			warp: CalibrationWarp, or None for the centered active area
+		"""
+		self.calibration = warp
+		self.layout_version = None  # Rebuild the transform on the next frame
+	
+	def get_transform(self):
+		"""
+		Camera-to-desktop transform for the current monitor layout
+
+		Returns:
+			ScreenTransform (rebuilt only after a layout change)
+		"""
+		if self.layout_version != self.screen_layout.version:
+			self.layout_version = self.screen_layout.version
+			self.transform = ScreenTransform(
+				self.screen_layout.monitors,
+				self.camera_width,
+				self.camera_height,
+				config.SCREEN_REDUCTION_FACTOR,
+				self.calibration
+			)
+			self.screen_width, self.screen_height = self.screen_layout.get_primary_size()
+		return self.transform
 	
 	def move_cursor(self):
 		"""Move cursor based on index finger position"""
@@ -83,21 +115,85 @@ class MouseController:
 		index_pos = self.hand_tracker.get_landmark_position(8, self.camera_width, self.camera_height)
 		
 		if index_pos is None:
+			self.predictor.reset()
 			return None
 		
 		hand_x, hand_y = index_pos
 		
 		# Map to screen coordinates
-		screen_x, screen_y = self.map_hand_to_screen(hand_x, hand_y)
-		
-		# Apply smoothing
-		smooth_x, smooth_y = self.smoother.smooth_position(screen_x, screen_y)
+		if config.POINTER_MODE == POINTER_RELATIVE:
+			screen_x, screen_y = self.move_relative(hand_x, hand_y)
+		else:
+			# Relative mode starts over from the real cursor if it is switched on later
+			self.release_clutch()
+			screen_x, screen_y = self.map_hand_to_screen(hand_x, hand_y)
+		
+		# Predict where the finger is now rather than where it was at capture time
+		if config.PREDICTION_ENABLED and self.hand_tracker.timestamp is not None:
+			screen_x, screen_y = self.predictor.predict(
+				screen_x, screen_y, self.hand_tracker.timestamp, time.monotonic()
+			)
+		
+		# Apply smoothing (the One Euro filter already ran on the landmarks)
+		if config.SMOOTHING_MODE == SMOOTHING_ONE_EURO:
+			smooth_x, smooth_y = screen_x, screen_y
+		else:
+			smooth_x, smooth_y = self.smoother.smooth_position(screen_x, screen_y)
 		
-		# Move the cursor
-		pyautogui.moveTo(smooth_x, smooth_y, duration=0)
+		# Move the cursor (the output stage extrapolates only as far as the predictor trusts)
+		self.output.move(smooth_x, smooth_y, self.predictor.confidence)
 		return None
 	
 	# noinspection PyMethodMayBeStatic
+	def pointer_gain(self, speed):
+		"""
+		Cursor gain for a hand speed (slow = precise, fast = travel)
+
+		Args:
+			speed: Hand speed in frame widths per second
+
+		Returns:
+			Screen widths of cursor travel per frame width of hand travel
+		"""
+		# Logistic curve between the precision and travel gains
+		blend = 1.0 / (1.0 + np.exp(-config.POINTER_GAIN_STEEPNESS * (speed - config.POINTER_GAIN_INFLECTION)))
+		gain = config.POINTER_GAIN_MIN + (config.POINTER_GAIN_MAX - config.POINTER_GAIN_MIN) * blend
+		return gain * config.MOVEMENT_SENSITIVITY
+	
+	def move_relative(self, hand_x, hand_y):
+		"""
+		Move the cursor by the hand's displacement since the last frame
+
+		Args:
+			hand_x: X position in camera frame
+			hand_y: Y position in camera frame
+
+		Returns:
+			Tuple of (screen_x, screen_y)
+		"""
+		hand = np.array([hand_x / self.camera_width, hand_y / self.camera_height])
+		timestamp = self.hand_tracker.timestamp
+		
+		if self.cursor_position is None:
+			# Continue from wherever the cursor is
+			self.cursor_position = np.array(self.input_backend.position(), dtype=np.float64)
+		
+		if self.last_hand_timestamp is not None and timestamp is not None and timestamp > self.last_hand_timestamp:
+			delta = hand - self.last_hand_position
+			speed = np.linalg.norm(delta) / (timestamp - self.last_hand_timestamp)
+			self.cursor_position += delta * (self.screen_width, self.screen_height) * self.pointer_gain(speed)
+			self.cursor_position[:] = self.get_transform().clamp(*self.cursor_position)
+		
+		self.last_hand_position = hand
+		self.last_hand_timestamp = timestamp
+		return int(self.cursor_position[0]), int(self.cursor_position[1])
+	
+	def release_clutch(self):
+		"""Forget the hand reference so the next movement starts from the current cursor"""
+		self.last_hand_position = None
+		self.last_hand_timestamp = None
+		self.cursor_position = None  # Re-read, the cursor may have moved while the clutch was held
+	
 	def execute_click(self, click_type):
 		"""
 		Execute a mouse click
@@ -106,21 +202,42 @@ class MouseController:
 			click_type: 'left', 'right', or 'double'
 		"""
 		if click_type == 'left':
-			pyautogui.click()
+			self.output.click('left')
 		elif click_type == 'right':
-			pyautogui.rightClick()
+			self.output.click('right')
 		elif click_type == 'double':
-			pyautogui.doubleClick()
+			self.output.click('left', clicks=2)
 	
-	# noinspection PyMethodMayBeStatic
 	def start_drag(self):
 		"""Start a drag operation"""
-		pyautogui.mouseDown()
+		self.output.button_down('left')
 	
-	# noinspection PyMethodMayBeStatic
 	def stop_drag(self):
 		"""Stop a drag operation"""
-		pyautogui.mouseUp()
+		self.output.button_up('left')
+	
+	# noinspection PyMethodMayBeStatic
+	def scroll_rate(self, offset):
+		"""
+		Scroll speed for a wrist offset from the neutral position
+
+		Args:
+			offset: Signed distance from neutral in camera pixels
+
+		Returns:
+			Units per second with the sign of the offset (0 inside the neutral zone)
+		"""
+		distance = abs(offset)
+		if distance < config.SCROLL_ACTIVATION_THRESHOLD:
+			return 0.0
+		
+		# Continuous curve through the slow, medium and fast points (flat beyond fast)
+		rate = np.interp(
+			distance,
+			[config.SCROLL_ACTIVATION_THRESHOLD, config.SCROLL_ZONE_MEDIUM, config.SCROLL_ZONE_FAST],
+			[config.SCROLL_SPEED_SLOW, config.SCROLL_SPEED_MEDIUM, config.SCROLL_SPEED_FAST]
+		)
+		return float(np.copysign(rate, offset))
 	
 	def handle_scroll(self):
 		"""Handle continuous scrolling based on fist position (joystick style)"""
@@ -128,55 +245,63 @@ class MouseController:
 		wrist_pos = self.hand_tracker.get_landmark_position(0, self.camera_width, self.camera_height)
 		
 		if wrist_pos is None:
-			self.scroll_neutral_y = None
-			self.is_scroll_active = False
+			self.stop_scroll()
 			return
 		
-		_, current_y = wrist_pos
+		current_x, current_y = wrist_pos
 		
 		# Set neutral position on first frame of scrolling
 		if self.scroll_neutral_y is None:
+			self.scroll_neutral_x = current_x
 			self.scroll_neutral_y = current_y  # ← This records where you clenched
 			self.is_scroll_active = False
 			return  # ← Important: Don't scroll on first frame
 		
-		# Calculate offset from neutral position (where fist was clenched)
-		offset_y = current_y - self.scroll_neutral_y
-		
-		# Check if moved beyond activation threshold
-		if abs(offset_y) < config.SCROLL_ACTIVATION_THRESHOLD:
-			# Within neutral zone - no scrolling
-			self.is_scroll_active = False
-			return
-		
-		# Determine scroll direction and speed
-		self.is_scroll_active = True
+		# Hand moved down → scroll down (negative), hand moved right → scroll right
+		vertical = -self.scroll_rate(current_y - self.scroll_neutral_y)
+		horizontal = 0.0
+		if config.HORIZONTAL_SCROLL_ENABLED:
+			horizontal = self.scroll_rate(current_x - self.scroll_neutral_x)
 		
-		# Calculate scroll speed based on distance from neutral
-		abs_offset = abs(offset_y)
-		
-		if abs_offset >= config.SCROLL_ZONE_FAST:
-			scroll_speed = config.SCROLL_SPEED_FAST
-		elif abs_offset >= config.SCROLL_ZONE_MEDIUM:
-			scroll_speed = config.SCROLL_SPEED_MEDIUM
-		else:
-			scroll_speed = config.SCROLL_SPEED_SLOW
-		
-		# Scroll direction: positive offset = moved down = scroll down (negative)
-		if offset_y > 0:
-			# Hand moved down → scroll down
-			pyautogui.scroll(-scroll_speed)
-		else:
-			# Hand moved up → scroll up
-			pyautogui.scroll(scroll_speed)
+		# The output stage turns the rate into steady scroll steps, independent of frame rate
+		self.is_scroll_active = bool(vertical or horizontal)
+		self.output.set_scroll_rate(vertical, horizontal)
+	
+	def stop_scroll(self):
+		"""End a scroll gesture"""
+		self.scroll_neutral_x = None
+		self.scroll_neutral_y = None
+		self.is_scroll_active = False
+		self.output.set_scroll_rate(0.0, 0.0)
 	
 	def update(self):
 		"""
 		Main update loop - called every frame
 		Executes appropriate action based on current gesture
 		"""
+		# Surface output errors (e.g. the fail-safe corner) on the tracking thread
+		self.output.raise_pending_error()
+		
 		gesture = self.gesture_recognizer.recognize_gesture()
 		
+		# Any other gesture ends scrolling
+		if gesture != GESTURE_SCROLL and self.scroll_neutral_y is not None:
+			self.stop_scroll()
+		
+		# ...and any other gesture ends a drag, so the button is never left down
+		if gesture != GESTURE_DRAG and self.is_mouse_button_down:
+			self.stop_drag()
+			self.is_mouse_button_down = False
+		
+		# Click on press: the button goes up as soon as the pinch ends
+		if gesture != GESTURE_PRESS and self.is_click_down:
+			self.output.button_up('left')
+			self.is_click_down = False
+		
+		# Relative mode only follows the hand while it steers the cursor
+		if gesture not in (GESTURE_MOVE, GESTURE_DRAG):
+			self.release_clutch()
+		
 		if gesture == GESTURE_MOVE:
 			self.move_cursor()
 		
@@ -200,14 +325,24 @@ class MouseController:
 		elif gesture == GESTURE_SCROLL:
 			self.handle_scroll()
 		
+		elif gesture == GESTURE_PRESS:
+			# Cursor stays put while the button is down, so a click never turns into a drag
+			if not self.is_click_down:
+				self.output.button_down('left')
+				self.is_click_down = True
+			self.predictor.reset()
+		
+		elif gesture == GESTURE_CLUTCH:
+			# Hand repositions freely, the cursor waits
+			self.predictor.reset()
+		
 		elif gesture == GESTURE_NONE:
-			# If we were dragging, stop it
-			if self.is_mouse_button_down:
-				self.stop_drag()
-				self.is_mouse_button_down = False
-			# Reset scroll tracking (when fist opens)
-			self.scroll_neutral_y = None
-			self.is_scroll_active = False
+			# Movement history is meaningless once the hand stops moving the cursor
+			self.predictor.reset()
+		
+		elif gesture in self.gesture_recognizer.custom_buttons:
+			# Gestures added through GESTURE_TABLE click their own button
+			self.output.click(self.gesture_recognizer.custom_buttons[gesture])
 	
 	def update_settings(self, movement_sensitivity=None, smoothing_factor=None):
 		"""
@@ -220,15 +355,30 @@ class MouseController:
 		if smoothing_factor is not None:
 			self.smoother.smoothing_factor = smoothing_factor
 		
+	def get_stats(self):
+		"""
+		Get controller statistics
+
+		Returns:
+			Dictionary with controller counters
+		"""
+		stats = self.output.get_stats()
+		if config.PREDICTION_ENABLED and self.predictor.get_average_error() is not None:
+			stats['prediction_error'] = self.predictor.get_average_error()
+		return stats
+	
 	def reset(self):
 		"""Reset controller state"""
 		self.smoother.reset()
-		self.scroll_neutral_y = None
-		self.is_scroll_active = False
+		self.predictor.reset()
+		self.stop_scroll()
+		self.release_clutch()
 		self.is_mouse_button_down = False
+		self.is_click_down = False
 		
 		# Make sure mouse button isn't stuck down
-		try:
-			pyautogui.mouseUp()
-		except Exception as e:
-			pass
+		self.output.button_up('left')
+	
+	def close(self):
+		"""Send the remaining mouse events and stop the output thread"""
+		self.output.stop()
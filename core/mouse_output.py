@@ -0,0 +1,299 @@
+"""
+Mouse Output Stage
+Injects mouse events from its own thread so tracking never waits on the OS
+Optionally emits cursor moves on a fixed-rate timer, interpolating between camera-rate targets
+"""
+
+import threading
+import time
+from collections import deque
+from utils import config
+from utils.logger import log_error
+from utils.config import OUTPUT_RATE_HZ, SCROLL_OUTPUT_RATE_HZ, SCROLL_RATE_TIMEOUT
+
+# Targets further apart than this are treated as a new movement
+MAX_TARGET_INTERVAL = 0.2
+
+# Event kinds
+EVENT_MOVE = "move"
+EVENT_CLICK = "click"
+EVENT_BUTTON_DOWN = "down"
+EVENT_BUTTON_UP = "up"
+EVENT_SCROLL = "scroll"
+EVENT_HSCROLL = "hscroll"
+
+
+class MouseOutput:
+	"""
+	Queue of mouse events drained by a worker thread
+	Consecutive moves collapse into the newest target, everything else keeps its order
+	"""
+
+	def __init__(self, input_backend, rate_hz=OUTPUT_RATE_HZ):
+		self.input_backend = input_backend
+		self.tick_interval = 1.0 / rate_hz if rate_hz > 0 else None
+		self.events = deque()
+		self.condition = threading.Condition()
+		self.thread = None
+		self.is_running = False
+		self.error = None  # Exception raised by the backend, re-raised on the tracking thread
+		self.last_position = None  # Last position actually sent to the OS
+
+		# Fixed-rate output: newest target and the motion towards it
+		self.target = None
+		self.target_time = None
+		self.target_interval = 1.0 / config.FPS  # Measured time between targets
+		self.start_position = None  # Where the cursor was when the target arrived
+		self.lead = (0.0, 0.0)  # How far past the target to extrapolate (last step scaled by confidence)
+
+		# Rate-based scrolling: units per second, with fractional steps carried over
+		self.scroll_interval = 1.0 / SCROLL_OUTPUT_RATE_HZ
+		self.scroll_rate = (0.0, 0.0)  # (vertical, horizontal)
+		self.scroll_remainder = [0.0, 0.0]
+		self.scroll_rate_time = None  # When the rate was last refreshed
+		self.last_scroll_time = None  # When the accumulators were last advanced
+
+		# Statistics
+		self.events_sent = 0
+		self.moves_coalesced = 0
+		self.moves_deduplicated = 0
+
+	def start(self):
+		"""Start the output thread"""
+		if self.thread is not None:
+			return
+		self.is_running = True
+		self.thread = threading.Thread(target=self._output_loop, daemon=True)
+		self.thread.start()
+
+	def stop(self):
+		"""Send what is still queued, then stop the output thread"""
+		with self.condition:
+			self.is_running = False
+			self.condition.notify()
+		if self.thread is not None:
+			self.thread.join(timeout=2.0)
+			self.thread = None
+
+	def move(self, x, y, confidence=1.0):
+		"""
+		Move the cursor (replaces a move that has not been sent yet)
+
+		Args:
+			x, y: Target screen position
+			confidence: 0-1, how much of the last step the fixed-rate output may extrapolate
+		"""
+		with self.condition:
+			if self.tick_interval is not None:
+				self._set_target(x, y, confidence)
+			elif self.events and self.events[-1][0] == EVENT_MOVE:
+				self.events[-1] = (EVENT_MOVE, x, y)
+				self.moves_coalesced += 1
+			else:
+				self.events.append((EVENT_MOVE, x, y))
+			self.condition.notify()
+
+	def click(self, button='left', clicks=1):
+		"""Click a button (never coalesced or dropped)"""
+		self._post((EVENT_CLICK, button, clicks))
+
+	def button_down(self, button='left'):
+		"""Press and hold a button"""
+		self._post((EVENT_BUTTON_DOWN, button))
+
+	def button_up(self, button='left'):
+		"""Release a button"""
+		self._post((EVENT_BUTTON_UP, button))
+
+	def scroll(self, amount):
+		"""Scroll vertically (positive = up)"""
+		self._post((EVENT_SCROLL, amount))
+
+	def set_scroll_rate(self, vertical, horizontal=0.0):
+		"""
+		Scroll continuously until the rate changes (the output thread sends the steps)
+
+		Args:
+			vertical: Units per second (positive = up)
+			horizontal: Units per second (positive = right)
+		"""
+		with self.condition:
+			now = time.monotonic()
+			if not vertical and not horizontal:
+				self.scroll_rate = (0.0, 0.0)
+				self.scroll_remainder = [0.0, 0.0]
+				self.scroll_rate_time = None
+				return
+
+			if self.scroll_rate_time is None:
+				self.last_scroll_time = now
+			self.scroll_rate = (vertical, horizontal)
+			self.scroll_rate_time = now
+			self.condition.notify()
+
+	def _is_scrolling(self, now):
+		"""Check for an active scroll rate, dropping it if it was not refreshed in time"""
+		if self.scroll_rate_time is None:
+			return False
+		if now - self.scroll_rate_time > SCROLL_RATE_TIMEOUT:
+			# Tracking stalled - never keep scrolling on our own
+			self.scroll_rate = (0.0, 0.0)
+			self.scroll_remainder = [0.0, 0.0]
+			self.scroll_rate_time = None
+			return False
+		return True
+
+	def _queue_scroll_steps(self, now):
+		"""Advance the scroll accumulators and queue whole steps"""
+		elapsed = now - self.last_scroll_time
+		self.last_scroll_time = now
+		for axis, kind in enumerate((EVENT_SCROLL, EVENT_HSCROLL)):
+			self.scroll_remainder[axis] += self.scroll_rate[axis] * elapsed
+			steps = int(self.scroll_remainder[axis])  # Truncates towards zero
+			if steps:
+				self.scroll_remainder[axis] -= steps
+				self.events.append((kind, steps))
+
+	def _set_target(self, x, y, confidence):
+		"""Start moving towards a new target from wherever the cursor is now"""
+		now = time.monotonic()
+		self.lead = (0.0, 0.0)
+		if self.target is not None:
+			self.moves_coalesced += 1
+			elapsed = now - self.target_time
+			if elapsed < MAX_TARGET_INTERVAL:
+				self.target_interval = 0.2 * elapsed + 0.8 * self.target_interval
+				if config.PREDICTION_ENABLED:
+					# Never extrapolate further than the last step, less while the predictor is unsure
+					self.lead = ((x - self.target[0]) * confidence, (y - self.target[1]) * confidence)
+
+		self.start_position = self.last_position or (x, y)
+		self.target = (x, y)
+		self.target_time = now
+		self.condition.notify()
+
+	def _position_at(self, now):
+		"""
+		Cursor position between targets
+
+		Returns:
+			Tuple (x, y) and whether the motion towards the target is finished
+		"""
+		progress = (now - self.target_time) / max(self.target_interval, self.tick_interval)
+		if progress >= (2.0 if self.lead != (0.0, 0.0) else 1.0):
+			# No newer target in time - settle exactly on this one
+			return self.target, True
+
+		# Glide from the previous position to the target over one target interval...
+		glide = max(1.0 - progress, 0.0)
+		# ...running ahead by the lead until the next target is due, then easing back if none came
+		ahead = progress if progress <= 1.0 else 2.0 - progress
+		x = self.target[0] + (self.start_position[0] - self.target[0]) * glide + self.lead[0] * ahead
+		y = self.target[1] + (self.start_position[1] - self.target[1]) * glide + self.lead[1] * ahead
+		return (int(round(x)), int(round(y))), False
+
+	def _post(self, event):
+		"""Queue an ordered event"""
+		with self.condition:
+			if self.target is not None:
+				# Clicks land exactly on the newest target, not somewhere along the way
+				self.events.append((EVENT_MOVE,) + self.target)
+				self.target = None
+			self.events.append(event)
+			self.condition.notify()
+
+	def raise_pending_error(self):
+		"""Re-raise an error from the output thread (e.g. the pyautogui fail-safe)"""
+		if self.error is not None:
+			error, self.error = self.error, None
+			raise error
+
+	def _output_loop(self):
+		"""Output thread: send events in order until stopped and drained"""
+		next_tick = next_scroll_tick = time.monotonic()
+		while True:
+			with self.condition:
+				event = None
+				while not self.events and self.is_running:
+					now = time.monotonic()
+					wake_time = None
+
+					# Moving towards a target - emit a move on every tick
+					if self.target is not None:
+						if now >= next_tick:
+							position, finished = self._position_at(now)
+							if finished:
+								self.target = None
+							event = (EVENT_MOVE,) + position
+							next_tick = max(next_tick + self.tick_interval, now)
+							break
+						wake_time = next_tick
+
+					# Scrolling - send the accumulated whole steps at a steady rate
+					if self._is_scrolling(now):
+						if now >= next_scroll_tick:
+							self._queue_scroll_steps(now)
+							next_scroll_tick = max(next_scroll_tick + self.scroll_interval, now)
+							continue
+						wake_time = next_scroll_tick if wake_time is None else min(wake_time, next_scroll_tick)
+
+					if wake_time is None:
+						self.condition.wait()
+						next_tick = next_scroll_tick = time.monotonic()
+					else:
+						self.condition.wait(wake_time - now)
+
+				if event is None:
+					if not self.events:
+						return  # Stopped and nothing left to send
+					event = self.events.popleft()
+
+			try:
+				self._send(event)
+			except Exception as e:
+				log_error("Mouse output failed", e)
+				with self.condition:
+					self.events.clear()
+				self.error = e
+
+	def _send(self, event):
+		"""Inject one event"""
+		kind = event[0]
+
+		if kind == EVENT_MOVE:
+			position = (event[1], event[2])
+			if position == self.last_position:
+				self.moves_deduplicated += 1
+				return
+			self.input_backend.move_to(*position)
+			self.last_position = position
+
+		elif kind == EVENT_CLICK:
+			self.input_backend.click(event[1], event[2])
+
+		elif kind == EVENT_BUTTON_DOWN:
+			self.input_backend.button_down(event[1])
+
+		elif kind == EVENT_BUTTON_UP:
+			self.input_backend.button_up(event[1])
+
+		elif kind == EVENT_SCROLL:
+			self.input_backend.scroll(event[1])
+
+		elif kind == EVENT_HSCROLL:
+			self.input_backend.hscroll(event[1])
+
+		self.events_sent += 1
+
+	def get_stats(self):
+		"""
+		Get output statistics
+
+		Returns:
+			Dictionary with output counters
+		"""
+		return {
+			'events_sent': self.events_sent,
+			'moves_coalesced': self.moves_coalesced,
+			'moves_deduplicated': self.moves_deduplicated
+		}
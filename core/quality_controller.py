@@ -0,0 +1,120 @@
+"""
+Adaptive Quality Controller
+Steps capture/inference resolution, model complexity and preview rate down when the
+pipeline misses its frame budget, and back up when there is headroom again
+"""
+
+from utils.logger import log_info
+from utils.config import (
+    FPS,
+    QUALITY_LEVELS,
+    QUALITY_DOWN_RATIO,
+    QUALITY_UP_RATIO,
+    QUALITY_DOWN_FRAMES,
+    QUALITY_UP_FRAMES,
+    QUALITY_COOLDOWN
+)
+
+
+class AdaptiveQualityController:
+	"""Watches per-frame pipeline time and picks a quality level with hysteresis"""
+
+	def __init__(self, levels=QUALITY_LEVELS, target_fps=FPS):
+		self.base_levels = levels
+		self.levels = levels
+		self.frame_budget = 1.0 / target_fps
+		self.level = 0  # 0 = best quality
+
+		self.average_time = None
+		self.over_budget_frames = 0
+		self.under_budget_frames = 0
+		self.last_change_time = None
+
+	def get_settings(self):
+		"""
+		Settings of the current level
+
+		Returns:
+			Dictionary with 'capture', 'inference', 'model_complexity' and 'preview_interval'
+		"""
+		return self.levels[self.level]
+
+	def set_ceiling(self, inference, model_complexity):
+		"""
+		Cap every level at a hardware profile's settings
+
+		Args:
+			inference: Largest (width, height) inference size worth using
+			model_complexity: Heaviest model worth using
+		"""
+		inference = tuple(inference)
+		self.levels = [
+			dict(
+				level,
+				inference=min(level['inference'], inference, key=lambda size: size[0] * size[1]),
+				model_complexity=min(level['model_complexity'], model_complexity)
+			)
+			for level in self.base_levels
+		]
+
+	def record_frame(self, frame_time, now):
+		"""
+		Feed the time one frame spent in the pipeline
+
+		Args:
+			frame_time: Seconds from capture to finished mouse update
+			now: Current time.monotonic()
+
+		Returns:
+			Settings of the new level if the level changed, otherwise None
+		"""
+		# Exponential average so a single slow frame does not trigger a change
+		if self.average_time is None:
+			self.average_time = frame_time
+		else:
+			self.average_time = 0.1 * frame_time + 0.9 * self.average_time
+
+		if self.average_time > self.frame_budget * QUALITY_DOWN_RATIO:
+			self.over_budget_frames += 1
+			self.under_budget_frames = 0
+		elif self.average_time < self.frame_budget * QUALITY_UP_RATIO:
+			self.under_budget_frames += 1
+			self.over_budget_frames = 0
+		else:
+			# Between the two thresholds - hold the current level
+			self.over_budget_frames = 0
+			self.under_budget_frames = 0
+
+		if self.last_change_time is not None and now - self.last_change_time < QUALITY_COOLDOWN:
+			return None
+
+		if self.over_budget_frames >= QUALITY_DOWN_FRAMES and self.level < len(self.levels) - 1:
+			return self._change_level(self.level + 1, now)
+
+		if self.under_budget_frames >= QUALITY_UP_FRAMES and self.level > 0:
+			return self._change_level(self.level - 1, now)
+
+		return None
+
+	def _change_level(self, level, now):
+		"""Switch to another level and restart the measurements"""
+		direction = "down" if level > self.level else "up"
+		self.level = level
+		self.last_change_time = now
+		self.over_budget_frames = 0
+		self.under_budget_frames = 0
+		self.average_time = None
+
+		log_info(
+			f"Adaptive quality: stepping {direction} to level {level} "
+			f"({self.levels[level]})"
+		)
+		return self.levels[level]
+
+	def reset(self):
+		"""Return to the best quality level"""
+		self.level = 0
+		self.average_time = None
+		self.over_budget_frames = 0
+		self.under_budget_frames = 0
+		self.last_change_time = None
@@ -0,0 +1,300 @@
+"""
+Screen Layout
+Enumerates the monitors of the virtual desktop and maps the camera's active area onto them
+"""
+
+import os
+from abc import ABC, abstractmethod
+from utils.logger import log_info, log_warning
+from utils.config import MULTI_MONITOR_ENABLED
+
+
+class DisplayEnumerator(ABC):
+	"""
+	Base class for monitor enumeration
+	Monitors are (x, y, width, height, is_primary) in virtual desktop pixels
+	"""
+
+	@abstractmethod
+	def monitors(self):
+		"""List the active monitors"""
+
+	def has_changed(self):
+		"""Cheap check for a layout change since the last call (no full enumeration)"""
+		return False
+
+	def close(self):
+		"""Release enumerator resources"""
+		pass
+
+
+class XrandrEnumerator(DisplayEnumerator):
+	"""X11 RandR through python-xlib; layout changes arrive as RandR events"""
+
+	def __init__(self):
+		from Xlib import display
+		from Xlib.ext import randr
+		self.display = display.Display()
+		if not self.display.has_extension('RANDR'):
+			raise RuntimeError("X server has no RANDR extension")
+		self.root = self.display.screen().root
+
+		# Private connection - the only events it ever receives are layout changes
+		self.root.xrandr_select_input(
+			randr.RRScreenChangeNotifyMask | randr.RRCrtcChangeNotifyMask | randr.RROutputChangeNotifyMask
+		)
+		self.display.flush()
+
+	def monitors(self):
+		try:
+			# RandR 1.5 monitors (what desktops treat as separate screens)
+			reply = self.root.xrandr_get_monitors(is_active=True)
+			return [
+				(m.x, m.y, m.width_in_pixels, m.height_in_pixels, bool(m.primary))
+				for m in reply.monitors
+			]
+		except Exception:
+			# Older servers - one monitor per enabled CRTC
+			resources = self.root.xrandr_get_screen_resources()
+			monitors = []
+			for crtc in resources.crtcs:
+				info = self.display.xrandr_get_crtc_info(crtc, resources.config_timestamp)
+				if info.mode:
+					monitors.append((info.x, info.y, info.width, info.height, False))
+			return monitors
+
+	def has_changed(self):
+		changed = False
+		while self.display.pending_events():
+			self.display.next_event()
+			changed = True
+		return changed
+
+	def close(self):
+		self.display.close()
+
+
+class WindowsEnumerator(DisplayEnumerator):
+	"""Win32 EnumDisplayMonitors; changes show up in the virtual screen metrics"""
+
+	# GetSystemMetrics indices: virtual screen x, y, width, height and monitor count
+	LAYOUT_METRICS = (76, 77, 78, 79, 80)
+
+	def __init__(self):
+		import ctypes
+		from ctypes import wintypes
+		self.ctypes = ctypes
+		self.user32 = ctypes.windll.user32
+		self.callback_type = ctypes.WINFUNCTYPE(
+			ctypes.c_int, wintypes.HMONITOR, wintypes.HDC, ctypes.POINTER(wintypes.RECT), wintypes.LPARAM
+		)
+		self.metrics = self._layout_metrics()
+
+	def _layout_metrics(self):
+		return tuple(self.user32.GetSystemMetrics(index) for index in self.LAYOUT_METRICS)
+
+	def monitors(self):
+		monitors = []
+
+		def collect(_monitor, _dc, rect, _data):
+			r = rect.contents
+			# The primary monitor always has its top-left corner at the origin
+			monitors.append((r.left, r.top, r.right - r.left, r.bottom - r.top, r.left == 0 and r.top == 0))
+			return 1
+
+		self.user32.EnumDisplayMonitors(None, None, self.callback_type(collect), 0)
+		return monitors
+
+	def has_changed(self):
+		metrics = self._layout_metrics()
+		changed = metrics != self.metrics
+		self.metrics = metrics
+		return changed
+
+
+class SingleScreenEnumerator(DisplayEnumerator):
+	"""One fixed screen (fallback when the platform cannot list monitors)"""
+
+	def __init__(self, screen_width, screen_height):
+		self.screen_width = screen_width
+		self.screen_height = screen_height
+
+	def monitors(self):
+		return [(0, 0, self.screen_width, self.screen_height, True)]
+
+
+def create_display_enumerator(screen_width, screen_height, multi_monitor=MULTI_MONITOR_ENABLED):
+	"""
+	Create the monitor enumerator for this platform
+
+	Args:
+		screen_width: Primary screen width (used by the single screen fallback)
+		screen_height: Primary screen height
+		multi_monitor: False to always use the single screen
+
+	Returns:
+		DisplayEnumerator instance
+	"""
+	if multi_monitor:
+		try:
+			if os.name == 'nt':
+				return WindowsEnumerator()
+			if os.environ.get('DISPLAY'):
+				return XrandrEnumerator()
+		except Exception as e:
+			log_warning(f"Could not enumerate monitors: {e}")
+			log_warning("Using the primary screen only")
+
+	return SingleScreenEnumerator(screen_width, screen_height)
+
+
+class ScreenLayout:
+	"""
+	Current monitor layout of the desktop
+	Owned by the UI thread; readers compare `version` to notice a new layout
+	"""
+
+	def __init__(self, screen_width, screen_height, multi_monitor=MULTI_MONITOR_ENABLED):
+		self.screen_width = screen_width
+		self.screen_height = screen_height
+		self.enumerator = create_display_enumerator(screen_width, screen_height, multi_monitor)
+		self.monitors = ()  # (x, y, width, height), primary first
+		self.version = 0
+		self.refresh()
+
+	def refresh(self):
+		"""Enumerate the monitors again"""
+		try:
+			monitors = self.enumerator.monitors()
+		except Exception as e:
+			log_warning(f"Monitor enumeration failed: {e}")
+			monitors = []
+		if not monitors:
+			monitors = [(0, 0, self.screen_width, self.screen_height, True)]
+
+		# Primary first, the rest left to right
+		monitors.sort(key=lambda m: (not m[4], m[0], m[1]))
+		self.monitors = tuple(m[:4] for m in monitors)
+		self.version += 1  # Published last, after the monitors are in place
+		log_info(f"Screen layout: {len(self.monitors)} monitor(s) {list(self.monitors)}")
+
+	def check_for_changes(self):
+		"""
+		Refresh if the layout changed (call at a low rate from the UI thread)
+
+		Returns:
+			True if the layout was refreshed
+		"""
+		if self.enumerator.has_changed():
+			self.refresh()
+			return True
+		return False
+
+	def get_bounds(self):
+		"""
+		Bounding box of all monitors
+
+		Returns:
+			Tuple (left, top, width, height)
+		"""
+		left = min(m[0] for m in self.monitors)
+		top = min(m[1] for m in self.monitors)
+		right = max(m[0] + m[2] for m in self.monitors)
+		bottom = max(m[1] + m[3] for m in self.monitors)
+		return left, top, right - left, bottom - top
+
+	def get_primary_size(self):
+		"""
+		Size of the primary monitor
+
+		Returns:
+			Tuple (width, height)
+		"""
+		return self.monitors[0][2], self.monitors[0][3]
+
+	def close(self):
+		"""Release the enumerator"""
+		self.enumerator.close()
+
+
+class ScreenTransform:
+	"""
+	Precomputed mapping from camera pixels to desktop pixels
+	The active camera area (or a calibrated warp) stretches over the bounding box of all
+	monitors, points in gaps between monitors of different sizes snap to the nearest monitor
+	"""
+
+	def __init__(self, monitors, camera_width, camera_height, reduction, warp=None):
+		self.warp = warp  # CalibrationWarp lookup grid, or None for the linear active area
+		self.camera_width = camera_width
+		self.camera_height = camera_height
+		self.monitors = [(x, y, x + width - 1, y + height - 1) for x, y, width, height in monitors]
+		self.left = min(m[0] for m in self.monitors)
+		self.top = min(m[1] for m in self.monitors)
+		self.right = max(m[2] for m in self.monitors)
+		self.bottom = max(m[3] for m in self.monitors)
+
+		# Centered active area of the camera frame (reduced for comfort)
+		active_width = camera_width * reduction
+		active_height = camera_height * reduction
+		offset_x = (camera_width - active_width) / 2
+		offset_y = (camera_height - active_height) / 2
+
+		# desktop = camera * scale + shift
+		self.scale_x = (self.right - self.left + 1) / active_width
+		self.scale_y = (self.bottom - self.top + 1) / active_height
+		self.shift_x = self.left - offset_x * self.scale_x
+		self.shift_y = self.top - offset_y * self.scale_y
+
+		# Normalized desktop (calibrated warp output) to desktop pixels
+		self.desktop_width = self.right - self.left
+		self.desktop_height = self.bottom - self.top
+
+		# A single rectangle needs no gap handling
+		self.is_rectangular = len(self.monitors) == 1
+
+	def clamp(self, x, y):
+		"""
+		Keep a desktop position on a monitor
+
+		Args:
+			x, y: Desktop position (may be fractional)
+
+		Returns:
+			Tuple (x, y) on the nearest monitor
+		"""
+		x = min(max(x, self.left), self.right)
+		y = min(max(y, self.top), self.bottom)
+		if self.is_rectangular:
+			return x, y
+
+		best = None
+		best_distance = None
+		for left, top, right, bottom in self.monitors:
+			clamped_x = min(max(x, left), right)
+			clamped_y = min(max(y, top), bottom)
+			if clamped_x == x and clamped_y == y:
+				return x, y  # Already on this monitor
+			distance = (clamped_x - x) ** 2 + (clamped_y - y) ** 2
+			if best is None or distance < best_distance:
+				best = (clamped_x, clamped_y)
+				best_distance = distance
+		return best
+
+	def map(self, hand_x, hand_y):
+		"""
+		Convert a camera position to a desktop position
+
+		Args:
+			hand_x: X position in camera frame
+			hand_y: Y position in camera frame
+
+		Returns:
+			Tuple of (screen_x, screen_y)
+		"""
+		if self.warp is not None:
+			u, v = self.warp.lookup(hand_x / self.camera_width, hand_y / self.camera_height)
+			x, y = self.clamp(self.left + u * self.desktop_width, self.top + v * self.desktop_height)
+		else:
+			x, y = self.clamp(hand_x * self.scale_x + self.shift_x, hand_y * self.scale_y + self.shift_y)
+		return int(x), int(y)
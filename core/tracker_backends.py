@@ -0,0 +1,266 @@
+"""
+Hand Tracker Backends
+Interchangeable MediaPipe inference engines behind one small interface
+"""
+
+import os
+import threading
+from abc import ABC, abstractmethod
+import numpy as np
+import mediapipe as mp
+from core.hand_landmarks import landmarks_to_array
+from core.tracker_process import TrackerProcess
+from utils.frame_pool import reserve_buffer
+from utils.logger import log_info, log_warning
+from utils.config import (
+    MIN_DETECTION_CONFIDENCE,
+    MIN_TRACKING_CONFIDENCE,
+    MAX_NUM_HANDS,
+    MODEL_COMPLEXITY,
+    TRACKER_BACKEND,
+    HAND_LANDMARKER_MODEL_PATH
+)
+
+# Backend names (TRACKER_BACKEND values)
+BACKEND_SOLUTIONS = "solutions"
+BACKEND_PROCESS = "process"
+BACKEND_TASKS = "tasks"
+
+
+class TrackerResult:
+	"""One finished detection"""
+
+	__slots__ = ('points', 'handedness', 'timestamp_ms')
+
+	def __init__(self, points, handedness, timestamp_ms):
+		self.points = points  # (21, 3) float32 array, or None if no hand
+		self.handedness = handedness
+		self.timestamp_ms = timestamp_ms  # Timestamp of the frame it was computed from
+
+
+class TrackerBackend(ABC):
+	"""
+	Base class for hand detection backends
+
+	Usage per frame:
+		buffer = backend.get_input_buffer(frame.shape)   # write the RGB frame here
+		result = backend.process(timestamp_ms)           # TrackerResult or None
+	"""
+
+	# True if process() returns results of earlier frames instead of blocking
+	is_async = False
+
+	def __init__(self):
+		self.input_buffer = None
+
+	def get_input_buffer(self, frame_shape):
+		"""
+		Get the array the next RGB frame should be written into
+
+		Args:
+			frame_shape: (height, width, 3)
+
+		Returns:
+			Writable uint8 array
+		"""
+		self.input_buffer = reserve_buffer(self.input_buffer, frame_shape)
+		return self.input_buffer
+
+	@abstractmethod
+	def process(self, timestamp_ms):
+		"""
+		Run (or start) detection on the frame in the input buffer
+
+		Args:
+			timestamp_ms: Monotonic capture time of the frame in milliseconds
+
+		Returns:
+			TrackerResult for the newest finished frame, or None if nothing new is ready
+		"""
+
+	def set_model_complexity(self, model_complexity):
+		"""
+		Switch the landmark model (ignored by backends without a choice)
+
+		Args:
+			model_complexity: 0 = lite, 1 = full
+		"""
+		pass
+
+	def get_stats(self):
+		"""Backend specific counters"""
+		return {}
+
+	def close(self):
+		"""Release backend resources"""
+		pass
+
+
+class SolutionsBackend(TrackerBackend):
+	"""Legacy mp.solutions.hands graph, runs synchronously in this process"""
+
+	def __init__(self, model_complexity=MODEL_COMPLEXITY):
+		super().__init__()
+		self.hands = None
+		self.model_complexity = None
+		self.set_model_complexity(model_complexity)
+
+	def set_model_complexity(self, model_complexity):
+		if model_complexity == self.model_complexity:
+			return
+
+		if self.hands:
+			self.hands.close()
+		self.model_complexity = model_complexity
+		self.hands = mp.solutions.hands.Hands(
+			static_image_mode=False,
+			max_num_hands=MAX_NUM_HANDS,
+			model_complexity=model_complexity,
+			min_detection_confidence=MIN_DETECTION_CONFIDENCE,
+			min_tracking_confidence=MIN_TRACKING_CONFIDENCE
+		)
+
+	def process(self, timestamp_ms):
+		results = self.hands.process(self.input_buffer)
+
+		# noinspection PyUnresolvedReferences
+		if not results.multi_hand_landmarks:
+			return TrackerResult(None, None, timestamp_ms)
+
+		# Take first hand (we only track one hand)
+		# noinspection PyUnresolvedReferences
+		landmarks = results.multi_hand_landmarks[0]
+		# noinspection PyUnresolvedReferences
+		handedness = results.multi_handedness[0].classification[0].label
+		return TrackerResult(landmarks_to_array(landmarks), handedness, timestamp_ms)
+
+	def close(self):
+		if self.hands:
+			self.hands.close()
+			self.hands = None
+
+
+class ProcessBackend(TrackerBackend):
+	"""Legacy graph in a worker process, frames shared through shared memory"""
+
+	def __init__(self):
+		super().__init__()
+		self.tracker_process = TrackerProcess()
+
+	def get_input_buffer(self, frame_shape):
+		# Write straight into the worker's shared-memory slot
+		return self.tracker_process.next_frame_buffer(frame_shape)
+
+	def process(self, timestamp_ms):
+		points, handedness = self.tracker_process.detect()
+		return TrackerResult(points, handedness, timestamp_ms)
+
+	def set_model_complexity(self, model_complexity):
+		self.tracker_process.set_model_complexity(model_complexity)
+
+	def get_stats(self):
+		return {'worker_restarts': self.tracker_process.restarts}
+
+	def close(self):
+		self.tracker_process.stop()
+
+
+class TasksLiveStreamBackend(TrackerBackend):
+	"""
+	MediaPipe Tasks HandLandmarker in LIVE_STREAM mode
+	Frames are submitted without waiting, results arrive through a callback
+	"""
+
+	is_async = True
+
+	def __init__(self, model_path=HAND_LANDMARKER_MODEL_PATH):
+		super().__init__()
+		from mediapipe.tasks import python as mp_tasks
+		from mediapipe.tasks.python import vision
+
+		self.lock = threading.Lock()
+		self.latest_result = None  # Newest result not yet handed out
+		self.last_timestamp_ms = -1
+
+		# Statistics
+		self.frames_submitted = 0
+		self.results_received = 0
+
+		options = vision.HandLandmarkerOptions(
+			base_options=mp_tasks.BaseOptions(model_asset_path=model_path),
+			running_mode=vision.RunningMode.LIVE_STREAM,
+			num_hands=MAX_NUM_HANDS,
+			min_hand_detection_confidence=MIN_DETECTION_CONFIDENCE,
+			min_hand_presence_confidence=MIN_DETECTION_CONFIDENCE,
+			min_tracking_confidence=MIN_TRACKING_CONFIDENCE,
+			result_callback=self._on_result
+		)
+		self.landmarker = vision.HandLandmarker.create_from_options(options)
+
+	def _on_result(self, result, _output_image, timestamp_ms):
+		"""Called by MediaPipe on its own thread when a frame is finished"""
+		if result.hand_landmarks:
+			landmarks = result.hand_landmarks[0]
+			points = np.array([(lm.x, lm.y, lm.z) for lm in landmarks], dtype=np.float32)
+			handedness = result.handedness[0][0].category_name
+			tracker_result = TrackerResult(points, handedness, timestamp_ms)
+		else:
+			tracker_result = TrackerResult(None, None, timestamp_ms)
+
+		with self.lock:
+			self.latest_result = tracker_result
+			self.results_received += 1
+
+	def process(self, timestamp_ms):
+		# LIVE_STREAM requires strictly increasing timestamps
+		timestamp_ms = max(int(timestamp_ms), self.last_timestamp_ms + 1)
+		self.last_timestamp_ms = timestamp_ms
+
+		# mp.Image copies the pixels, so the input buffer can be reused right away
+		image = mp.Image(image_format=mp.ImageFormat.SRGB, data=self.input_buffer)
+		self.landmarker.detect_async(image, timestamp_ms)
+		self.frames_submitted += 1
+
+		with self.lock:
+			result = self.latest_result
+			self.latest_result = None
+		return result
+
+	def get_stats(self):
+		return {
+			'frames_in_flight': self.frames_submitted - self.results_received
+		}
+
+	def close(self):
+		if self.landmarker:
+			self.landmarker.close()
+			self.landmarker = None
+
+
+def create_tracker_backend(name=TRACKER_BACKEND):
+	"""
+	Create the configured tracker backend
+
+	Args:
+		name: "solutions", "process" or "tasks"
+
+	Returns:
+		TrackerBackend instance (falls back to "solutions" if the choice is unavailable)
+	"""
+	if name == BACKEND_PROCESS:
+		log_info("Hand tracking backend: worker process")
+		return ProcessBackend()
+
+	if name == BACKEND_TASKS:
+		if os.path.exists(HAND_LANDMARKER_MODEL_PATH):
+			try:
+				backend = TasksLiveStreamBackend()
+				log_info("Hand tracking backend: MediaPipe Tasks (live stream)")
+				return backend
+			except Exception as e:
+				log_warning(f"Could not start MediaPipe Tasks backend: {e}")
+		else:
+			log_warning(f"Hand landmarker model not found at {HAND_LANDMARKER_MODEL_PATH}")
+		log_warning("Falling back to the legacy MediaPipe Hands backend")
+
+	return SolutionsBackend()
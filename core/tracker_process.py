@@ -0,0 +1,287 @@
+"""
+Hand Tracker Worker Process
+Runs MediaPipe inference in a separate process so it never competes with the UI for the GIL
+Frames travel through a shared-memory ring and landmarks come back through a shared result block
+"""
+
+import multiprocessing
+import queue
+import time
+from multiprocessing import shared_memory
+import numpy as np
+from utils.logger import log_info, log_warning, log_error
+from utils.config import (
+    MIN_DETECTION_CONFIDENCE,
+    MIN_TRACKING_CONFIDENCE,
+    MAX_NUM_HANDS,
+    MODEL_COMPLEXITY,
+    TRACKER_PROCESS_SLOTS,
+    TRACKER_HEARTBEAT_INTERVAL,
+    TRACKER_HEARTBEAT_TIMEOUT,
+    TRACKER_STARTUP_TIMEOUT,
+    TRACKER_RESPONSE_TIMEOUT
+)
+
+# Result block layout (float64): [sequence, detected, handedness, 21 * (x, y, z)]
+RESULT_SEQUENCE = 0
+RESULT_DETECTED = 1
+RESULT_HANDEDNESS = 2
+RESULT_POINTS = 3
+RESULT_SIZE = RESULT_POINTS + 21 * 3
+
+HANDEDNESS_CODES = {None: 0, "Left": 1, "Right": 2}
+HANDEDNESS_LABELS = {code: label for label, code in HANDEDNESS_CODES.items()}
+
+
+def _worker_main(frame_shm_name, result_shm_name, slot_bytes, request_queue, response_queue, heartbeat, settings):
+	"""
+	Worker process entry point
+
+	Args:
+		frame_shm_name: Shared memory holding the frame ring
+		result_shm_name: Shared memory holding the result block
+		slot_bytes: Size of one ring slot in bytes
+		request_queue: Receives (sequence, slot, height, width) or None to exit
+		response_queue: Sends back the sequence number of each finished frame
+		heartbeat: Shared double updated with time.monotonic() while alive
+		settings: MediaPipe Hands keyword arguments
+	"""
+	import mediapipe as mp
+
+	heartbeat.value = time.monotonic()
+	hands = mp.solutions.hands.Hands(static_image_mode=False, **settings)
+
+	frame_shm = shared_memory.SharedMemory(name=frame_shm_name)
+	result_shm = shared_memory.SharedMemory(name=result_shm_name)
+	result = np.ndarray((RESULT_SIZE,), dtype=np.float64, buffer=result_shm.buf)
+
+	try:
+		while True:
+			heartbeat.value = time.monotonic()
+
+			try:
+				request = request_queue.get(timeout=TRACKER_HEARTBEAT_INTERVAL)
+			except queue.Empty:
+				continue
+
+			if request is None:
+				break  # Shutdown requested
+
+			sequence, slot, height, width = request
+			frame = np.ndarray((height, width, 3), dtype=np.uint8, buffer=frame_shm.buf, offset=slot * slot_bytes)
+
+			results = hands.process(frame)
+
+			# noinspection PyUnresolvedReferences
+			if results.multi_hand_landmarks:
+				# noinspection PyUnresolvedReferences
+				landmarks = results.multi_hand_landmarks[0].landmark
+				# noinspection PyUnresolvedReferences
+				label = results.multi_handedness[0].classification[0].label
+				points = result[RESULT_POINTS:].reshape(21, 3)
+				for index, lm in enumerate(landmarks):
+					points[index] = (lm.x, lm.y, lm.z)
+				result[RESULT_DETECTED] = 1
+				result[RESULT_HANDEDNESS] = HANDEDNESS_CODES.get(label, 0)
+			else:
+				result[RESULT_DETECTED] = 0
+				result[RESULT_HANDEDNESS] = 0
+
+			# Sequence is written last so a finished result is never half-read
+			result[RESULT_SEQUENCE] = sequence
+			response_queue.put(sequence)
+	finally:
+		hands.close()
+		del result
+		frame_shm.close()
+		result_shm.close()
+
+
+class TrackerProcess:
+	"""Runs hand detection in a worker process and restarts it if it dies"""
+
+	def __init__(self, slot_count=TRACKER_PROCESS_SLOTS):
+		self.context = multiprocessing.get_context('spawn')
+		self.slot_count = slot_count
+		self.settings = {
+			'max_num_hands': MAX_NUM_HANDS,
+			'model_complexity': MODEL_COMPLEXITY,
+			'min_detection_confidence': MIN_DETECTION_CONFIDENCE,
+			'min_tracking_confidence': MIN_TRACKING_CONFIDENCE
+		}
+
+		self.process = None
+		self.frame_shm = None
+		self.result_shm = None
+		self.result = None
+		self.request_queue = None
+		self.response_queue = None
+		self.heartbeat = None
+		self.start_time = None
+
+		self.slot_bytes = 0
+		self.sequence = 0
+		self.pending_slot = None
+		self.pending_shape = None
+
+		# Statistics
+		self.restarts = 0
+
+	def start(self, frame_shape):
+		"""
+		Allocate shared memory and launch the worker process
+
+		Args:
+			frame_shape: (height, width, 3) of the frames that will be sent
+		"""
+		self.slot_bytes = int(np.prod(frame_shape))
+		self.frame_shm = shared_memory.SharedMemory(create=True, size=self.slot_bytes * self.slot_count)
+		self.result_shm = shared_memory.SharedMemory(create=True, size=RESULT_SIZE * 8)
+		self.result = np.ndarray((RESULT_SIZE,), dtype=np.float64, buffer=self.result_shm.buf)
+		self.result[:] = 0
+
+		self.request_queue = self.context.Queue()
+		self.response_queue = self.context.Queue()
+		self.heartbeat = self.context.Value('d', 0.0, lock=False)
+		self.start_time = time.monotonic()
+
+		self.process = self.context.Process(
+			target=_worker_main,
+			args=(
+				self.frame_shm.name,
+				self.result_shm.name,
+				self.slot_bytes,
+				self.request_queue,
+				self.response_queue,
+				self.heartbeat,
+				self.settings
+			),
+			daemon=True
+		)
+		self.process.start()
+		log_info(f"Hand tracker worker process started (pid {self.process.pid})")
+
+	def stop(self):
+		"""Shut down the worker process and free shared memory"""
+		if self.process is not None:
+			try:
+				self.request_queue.put(None)
+				self.process.join(timeout=2.0)
+				if self.process.is_alive():
+					self.process.terminate()
+					self.process.join(timeout=1.0)
+			except Exception as e:
+				log_error("Error stopping hand tracker worker", e)
+			self.process = None
+
+		self.result = None
+		for shm in (self.frame_shm, self.result_shm):
+			if shm is not None:
+				try:
+					shm.close()
+					shm.unlink()
+				except FileNotFoundError:
+					pass
+		self.frame_shm = None
+		self.result_shm = None
+		self.pending_slot = None
+
+	def restart(self, frame_shape):
+		"""Replace a dead or hung worker with a fresh one"""
+		self.restarts += 1
+		log_warning("Hand tracker worker unresponsive - restarting it")
+		self.stop()
+		self.start(frame_shape)
+
+	def set_model_complexity(self, model_complexity):
+		"""
+		Switch the landmark model (the worker is restarted with the new setting)
+
+		Args:
+			model_complexity: 0 = lite, 1 = full
+		"""
+		if self.settings['model_complexity'] == model_complexity:
+			return
+		self.settings['model_complexity'] = model_complexity
+
+		# Started lazily by the next frame
+		self.stop()
+
+	def is_healthy(self):
+		"""
+		Check that the worker is alive and its heartbeat is fresh
+
+		Returns:
+			True if the worker looks healthy
+		"""
+		if self.process is None or not self.process.is_alive():
+			return False
+
+		now = time.monotonic()
+		if self.heartbeat.value == 0.0:
+			# Still importing MediaPipe - allow a longer startup period
+			return now - self.start_time < TRACKER_STARTUP_TIMEOUT
+		return now - self.heartbeat.value < TRACKER_HEARTBEAT_TIMEOUT
+
+	def next_frame_buffer(self, frame_shape):
+		"""
+		Get the shared-memory slot the next frame should be written into
+		Writing straight into it (e.g. as a cvtColor destination) avoids any extra copy
+
+		Args:
+			frame_shape: (height, width, 3) of the frame
+
+		Returns:
+			Writable uint8 array backed by shared memory
+		"""
+		frame_bytes = int(np.prod(frame_shape))
+		if self.process is None:
+			self.start(frame_shape)
+		elif frame_bytes > self.slot_bytes or not self.is_healthy():
+			# Frames grew beyond the ring slots, or the worker died - start over
+			self.restart(frame_shape)
+
+		self.sequence += 1
+		self.pending_slot = self.sequence % self.slot_count
+		self.pending_shape = tuple(frame_shape)
+		return np.ndarray(
+			self.pending_shape,
+			dtype=np.uint8,
+			buffer=self.frame_shm.buf,
+			offset=self.pending_slot * self.slot_bytes
+		)
+
+	def detect(self):
+		"""
+		Run detection on the frame written into the last next_frame_buffer()
+
+		Returns:
+			Tuple (points, handedness) - (21, 3) float32 array and label, or (None, None)
+		"""
+		if self.pending_slot is None:
+			return None, None
+
+		sequence = self.sequence
+		height, width = self.pending_shape[:2]
+		self.request_queue.put((sequence, self.pending_slot, height, width))
+		self.pending_slot = None
+
+		# Wait for our frame (skip answers to frames we already gave up on)
+		deadline = time.monotonic() + TRACKER_RESPONSE_TIMEOUT
+		while True:
+			remaining = deadline - time.monotonic()
+			if remaining <= 0:
+				return None, None
+			try:
+				finished = self.response_queue.get(timeout=remaining)
+			except queue.Empty:
+				return None, None
+			if finished == sequence:
+				break
+
+		if not self.result[RESULT_DETECTED]:
+			return None, None
+
+		points = self.result[RESULT_POINTS:].reshape(21, 3).astype(np.float32)
+		handedness = HANDEDNESS_LABELS.get(int(self.result[RESULT_HANDEDNESS]))
+		return points, handedness
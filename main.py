@@ -9,6 +9,7 @@ Date: 2025
 import sys
 import os
 import ctypes
+import multiprocessing
 import customtkinter as ctk
 from ui.main_window import MainWindow
 from utils.logger import log_info, log_error
@@ -109,4 +110,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Required for the tracker worker process in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
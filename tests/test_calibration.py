@@ -0,0 +1,26 @@
+"""
+Calibration warp tests
+"""
+
+import pytest
+
+pytest.importorskip("mediapipe")  # core.calibration reaches the tracker through core.autotune
+
+from core.calibration import CalibrationWarp
+
+# Camera range 0.2-0.8 stretched over the whole desktop
+STRETCH = [[-1 / 3, 1 / 0.6, 0, 0, 0, 0], [-1 / 3, 0, 1 / 0.6, 0, 0, 0]]
+
+
+def test_lookup_is_exact_next_to_the_desktop_edge():
+	warp = CalibrationWarp(STRETCH)
+	# 0.2 falls inside a grid cell whose left corner maps off the desktop
+	assert warp.lookup(0.2, 0.2) == pytest.approx((0.0, 0.0), abs=1e-9)
+	assert warp.lookup(0.8, 0.8) == pytest.approx((1.0, 1.0), abs=1e-9)
+	assert warp.lookup(0.5, 0.35) == pytest.approx((0.5, 0.25), abs=1e-9)
+
+
+def test_lookup_clips_to_the_desktop():
+	warp = CalibrationWarp(STRETCH)
+	assert warp.lookup(0.1, 0.9) == (0.0, 1.0)
+	assert warp.lookup(-1.0, 2.0) == (0.0, 1.0)
@@ -0,0 +1,40 @@
+"""
+Frame pool tests
+The capture path reuses its buffers, so the allocation counter stops moving once warmed up
+"""
+
+import numpy as np
+from utils.frame_pool import FramePool, reserve_buffer, get_allocation_count
+
+SHAPE = (480, 640, 3)
+
+
+def test_steady_state_allocates_nothing():
+	pool = FramePool(SHAPE, size=3)
+	resize_buffer = None
+	in_flight = []
+
+	def capture_frame():
+		nonlocal resize_buffer
+		frame = pool.acquire()
+		resize_buffer = reserve_buffer(resize_buffer, (256, 256, 3))
+		in_flight.append(frame)
+		if len(in_flight) > 2:  # Camera, display and tracker each hold a frame for a while
+			pool.release(in_flight.pop(0))
+
+	capture_frame()  # Warm up
+	allocations = get_allocation_count()
+	for _ in range(100):
+		capture_frame()
+	assert get_allocation_count() == allocations
+
+
+def test_shape_changes_and_a_dry_pool_are_counted():
+	pool = FramePool(SHAPE, size=1)
+	allocations = get_allocation_count()
+
+	buffer = reserve_buffer(np.empty(SHAPE, dtype=np.uint8), (720, 1280, 3))
+	assert buffer.shape == (720, 1280, 3)
+	pool.acquire()
+	pool.acquire()  # Pool is empty - one extra buffer
+	assert get_allocation_count() == allocations + 2
@@ -0,0 +1,69 @@
+"""
+GestureDebouncer tests
+Hold and release times are measured in capture time, not frames
+"""
+
+from utils.smoothing import GestureDebouncer
+
+
+def feed(debouncer, detected, start, frames, fps):
+	"""Feed the same raw pose for a number of frames, return the states and the next timestamp"""
+	states = []
+	for index in range(frames):
+		states.append(debouncer.update(detected, start + index / fps))
+	return states, start + frames / fps
+
+
+def test_zero_enter_time_activates_immediately():
+	debouncer = GestureDebouncer(0, 30)
+	assert debouncer.update(True, 0.0)
+	assert debouncer.entered
+
+
+def test_enter_and_exit_after_hold_times():
+	debouncer = GestureDebouncer(100, 200)
+	states, now = feed(debouncer, True, 0.0, 10, 60)  # 0 - 150 ms
+	assert states.index(True) == 6  # First frame at or past 100 ms
+
+	states, now = feed(debouncer, False, now, 20, 60)
+	assert states.index(False) == 12  # 200 ms after the pose disappeared
+
+
+def test_same_timing_at_any_frame_rate():
+	for fps in (15, 30, 60, 120):
+		debouncer = GestureDebouncer(100, 0)
+		states, _ = feed(debouncer, True, 0.0, fps, fps)
+		assert abs(states.index(True) / fps - 0.1) <= 1.0 / fps
+
+
+def test_short_flicker_is_ignored():
+	debouncer = GestureDebouncer(0, 100)
+	debouncer.update(True, 0.0)
+	assert debouncer.update(False, 0.03)
+	assert debouncer.update(True, 0.06)  # Back before exit_ms - hysteresis restarts
+	assert debouncer.update(False, 0.09)
+	assert debouncer.update(False, 0.15)
+	assert not debouncer.update(False, 0.19)
+	assert debouncer.exited
+
+
+def test_entered_and_exited_last_one_update():
+	debouncer = GestureDebouncer(0, 0)
+	debouncer.update(True, 0.0)
+	assert debouncer.entered
+	debouncer.update(True, 0.03)
+	assert not debouncer.entered
+	debouncer.update(False, 0.06)
+	assert debouncer.exited
+	debouncer.update(False, 0.09)
+	assert not debouncer.exited
+
+
+def test_reset_drops_pose_without_exit():
+	debouncer = GestureDebouncer(0, 100)
+	debouncer.update(True, 0.0)
+	debouncer.reset()
+	assert not debouncer.active
+	assert not debouncer.exited
+	assert not debouncer.update(False, 0.5)
+	assert not debouncer.exited
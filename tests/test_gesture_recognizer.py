@@ -0,0 +1,224 @@
+"""
+Gesture recognizer tests
+Drive timestamped pinch and fist sequences through a stub hand tracker
+"""
+
+import pytest
+from core.gesture_recognizer import GestureRecognizer
+from core.hand_landmarks import THUMB_TIP, INDEX_TIP, MIDDLE_TIP, RING_TIP, PINKY_TIP
+from utils import config
+from utils.smoothing import PinchPredictor
+from utils.config import (
+    GESTURE_NONE,
+    GESTURE_MOVE,
+    GESTURE_CLICK,
+    GESTURE_DOUBLE_CLICK,
+    GESTURE_RIGHT_CLICK,
+    GESTURE_DRAG,
+    GESTURE_PRESS
+)
+
+OPEN = 0.3  # Fingertip distance of a relaxed hand
+CLOSED = 0.01  # Fingertip distance of a pinch
+
+
+class StubHandTracker:
+	"""Just enough of HandTracker for the recognizer: fingertip distances and a clock"""
+
+	def __init__(self):
+		self.hand_detected = True
+		self.distances = {}
+		self.fist = False
+		self.timestamp = 0.0
+		self.frame_timestamp = 0.0
+		self.distance_calls = 0
+
+	def calculate_distance(self, landmark1_id, landmark2_id):
+		self.distance_calls += 1
+		return self.distances.get((landmark1_id, landmark2_id), OPEN)
+
+	def is_fist_closed(self):
+		return self.fist
+
+
+def run(recognizer, tracker, frames, fps=30, pinch=None, distance=CLOSED):
+	"""
+	Feed frames and collect the recognized gestures
+
+	Args:
+		frames: Number of frames
+		fps: Frame rate the clock advances at
+		pinch: (finger, finger) held at `distance`, or None for an open hand
+	"""
+	gestures = []
+	for _ in range(frames):
+		tracker.timestamp = tracker.frame_timestamp = tracker.frame_timestamp + 1.0 / fps
+		tracker.distances = {pinch: distance} if pinch else {}
+		gestures.append(recognizer.recognize_gesture())
+	return gestures
+
+
+@pytest.fixture
+def tracker():
+	return StubHandTracker()
+
+
+@pytest.fixture
+def recognizer(tracker):
+	return GestureRecognizer(tracker)
+
+
+def test_open_hand_moves_cursor(recognizer, tracker):
+	assert run(recognizer, tracker, 3) == [GESTURE_MOVE] * 3
+
+
+def test_lost_hand_reports_none(recognizer, tracker):
+	tracker.hand_detected = False
+	assert recognizer.recognize_gesture() == GESTURE_NONE
+
+
+def test_click_fires_once_on_release(recognizer, tracker):
+	assert set(run(recognizer, tracker, 4, pinch=(THUMB_TIP, INDEX_TIP))) == {GESTURE_NONE}
+	released = run(recognizer, tracker, 4)
+	assert released.count(GESTURE_CLICK) == 1
+	assert released[-1] == GESTURE_MOVE
+
+
+def test_second_click_within_double_click_time_is_double_click(recognizer, tracker):
+	run(recognizer, tracker, 3, pinch=(THUMB_TIP, INDEX_TIP))
+	first = run(recognizer, tracker, 3)
+	run(recognizer, tracker, 3, pinch=(THUMB_TIP, INDEX_TIP))
+	second = run(recognizer, tracker, 3)
+	assert GESTURE_CLICK in first
+	assert GESTURE_DOUBLE_CLICK in second
+
+
+def test_clicks_further_apart_stay_single(recognizer, tracker):
+	run(recognizer, tracker, 3, pinch=(THUMB_TIP, INDEX_TIP))
+	run(recognizer, tracker, 3)
+	run(recognizer, tracker, int(config.DOUBLE_CLICK_TIME * 30) + 5)
+	run(recognizer, tracker, 3, pinch=(THUMB_TIP, INDEX_TIP))
+	assert GESTURE_CLICK in run(recognizer, tracker, 3)
+
+
+def test_right_click_fires_on_enter_without_left_click(recognizer, tracker):
+	# A middle pinch often brings the index tip in as well, sometimes a frame earlier
+	assert run(recognizer, tracker, 1, pinch=(THUMB_TIP, INDEX_TIP)) == [GESTURE_NONE]
+	gestures = []
+	for _ in range(5):
+		tracker.timestamp = tracker.frame_timestamp = tracker.frame_timestamp + 1.0 / 30
+		tracker.distances = {(THUMB_TIP, MIDDLE_TIP): CLOSED, (THUMB_TIP, INDEX_TIP): CLOSED}
+		gestures.append(recognizer.recognize_gesture())
+	assert gestures[0] == GESTURE_RIGHT_CLICK
+	assert gestures.count(GESTURE_RIGHT_CLICK) == 1
+
+	# Letting go of both must not click
+	released = run(recognizer, tracker, 10)
+	assert GESTURE_CLICK not in released
+	assert GESTURE_DOUBLE_CLICK not in released
+	assert released[-1] == GESTURE_MOVE
+
+
+@pytest.mark.parametrize("fps", [15, 30, 60])
+def test_drag_timing_is_frame_rate_independent(recognizer, tracker, fps):
+	held = run(recognizer, tracker, fps, fps=fps, pinch=(THUMB_TIP, PINKY_TIP))
+	start_ms = held.index(GESTURE_DRAG) * 1000 / fps
+	assert config.DRAG_ENTER_MS - 1000 / fps <= start_ms <= config.DRAG_ENTER_MS + 1000 / fps
+
+	released = run(recognizer, tracker, fps, fps=fps)
+	end_ms = released.index(GESTURE_MOVE) * 1000 / fps
+	assert config.DRAG_EXIT_MS - 1000 / fps <= end_ms <= config.DRAG_EXIT_MS + 1000 / fps
+
+
+def test_drag_rides_out_short_dropout(recognizer, tracker):
+	run(recognizer, tracker, 10, pinch=(THUMB_TIP, PINKY_TIP))
+	dropout = run(recognizer, tracker, 2)  # About 67 ms, well below DRAG_EXIT_MS
+	assert dropout == [GESTURE_DRAG] * 2
+	assert run(recognizer, tracker, 2, pinch=(THUMB_TIP, PINKY_TIP)) == [GESTURE_DRAG] * 2
+
+
+def test_fist_scrolls(recognizer, tracker):
+	tracker.fist = True
+	assert run(recognizer, tracker, 5)[-1] == config.GESTURE_SCROLL
+
+
+def test_held_pose_skips_lower_priority_features(recognizer, tracker):
+	run(recognizer, tracker, 2, pinch=(THUMB_TIP, MIDDLE_TIP))
+	tracker.distance_calls = 0
+	run(recognizer, tracker, 5, pinch=(THUMB_TIP, MIDDLE_TIP))
+	assert tracker.distance_calls == 5  # Only the right-click pinch is measured
+
+
+def test_click_on_press_holds_for_the_pinch(recognizer, tracker, monkeypatch):
+	monkeypatch.setattr(config, 'CLICK_ON_PRESS', True)
+	assert run(recognizer, tracker, 4, pinch=(THUMB_TIP, INDEX_TIP)) == [GESTURE_PRESS] * 4
+	released = run(recognizer, tracker, 4)
+	assert GESTURE_CLICK not in released
+	assert released[-1] == GESTURE_MOVE
+
+
+def test_predicted_press_is_cancelled_when_pinch_stops_short(recognizer, tracker, monkeypatch):
+	monkeypatch.setattr(config, 'CLICK_ON_PRESS', True)
+	monkeypatch.setattr(config, 'PINCH_PREDICTION_ENABLED', True)
+
+	# Close fast towards the threshold, stop just short of it, then open again
+	gestures = []
+	for index in range(30):
+		distance = max(0.2 - 1.5 * index / 60, config.PINCH_THRESHOLD * 1.5) + max(index - 20, 0) * 0.02
+		gestures += run(recognizer, tracker, 1, fps=60, pinch=(THUMB_TIP, INDEX_TIP), distance=distance)
+
+	assert GESTURE_PRESS not in gestures
+	assert gestures[-1] == GESTURE_MOVE
+	assert recognizer.get_stats() == {'presses_predicted': 1, 'presses_cancelled': 1}
+
+
+def test_pinch_jitter_does_not_cancel_a_prediction():
+	predictor = PinchPredictor()
+	for index in range(5):
+		predictor.update(0.2 - 0.1 * index / 6, index / 60)  # Closing at one frame width per second
+
+	for index in range(5, 10):
+		predictor.update(0.14 + (0.002 if index % 2 else -0.002), index / 60)
+		assert not predictor.is_opening()
+
+	for index in range(10, 14):
+		predictor.update(0.14 + 0.02 * (index - 9), index / 60)
+	assert predictor.is_opening()
+
+
+def test_predicted_press_skips_the_enter_hold(tracker, monkeypatch):
+	monkeypatch.setattr(config, 'CLICK_ON_PRESS', True)
+	monkeypatch.setattr(config, 'CLICK_ENTER_MS', 50)
+
+	def first_press(prediction):
+		monkeypatch.setattr(config, 'PINCH_PREDICTION_ENABLED', prediction)
+		recognizer = GestureRecognizer(tracker)
+		for index in range(30):
+			distance = max(0.2 - 1.3 * index / 60, 0.0)
+			if run(recognizer, tracker, 1, fps=60, pinch=(THUMB_TIP, INDEX_TIP), distance=distance) == [GESTURE_PRESS]:
+				return index, distance
+		return None
+
+	predicted, distance = first_press(True)
+	assert distance < config.PINCH_THRESHOLD  # Never before the fingers actually touch
+	assert predicted < first_press(False)[0]
+
+
+def test_custom_button_row(tracker):
+	table = config.GESTURE_TABLE + [{
+		'name': 'middle_click', 'pose': ('pinch', 'thumb', 'ring'), 'emit': 'release',
+		'enter_ms': 0, 'exit_ms': 30, 'gesture': "middle_click", 'button': 'middle'
+	}]
+	# The clutch row uses the same pinch - drop it so the custom row can fire
+	table = [row for row in table if row['name'] != 'clutch']
+	recognizer = GestureRecognizer(tracker, table)
+	assert recognizer.custom_buttons == {"middle_click": 'middle'}
+
+	run(recognizer, tracker, 3, pinch=(THUMB_TIP, RING_TIP))
+	assert run(recognizer, tracker, 3).count("middle_click") == 1
+
+
+def test_invalid_rows_are_skipped(tracker):
+	table = config.GESTURE_TABLE + [{'name': 'wave', 'pose': ('wave',), 'gesture': "wave"}]
+	recognizer = GestureRecognizer(tracker, table)
+	assert [rule.name for rule in recognizer.rules] == [row['name'] for row in config.GESTURE_TABLE]
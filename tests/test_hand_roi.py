@@ -0,0 +1,31 @@
+"""
+Hand region of interest tests
+"""
+
+import numpy as np
+from core.hand_roi import HandROI
+
+
+def test_wide_frame_is_letterboxed_not_squashed():
+	roi = HandROI()
+	roi.aspect = 4 / 3
+	assert roi.full_frame(1280, 720) == (0, -120, 1280, 840)
+	assert roi.full_frame(640, 480) is None
+
+
+def test_letterboxed_landmarks_map_back_to_the_frame():
+	roi = HandROI()
+	roi.aspect = 4 / 3
+	letterbox = roi.full_frame(1280, 720)
+
+	# Top and bottom edge of the camera image inside a 320x240 letterboxed inference image
+	points = np.array([[0.25, 30 / 240, 0.1], [0.75, 210 / 240, 0.1]])
+	roi.to_frame(points, letterbox, 1280, 720)
+	assert np.allclose(points, [[0.25, 0.0, 0.1], [0.75, 1.0, 0.1]])
+
+
+def test_crop_maps_back_to_the_frame():
+	roi = HandROI()
+	points = np.array([[0.0, 0.0, 0.2], [1.0, 1.0, 0.2]])
+	roi.to_frame(points, (160, 120, 480, 360), 640, 480)
+	assert np.allclose(points, [[0.25, 0.25, 0.1], [0.75, 0.75, 0.1]])
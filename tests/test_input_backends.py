@@ -0,0 +1,26 @@
+"""
+Input backend tests
+"""
+
+import pytest
+from core.input_backends import InputBackend, RecordingBackend
+
+
+def test_incomplete_backend_fails_at_construction():
+	class MoveOnlyBackend(InputBackend):
+		def move_to(self, x, y):
+			pass
+
+	with pytest.raises(TypeError):
+		MoveOnlyBackend()
+
+
+def test_default_click_presses_and_releases():
+	class ButtonBackend(RecordingBackend):
+		click = InputBackend.click
+
+	backend = ButtonBackend()
+	backend.click('right', clicks=2)
+	assert [(event[1], event[2]) for event in backend.events] == [
+		('down', ('right',)), ('up', ('right',)), ('down', ('right',)), ('up', ('right',))
+	]
@@ -0,0 +1,130 @@
+"""
+MouseController tests
+Scripted gestures in, recorded mouse events out
+"""
+
+import pytest
+from core.gesture_recognizer import GestureRecognizer
+from core.hand_landmarks import THUMB_TIP, INDEX_TIP
+from core.input_backends import RecordingBackend
+from core.mouse_controller import MouseController
+from core.screen_layout import ScreenLayout
+from utils import config
+from utils.config import (
+    GESTURE_NONE,
+    GESTURE_CLICK,
+    GESTURE_RIGHT_CLICK,
+    GESTURE_CLUTCH,
+    GESTURE_PRESS
+)
+
+
+class ScriptedRecognizer:
+	"""Stands in for GestureRecognizer and replays a fixed gesture sequence"""
+
+	def __init__(self, gestures, custom_buttons=None):
+		self.gestures = list(gestures)
+		self.custom_buttons = custom_buttons or {}
+
+	def recognize_gesture(self):
+		return self.gestures.pop(0)
+
+
+def play(gestures, custom_buttons=None):
+	"""Run the controller over a gesture sequence and return the recorded (kind, arguments)"""
+	backend = RecordingBackend()
+	recognizer = ScriptedRecognizer(gestures, custom_buttons)
+	controller = MouseController(None, recognizer, 640, 480, backend, ScreenLayout(1920, 1080, multi_monitor=False))
+	try:
+		while recognizer.gestures:
+			controller.update()
+	finally:
+		controller.close()
+	return [(event[1], event[2]) for event in backend.events]
+
+
+def test_clicks():
+	assert play([GESTURE_CLICK, GESTURE_NONE, GESTURE_RIGHT_CLICK]) == [
+		('click', ('left', 1)), ('click', ('right', 1))
+	]
+
+
+def test_press_holds_the_button_until_the_gesture_changes():
+	assert play([GESTURE_PRESS, GESTURE_PRESS, GESTURE_PRESS, GESTURE_NONE]) == [
+		('down', ('left',)), ('up', ('left',))
+	]
+
+
+@pytest.mark.parametrize("next_gesture", [GESTURE_NONE, GESTURE_CLUTCH, GESTURE_RIGHT_CLICK])
+def test_press_is_released_by_any_other_gesture(next_gesture):
+	events = play([GESTURE_PRESS, next_gesture])
+	assert events[:2] == [('down', ('left',)), ('up', ('left',))]
+
+
+def test_custom_button_gesture_clicks_its_button():
+	events = play([GESTURE_NONE, "middle_click", GESTURE_NONE], {"middle_click": 'middle'})
+	assert events == [('click', ('middle', 1))]
+
+
+class PinchTracker:
+	"""Stands in for HandTracker with a scripted thumb-index distance at 60 FPS"""
+
+	def __init__(self, distances):
+		self.distances = list(distances)
+		self.distance = None
+		self.hand_detected = True
+		self.timestamp = self.frame_timestamp = 0.0
+
+	def process_frame(self, frame):
+		self.distance = self.distances.pop(0)
+		self.timestamp = self.frame_timestamp = self.timestamp + 1.0 / 60
+		return frame
+
+	def get_landmark_position(self, landmark_id, frame_width, frame_height):
+		return (frame_width // 2, frame_height // 2)
+
+	def calculate_distance(self, landmark1_id, landmark2_id):
+		return self.distance if (landmark1_id, landmark2_id) == (THUMB_TIP, INDEX_TIP) else 0.3
+
+	def is_fist_closed(self):
+		return False
+
+
+def test_predicted_pinch_that_stops_short_never_presses(monkeypatch):
+	monkeypatch.setattr(config, 'CLICK_ON_PRESS', True)
+	monkeypatch.setattr(config, 'PINCH_PREDICTION_ENABLED', True)
+	monkeypatch.setattr(config, 'CLICK_ENTER_MS', 50)
+
+	# Close fast, stop just short of the pinch threshold, open again
+	distances = [max(0.2 - 1.5 * index / 60, config.PINCH_THRESHOLD * 1.5) + max(index - 20, 0) * 0.02
+				 for index in range(30)]
+	tracker = PinchTracker(distances)
+	recognizer = GestureRecognizer(tracker)
+	backend = RecordingBackend()
+	controller = MouseController(tracker, recognizer, 640, 480, backend, ScreenLayout(1920, 1080, multi_monitor=False))
+	try:
+		while tracker.distances:
+			tracker.process_frame(None)
+			controller.update()
+	finally:
+		controller.close()
+
+	assert recognizer.get_stats()['presses_predicted'] == 1
+	assert [event for event in backend.events if event[1] in ('down', 'up', 'click')] == []
+
+
+def test_relative_mode_resumes_from_the_cursor_after_the_clutch():
+	tracker = PinchTracker([])
+	backend = RecordingBackend()
+	controller = MouseController(tracker, ScriptedRecognizer([]), 640, 480, backend, ScreenLayout(1920, 1080, multi_monitor=False))
+	try:
+		backend.cursor = (500, 500)
+		controller.move_relative(320, 240)
+		controller.release_clutch()
+
+		# The cursor is moved by something else while the clutch is held
+		backend.cursor = (100, 800)
+		tracker.timestamp += 1.0 / 60
+		assert controller.move_relative(320, 240) == (100, 800)
+	finally:
+		controller.close()
@@ -0,0 +1,124 @@
+"""
+MouseOutput tests
+Events go to a RecordingBackend, so nothing reaches the real cursor
+"""
+
+import time
+from core.input_backends import RecordingBackend
+from core.mouse_output import MouseOutput
+from utils import config
+
+
+def kinds(backend):
+	"""Recorded event kinds in order"""
+	return [event[1] for event in backend.events]
+
+
+def test_queued_moves_coalesce_into_the_newest():
+	backend = RecordingBackend()
+	output = MouseOutput(backend, rate_hz=0)  # Camera-rate moves, no interpolation
+	for x in range(5):
+		output.move(x * 10, 20)
+	output.start()
+	output.stop()
+
+	assert kinds(backend) == ['move']
+	assert backend.cursor == (40, 20)
+	assert output.get_stats()['moves_coalesced'] == 4
+
+
+def test_buttons_keep_their_order_between_moves():
+	backend = RecordingBackend()
+	output = MouseOutput(backend, rate_hz=0)
+	output.move(10, 10)
+	output.button_down('left')
+	output.move(20, 20)
+	output.move(30, 30)
+	output.button_up('left')
+	output.start()
+	output.stop()
+
+	assert [(event[1], event[2]) for event in backend.events] == [
+		('move', (10, 10)), ('down', ('left',)), ('move', (30, 30)), ('up', ('left',))
+	]
+
+
+def test_click_lands_on_the_newest_target():
+	backend = RecordingBackend()
+	output = MouseOutput(backend, rate_hz=120)
+	output.start()
+	output.move(100, 100)
+	output.move(500, 300)
+	output.click('left')
+	output.stop()
+
+	click_index = kinds(backend).index('click')
+	assert backend.events[click_index - 1][1:] == ('move', (500, 300))
+
+
+def test_fixed_rate_output_runs_faster_than_the_targets():
+	backend = RecordingBackend()
+	output = MouseOutput(backend, rate_hz=120)
+	output.start()
+
+	# Ten camera-rate targets (30 FPS) sweeping across the screen
+	for index in range(10):
+		output.move(index * 30, 0)
+		time.sleep(1.0 / 30)
+	duration = backend.events[-1][0] - backend.events[0][0]
+	output.stop()
+
+	moves = kinds(backend).count('move')
+	assert moves > 20  # Interpolated between the targets
+	assert moves <= 120 * duration * 1.5 + 2  # But never beyond the tick rate
+
+
+def test_prediction_never_runs_past_a_stopping_target(monkeypatch):
+	monkeypatch.setattr(config, 'PREDICTION_ENABLED', True)
+	backend = RecordingBackend()
+	output = MouseOutput(backend, rate_hz=240)
+	output.start()
+
+	# Steady sweep, then the hand brakes and stops while the predictor loses confidence
+	targets = [(0, 1.0), (30, 1.0), (60, 1.0), (90, 1.0), (110, 0.5), (120, 0.2), (125, 0.0)] + [(125, 0.0)] * 4
+	for x, confidence in targets:
+		output.move(x, 0, confidence)
+		time.sleep(1.0 / 30)
+	time.sleep(0.2)
+	output.stop()
+
+	xs = [event[2][0] for event in backend.events if event[1] == 'move']
+	assert max(xs) <= 125
+	assert xs[-1] == 125
+	assert len(set(xs)) > len(targets)  # Still moving between the targets
+
+
+def test_scroll_rate_accumulates_fractional_steps():
+	backend = RecordingBackend()
+	output = MouseOutput(backend)
+	output.start()
+
+	# 20 units per second is a third of a step per 60 Hz tick - nothing may be lost
+	start = time.monotonic()
+	while time.monotonic() - start < 0.5:
+		output.set_scroll_rate(20.0, -40.0)
+		time.sleep(0.02)
+	output.set_scroll_rate(0.0)
+	output.stop()
+
+	vertical = sum(event[2][0] for event in backend.events if event[1] == 'scroll')
+	horizontal = sum(event[2][0] for event in backend.events if event[1] == 'hscroll')
+	assert 7 <= vertical <= 12
+	assert -22 <= horizontal <= -15
+
+
+def test_scroll_stops_when_the_rate_is_not_refreshed():
+	backend = RecordingBackend()
+	output = MouseOutput(backend)
+	output.start()
+	output.set_scroll_rate(100.0)
+	time.sleep(1.0)  # Twice SCROLL_RATE_TIMEOUT without a refresh
+	output.stop()
+
+	total = sum(event[2][0] for event in backend.events if event[1] == 'scroll')
+	assert 40 <= total <= 60  # About SCROLL_RATE_TIMEOUT worth of scrolling, then nothing
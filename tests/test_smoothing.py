@@ -0,0 +1,24 @@
+"""
+Smoothing filter tests
+"""
+
+import numpy as np
+from utils.smoothing import OneEuroFilter
+
+
+def filter_sweep(fps):
+	"""Filter a hand sweeping across the frame and stopping, sampled at `fps`"""
+	one_euro = OneEuroFilter()
+	filtered = []
+	for index in range(2 * fps + 1):
+		timestamp = index / fps
+		x = 0.5 + 0.3 * np.sin(np.pi * min(timestamp, 1.5))
+		filtered.append(float(one_euro.filter(x, timestamp)))
+	return filtered
+
+
+def test_one_euro_behaves_the_same_at_any_frame_rate():
+	slow = filter_sweep(15)
+	fast = filter_sweep(60)
+	for index, value in enumerate(slow):
+		assert abs(value - fast[4 * index]) < 0.01  # Frame widths, compared at the same instants
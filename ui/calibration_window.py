@@ -0,0 +1,149 @@
+"""
+Calibration Window
+Shows targets across the desktop and records where the index fingertip is while the user
+points at each one
+"""
+
+import numpy as np
+import customtkinter as ctk
+from core.calibration import calibration_targets
+from core.hand_landmarks import INDEX_TIP
+from core.screen_layout import ScreenTransform
+from utils.config import (
+    CAMERA_WIDTH,
+    CAMERA_HEIGHT,
+    SCREEN_REDUCTION_FACTOR,
+    CALIBRATION_DWELL,
+    CALIBRATION_STABILITY
+)
+
+# Target drawing
+TARGET_RADIUS = 18
+POLL_INTERVAL = 30  # Milliseconds between fingertip samples
+MIN_TARGET_TRAVEL = 5  # A new hold only starts this many CALIBRATION_STABILITY away from the last one
+
+
+class CalibrationWindow(ctk.CTkToplevel):
+	"""Borderless overlay over all monitors; Esc cancels"""
+
+	def __init__(self, parent, hand_tracker, screen_layout, on_complete, on_cancel):
+		super().__init__(parent)
+
+		self.hand_tracker = hand_tracker
+		self.on_complete = on_complete  # Called with (camera_points, screen_points)
+		self.on_cancel = on_cancel
+
+		# Targets in normalized desktop coordinates, moved off gaps between monitors
+		self.left, self.top, self.width, self.height = screen_layout.get_bounds()
+		transform = ScreenTransform(screen_layout.monitors, CAMERA_WIDTH, CAMERA_HEIGHT, SCREEN_REDUCTION_FACTOR)
+		self.targets = []
+		for u, v in calibration_targets():
+			x, y = transform.clamp(self.left + u * (self.width - 1), self.top + v * (self.height - 1))
+			self.targets.append(((x - self.left) / (self.width - 1), (y - self.top) / (self.height - 1)))
+
+		# Recording state
+		self.target_index = 0
+		self.samples = []  # (timestamp, u, v) of the current hold
+		self.last_timestamp = None
+		self.camera_points = []
+		self.poll_id = None
+
+		# Cover the whole desktop
+		self.overrideredirect(True)
+		self.geometry(f"{self.width}x{self.height}+{self.left}+{self.top}")
+		self.attributes('-topmost', True)
+		self.bind("<Escape>", lambda _event: self.cancel())
+
+		self.canvas = ctk.CTkCanvas(self, width=self.width, height=self.height, bg="#101010", highlightthickness=0)
+		self.canvas.pack(fill="both", expand=True)
+
+		self.focus_force()
+		self.draw_target(0.0)
+		self.poll_id = self.after(POLL_INTERVAL, self.poll)
+
+	def draw_target(self, progress):
+		"""Draw the current target with a ring that fills while the fingertip holds still"""
+		self.canvas.delete("all")
+		u, v = self.targets[self.target_index]
+		x = u * (self.width - 1)
+		y = v * (self.height - 1)
+
+		r = TARGET_RADIUS
+		self.canvas.create_oval(x - r, y - r, x + r, y + r, outline="#00FF00", width=2)
+		self.canvas.create_line(x - r, y, x + r, y, fill="#00FF00")
+		self.canvas.create_line(x, y - r, x, y + r, fill="#00FF00")
+		if progress > 0:
+			ring = r + 8
+			self.canvas.create_arc(
+				x - ring, y - ring, x + ring, y + ring,
+				start=90, extent=-359.9 * progress, style="arc", outline="#00BFFF", width=4
+			)
+
+		self.canvas.create_text(
+			self.width / 2, self.height / 2 + 60,
+			text=f"Point at the target and hold still ({self.target_index + 1}/{len(self.targets)}) - Esc to cancel",
+			fill="white",
+			font=("Arial", 16)
+		)
+
+	def poll(self):
+		"""Sample the fingertip and move on once it held still long enough"""
+		hand = self.hand_tracker.hand_landmarks
+		timestamp = self.hand_tracker.timestamp
+		progress = 0.0
+
+		if hand is None or not self.hand_tracker.hand_detected:
+			self.samples = []
+		elif timestamp != self.last_timestamp:
+			self.last_timestamp = timestamp
+			u, v = float(hand.points[INDEX_TIP, 0]), float(hand.points[INDEX_TIP, 1])
+
+			if not self.samples and self.camera_points:
+				last_u, last_v = self.camera_points[-1]
+				if max(abs(u - last_u), abs(v - last_v)) < CALIBRATION_STABILITY * MIN_TARGET_TRAVEL:
+					# Still resting on the previous target
+					self.draw_target(0.0)
+					self.poll_id = self.after(POLL_INTERVAL, self.poll)
+					return
+
+			if self.samples:
+				mean_u = np.mean([s[1] for s in self.samples])
+				mean_v = np.mean([s[2] for s in self.samples])
+				if max(abs(u - mean_u), abs(v - mean_v)) > CALIBRATION_STABILITY:
+					self.samples = []  # Moved - start the hold again
+			self.samples.append((timestamp, u, v))
+
+			if self.samples[-1][0] - self.samples[0][0] >= CALIBRATION_DWELL:
+				self.record_target()
+				return
+
+		if self.samples:
+			progress = min((self.samples[-1][0] - self.samples[0][0]) / CALIBRATION_DWELL, 1.0)
+		self.draw_target(progress)
+		self.poll_id = self.after(POLL_INTERVAL, self.poll)
+
+	def record_target(self):
+		"""Store the average fingertip position of the hold"""
+		self.camera_points.append((
+			float(np.mean([s[1] for s in self.samples])),
+			float(np.mean([s[2] for s in self.samples]))
+		))
+		self.samples = []
+		self.target_index += 1
+
+		if self.target_index == len(self.targets):
+			self.poll_id = None
+			self.destroy()
+			self.on_complete(self.camera_points, self.targets)
+			return
+
+		self.draw_target(0.0)
+		self.poll_id = self.after(POLL_INTERVAL, self.poll)
+
+	def cancel(self):
+		"""Close without saving"""
+		if self.poll_id is not None:
+			self.after_cancel(self.poll_id)
+			self.poll_id = None
+		self.destroy()
+		self.on_cancel()
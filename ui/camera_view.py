@@ -4,15 +4,27 @@ Displays live camera feed with hand tracking overlay
 """
 
 import cv2
+import threading
+import time
+import numpy as np
 import customtkinter as ctk
 from PIL import Image, ImageTk
+from utils.frame_mailbox import FrameMailbox
+from utils.frame_pool import FramePool, reserve_buffer, get_allocation_count
+from core.hand_landmarks import HAND_CONNECTIONS, FINGERTIPS
 from utils.config import (
     CAMERA_INDEX,
     CAMERA_WIDTH,
     CAMERA_HEIGHT,
     PREVIEW_WIDTH,
     PREVIEW_HEIGHT,
-    USE_DSHOW
+    USE_DSHOW,
+    FRAME_WAIT_TIMEOUT,
+    FRAME_POOL_SIZE,
+    MIRROR_IN_LANDMARK_SPACE,
+    COLOR_LANDMARK,
+    COLOR_CONNECTION,
+    COLOR_FINGERTIP
 )
 
 
@@ -27,11 +39,32 @@ class CameraView(ctk.CTkFrame):
 		self.is_running = False
 		self.is_visible = True
 		
+		# Capture stage (runs in its own thread, newest frame wins)
+		self.capture_thread = None
+		self.mailbox = FrameMailbox()
+		self.frame_timestamp = None  # Capture time of the frame being tracked
+		self.frames_captured = 0
+		self.capture_start_time = None
+		self.resolution_changed = False  # Set when the capture thread must re-apply the resolution
+		
 		# Camera settings
 		self.camera_width = CAMERA_WIDTH
 		self.camera_height = CAMERA_HEIGHT
+		self.fourcc = None  # Capture format from the hardware profile (None = driver default)
 		self.preview_width = PREVIEW_WIDTH
 		self.preview_height = PREVIEW_HEIGHT
+		
+		# Mirror in landmark space: frames stay unflipped, only the preview gets flipped
+		self.mirror_in_landmark_space = MIRROR_IN_LANDMARK_SPACE
+		
+		# Reusable buffers (capture frames, UI snapshot, preview conversion)
+		self.frame_pool = FramePool((self.camera_height, self.camera_width, 3), FRAME_POOL_SIZE)
+		self.snapshot_buffer = None
+		self.preview_buffer = None
+		self.preview_rgb_buffer = None
+		self.preview_photo = None
+		self.stats_allocations = get_allocation_count()
+		self.stats_frames = 0
 	
 		# Create preview label (displays camera feed)
 		self.preview_label = ctk.CTkLabel(
@@ -48,8 +81,6 @@ class CameraView(ctk.CTkFrame):
 	
 	def _create_placeholder(self):
 		"""Create a placeholder image for when camera is off"""
-		import numpy as np
-		
 		# Create gray image
 		placeholder = np.ones((self.preview_height, self.preview_width, 3), dtype=np.uint8) * 50
 		
@@ -76,6 +107,8 @@ class CameraView(ctk.CTkFrame):
 		
 		try:
 			self.camera = cv2.VideoCapture(CAMERA_INDEX)
+			if self.fourcc:
+				self.camera.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*self.fourcc))
 			self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, self.camera_width)
 			self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, self.camera_height)
 			
@@ -84,6 +117,13 @@ class CameraView(ctk.CTkFrame):
 				raise Exception("Could not open camera")
 			
 			self.is_running = True
+			
+			# Start capture thread
+			self.mailbox.reset_stats()
+			self.frames_captured = 0
+			self.capture_start_time = time.monotonic()
+			self.capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+			self.capture_thread.start()
 			return True
 		
 		except Exception as e:
@@ -96,39 +136,145 @@ class CameraView(ctk.CTkFrame):
 		"""Stop camera capture and release resources"""
 		self.is_running = False
 		
+		# Wait for capture thread before releasing the device it reads from
+		if self.capture_thread and self.capture_thread.is_alive():
+			self.capture_thread.join(timeout=2.0)
+		self.capture_thread = None
+		self.mailbox.clear()
+		
 		if self.camera is not None:
 			self.camera.release()
 			self.camera = None
 		
 		# Show placeholder
 		self.preview_label.configure(image=self.placeholder_image)
+		self.preview_label.image = None
+		self.preview_photo = None
+	
+	def _capture_loop(self):
+		"""Background thread that keeps the mailbox filled with the newest frame"""
+		while self.is_running and self.camera is not None:
+			if self.resolution_changed:
+				# Resolution is changed here so it never races with camera.read()
+				self.resolution_changed = False
+				self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, self.camera_width)
+				self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, self.camera_height)
+			
+			# Capture frame straight into a pooled buffer (blocks until the camera delivers one)
+			buffer = self.frame_pool.acquire()
+			ret, frame = self.camera.read(image=buffer)
+			capture_time = time.monotonic()
+			
+			if not ret or frame is None:
+				self.frame_pool.release(buffer)
+				print("Failed to read frame")
+				time.sleep(0.01)
+				continue
+			
+			if frame is not buffer:
+				# Camera delivers a different size than requested - adopt it
+				self.frame_pool.release(buffer)
+				self.frame_pool.resize(frame.shape)
+			
+			if not self.mirror_in_landmark_space:
+				# Flip frame horizontally (mirror effect - more intuitive)
+				flipped = self.frame_pool.acquire()
+				cv2.flip(frame, 1, dst=flipped)
+				self.frame_pool.release(frame)
+				frame = flipped
+			
+			self.frames_captured += 1
+			
+			# Recycle the frame that nobody picked up in time
+			stale_frame = self.mailbox.put(frame, capture_time)
+			self.frame_pool.release(stale_frame)
 	
 	def update_frame(self):
 		"""
-		Capture and display a frame from camera
-		Called repeatedly to create video effect
+		Take the newest captured frame and run hand tracking on it
+		Called repeatedly by the tracking thread
 
 		Returns:
-			The processed frame (for hand tracking), or None if error
+			The processed frame (for hand tracking), or None if no frame arrived
 		"""
 		if not self.is_running or self.camera is None:
 			return None
 		
-		# Capture frame
-		ret, frame = self.camera.read()
+		# Always pull the freshest frame - stale ones were already dropped
+		frame, capture_time = self.mailbox.get(timeout=FRAME_WAIT_TIMEOUT)
 		
-		if not ret or frame is None:
-			print("Failed to read frame")
+		if frame is None:
 			return None
 		
-		# Flip frame horizontally (mirror effect - more intuitive)
-		frame = cv2.flip(frame, 1)
+		self.frame_timestamp = capture_time
 		
-		# Process frame with hand tracker (draws hand skeleton)
-		processed_frame = self.hand_tracker.process_frame(frame)
+		# Process frame with hand tracker (landmark data only)
+		processed_frame = self.hand_tracker.process_frame(frame, capture_time)
 		
 		return processed_frame
 	
+	def set_capture_resolution(self, width, height):
+		"""
+		Request a different camera resolution (applied by the capture thread)
+
+		Args:
+			width: Capture width in pixels
+			height: Capture height in pixels
+		"""
+		if (width, height) == (self.camera_width, self.camera_height):
+			return
+		self.camera_width = width
+		self.camera_height = height
+		self.resolution_changed = True
+	
+	def release_frame(self, frame):
+		"""
+		Hand a frame buffer back to the capture pool once nobody references it
+
+		Args:
+			frame: Frame previously returned by update_frame()
+		"""
+		self.frame_pool.release(frame)
+	
+	def snapshot_frame(self, frame):
+		"""
+		Copy a frame into the reusable UI snapshot buffer
+
+		Args:
+			frame: Frame owned by the tracking thread
+
+		Returns:
+			Snapshot array that stays valid until the next call
+		"""
+		self.snapshot_buffer = reserve_buffer(self.snapshot_buffer, frame.shape)
+		np.copyto(self.snapshot_buffer, frame)
+		return self.snapshot_buffer
+	
+	def get_stats(self):
+		"""
+		Get capture pipeline statistics
+
+		Returns:
+			Dictionary with capture FPS, dropped frame and allocation counts
+		"""
+		elapsed = 0
+		if self.capture_start_time is not None:
+			elapsed = time.monotonic() - self.capture_start_time
+		
+		# Buffer allocations per captured frame since the last call (0 in steady state)
+		allocations = get_allocation_count()
+		new_frames = self.frames_captured - self.stats_frames
+		allocations_per_frame = (allocations - self.stats_allocations) / new_frames if new_frames > 0 else 0.0
+		self.stats_allocations = allocations
+		self.stats_frames = self.frames_captured
+		
+		return {
+			'capture_fps': self.frames_captured / elapsed if elapsed > 0 else 0.0,
+			'frames_captured': self.frames_captured,
+			'frames_dropped': self.mailbox.frames_dropped,
+			'allocations_per_frame': allocations_per_frame
+		}
+	
 	def display_frame(self, frame):
 		"""
 		Display a frame in the preview label
@@ -136,24 +282,73 @@ class CameraView(ctk.CTkFrame):
 		Args:
 			frame: OpenCV image (BGR format)
 		"""
-		if not self.is_visible or frame is None:
+		if frame is None or not self.is_preview_shown():
 			return
 		
-		# Resize frame to preview size
-		frame_resized = cv2.resize(frame, (self.preview_width, self.preview_height))
+		# Resize frame to preview size (into a reusable buffer)
+		preview_shape = (self.preview_height, self.preview_width, 3)
+		self.preview_buffer = reserve_buffer(self.preview_buffer, preview_shape)
+		cv2.resize(frame, (self.preview_width, self.preview_height), dst=self.preview_buffer)
+		
+		if self.mirror_in_landmark_space:
+			# Frame was never flipped - mirror it here at preview resolution
+			cv2.flip(self.preview_buffer, 1, dst=self.preview_buffer)
+		
+		# Draw hand skeleton at preview resolution
+		hand = self.hand_tracker.hand_landmarks
+		if hand is not None:
+			self._draw_skeleton(self.preview_buffer, hand)
 		
 		# Convert BGR to RGB
-		frame_rgb = cv2.cvtColor(frame_resized, cv2.COLOR_BGR2RGB)
+		self.preview_rgb_buffer = reserve_buffer(self.preview_rgb_buffer, preview_shape)
+		cv2.cvtColor(self.preview_buffer, cv2.COLOR_BGR2RGB, dst=self.preview_rgb_buffer)
 		
-		# Convert to PIL Image
-		pil_image = Image.fromarray(frame_rgb)
+		# Wrap the buffer as a PIL Image without copying it
+		pil_image = Image.frombuffer(
+			'RGB',
+			(self.preview_width, self.preview_height),
+			self.preview_rgb_buffer,
+			'raw',
+			'RGB',
+			0,
+			1
+		)
 		
-		# Convert to PhotoImage for tkinter
-		photo = ImageTk.PhotoImage(image=pil_image)
+		if self.preview_photo is None:
+			# First frame - create PhotoImage for tkinter and attach it to the label
+			self.preview_photo = ImageTk.PhotoImage(image=pil_image)
+			self.preview_label.configure(image=self.preview_photo)
+			self.preview_label.image = self.preview_photo  # Keep reference to prevent garbage collection
+		else:
+			# Reuse the existing PhotoImage instead of creating one per frame
+			self.preview_photo.paste(pil_image)
+	
+	def _draw_skeleton(self, image, hand):
+		"""
+		Draw hand landmarks and connections onto a preview-sized image
+
+		Args:
+			image: BGR preview image (drawn in place)
+			hand: HandLandmarks in the same (mirrored) orientation as the image
+		"""
+		height, width = image.shape[:2]
+		points = (hand.points[:, :2] * (width, height)).astype(np.int32)
 		
-		# Update label
-		self.preview_label.configure(image=photo)
-		self.preview_label.image = photo  # Keep reference to prevent garbage collection
+		for start, end in HAND_CONNECTIONS:
+			cv2.line(image, tuple(points[start]), tuple(points[end]), COLOR_CONNECTION, 2)
+		
+		for landmark_id, point in enumerate(points):
+			color = COLOR_FINGERTIP if landmark_id in FINGERTIPS else COLOR_LANDMARK
+			cv2.circle(image, tuple(point), 4, color, -1)
+	
+	def is_preview_shown(self):
+		"""
+		Check whether anyone can actually see the preview
+
+		Returns:
+			True if the preview is enabled and its window is mapped on screen
+		"""
+		return self.is_visible and bool(self.winfo_viewable())
 	
 	def show_preview(self):
 		"""Show the camera preview"""
@@ -46,6 +46,15 @@ class ControlPanel(ctk.CTkScrollableFrame):
         )
         self.status_label.grid(row=1, column=0, columnspan=2, padx=10, pady=5, sticky="w")
 
+        # Pipeline statistics
+        self.stats_label = ctk.CTkLabel(
+            self,
+            text="Pipeline: --",
+            font=("Arial", 10),
+            text_color="gray"
+        )
+        self.stats_label.grid(row=8, column=0, columnspan=2, padx=10, pady=5, sticky="w")
+
         # Start button
         self.start_button = ctk.CTkButton(
             self,
@@ -208,6 +217,10 @@ class ControlPanel(ctk.CTkScrollableFrame):
         """Update status display"""
         self.status_label.configure(text=f"Status: {status}")
 
+    def update_stats(self, stats_text):
+        """Update pipeline statistics display"""
+        self.stats_label.configure(text=f"Pipeline: {stats_text}")
+
     def get_always_on_top(self):
         """Get Always on Top state"""
         if ENABLE_ALWAYS_ON_TOP:
@@ -4,7 +4,6 @@ Creates visual feedback overlays for gesture detection
 """
 
 import tkinter as tk
-import pyautogui
 from utils.config import (
 	GESTURE_NONE,
 	GESTURE_MOVE,
@@ -12,18 +11,22 @@ from utils.config import (
 	GESTURE_DOUBLE_CLICK,
 	GESTURE_RIGHT_CLICK,
 	GESTURE_DRAG,
-	GESTURE_SCROLL
+	GESTURE_SCROLL,
+	GESTURE_CLUTCH,
+	GESTURE_PRESS
 )
 
 
 class CursorEffects:
 	"""Creates visual overlay effects around cursor for gesture feedback"""
 	
-	def __init__(self):
+	def __init__(self, input_backend):
+		self.input_backend = input_backend  # Only used to read the cursor position
 		self.overlay_window = None
 		self.canvas = None
 		self.current_gesture = GESTURE_NONE
 		self.is_active = False
+		self.is_suspended = False
 		self.update_id = None
 		
 		# Effect settings
@@ -37,6 +40,8 @@ class CursorEffects:
 			GESTURE_DOUBLE_CLICK: "#FFD700",  # Gold
 			GESTURE_DRAG: "#FF00FF",  # Magenta
 			GESTURE_SCROLL: "#00FFFF",  # Cyan
+			GESTURE_CLUTCH: "#A9A9A9",  # Dark Gray
+			GESTURE_PRESS: "#00BFFF",  # Deep Sky Blue
 			GESTURE_MOVE: None,  # No effect
 			GESTURE_NONE: None  # No effect
 		}
@@ -94,6 +99,7 @@ class CursorEffects:
 	def stop(self):
 		"""Stop and close the overlay"""
 		self.is_active = False
+		self.is_suspended = False
 		
 		if self.update_id:
 			self.overlay_window.after_cancel(self.update_id)
@@ -104,13 +110,35 @@ class CursorEffects:
 			self.overlay_window = None
 			self.canvas = None
 	
+	def set_suspended(self, suspended):
+		"""
+		Pause or resume overlay updates (used by idle power mode)
+
+		Args:
+			suspended: True to stop redrawing, False to resume
+		"""
+		if suspended == self.is_suspended:
+			return
+		self.is_suspended = suspended
+		
+		if not self.is_active or not self.canvas:
+			return
+		
+		if suspended:
+			if self.update_id:
+				self.overlay_window.after_cancel(self.update_id)
+				self.update_id = None
+			self.canvas.delete("all")
+		else:
+			self._update_overlay()
+	
 	def set_gesture(self, gesture):
 		"""Update current gesture"""
 		self.current_gesture = gesture
 	
 	def _update_overlay(self):
 		"""Update overlay effects"""
-		if not self.is_active or not self.canvas:
+		if not self.is_active or not self.canvas or self.is_suspended:
 			return
 		
 		# Clear canvas
@@ -118,7 +146,7 @@ class CursorEffects:
 		
 		# Get cursor position
 		try:
-			cursor_x, cursor_y = pyautogui.position()
+			cursor_x, cursor_y = self.input_backend.position()
 		except:
 			# If can't get cursor position, skip this frame
 			self.update_id = self.overlay_window.after(16, self._update_overlay)
@@ -0,0 +1,148 @@
+"""
+Fitts' Law Test Window
+Measures pointing throughput (bits/s) in absolute and relative pointer mode
+"""
+
+import time
+import customtkinter as ctk
+from utils import config
+from utils.fitts import FittsBlock, target_positions, target_order
+
+# Test layout
+TARGET_COUNT = 13
+TARGET_WIDTH = 40
+CIRCLE_DIAMETER = 500
+CANVAS_SIZE = 640
+
+# Pointer modes compared by the test
+TEST_MODES = ["absolute", "relative"]
+
+
+class FittsTestWindow(ctk.CTkToplevel):
+	"""Click the highlighted circle with hand gestures, once per pointer mode"""
+
+	def __init__(self, parent):
+		super().__init__(parent)
+
+		self.original_mode = config.POINTER_MODE  # Restored when the window closes
+		self.targets = target_positions(TARGET_COUNT, CIRCLE_DIAMETER, (CANVAS_SIZE / 2, CANVAS_SIZE / 2))
+		self.order = target_order(TARGET_COUNT)
+
+		# Test state
+		self.mode_index = 0
+		self.step = 0
+		self.block = None
+		self.last_click_time = None
+		self.results = {}
+
+		# Widgets
+		self.status_label = None
+		self.canvas = None
+		self.result_label = None
+		self.start_button = None
+
+		self.title("Hand Mouse Controller - Pointing Test")
+		self.geometry(f"{CANVAS_SIZE + 40}x{CANVAS_SIZE + 180}")
+		self.resizable(False, False)
+		self.transient(parent)
+		self.protocol("WM_DELETE_WINDOW", self.close_window)
+
+		self.create_widgets()
+
+	def create_widgets(self):
+		"""Create the canvas, status text and start button"""
+		self.status_label = ctk.CTkLabel(
+			self,
+			text="Start tracking, then press Start and click each highlighted circle with a pinch",
+			font=("Arial", 13)
+		)
+		self.status_label.pack(pady=(15, 5))
+
+		self.canvas = ctk.CTkCanvas(self, width=CANVAS_SIZE, height=CANVAS_SIZE, bg="#202020", highlightthickness=0)
+		self.canvas.pack(padx=20)
+		self.canvas.bind("<Button-1>", self.on_click)
+
+		self.result_label = ctk.CTkLabel(self, text="", font=("Arial", 12))
+		self.result_label.pack(pady=5)
+
+		self.start_button = ctk.CTkButton(self, text="Start", command=self.start_test, width=150)
+		self.start_button.pack(pady=5)
+
+		self.draw_targets(None)
+
+	def draw_targets(self, highlighted):
+		"""Draw all targets, with the one to click highlighted"""
+		self.canvas.delete("all")
+		radius = TARGET_WIDTH / 2
+		for index, (x, y) in enumerate(self.targets):
+			color = "#00FF00" if index == highlighted else "#555555"
+			self.canvas.create_oval(x - radius, y - radius, x + radius, y + radius, fill=color, outline="")
+
+	def start_test(self):
+		"""Run the blocks from the first pointer mode"""
+		self.mode_index = 0
+		self.results = {}
+		self.result_label.configure(text="")
+		self.start_button.configure(state="disabled")
+		self.start_block()
+
+	def start_block(self):
+		"""Switch the pointer mode and wait for the first click"""
+		mode = TEST_MODES[self.mode_index]
+		config.POINTER_MODE = mode
+		self.block = FittsBlock(TARGET_WIDTH)
+		self.step = 0
+		self.last_click_time = None
+		self.status_label.configure(text=f"{mode.capitalize()} mode - click the green circle to begin")
+		self.draw_targets(self.order[0])
+
+	def on_click(self, event):
+		"""Record a click and move on to the next target"""
+		if self.block is None:
+			return
+
+		now = time.monotonic()
+		if self.last_click_time is not None:
+			# Every click after the first ends a measured movement
+			start = self.targets[self.order[self.step - 1]]
+			target = self.targets[self.order[self.step]]
+			self.block.record(start, target, (event.x, event.y), now - self.last_click_time)
+		self.last_click_time = now
+		self.step += 1
+
+		if self.step < len(self.order):
+			self.draw_targets(self.order[self.step])
+			return
+
+		# Block finished
+		self.results[TEST_MODES[self.mode_index]] = self.block.get_results()
+		self.block = None
+		self.mode_index += 1
+		if self.mode_index < len(TEST_MODES):
+			self.start_block()
+		else:
+			self.finish_test()
+
+	def finish_test(self):
+		"""Show the throughput of each mode"""
+		config.POINTER_MODE = self.original_mode
+		self.draw_targets(None)
+		self.status_label.configure(text="Test complete")
+
+		lines = []
+		for mode in TEST_MODES:
+			result = self.results.get(mode)
+			if result is None:
+				continue
+			lines.append(
+				f"{mode.capitalize()}: {result['throughput']:.2f} bits/s "
+				f"(IDe {result['effective_id']:.2f} bits, {result['movement_time'] * 1000:.0f} ms, "
+				f"{result['error_rate'] * 100:.0f}% errors)"
+			)
+		self.result_label.configure(text="\n".join(lines))
+		self.start_button.configure(state="normal", text="Run Again")
+
+	def close_window(self):
+		"""Restore the pointer mode and close"""
+		config.POINTER_MODE = self.original_mode
+		self.destroy()
@@ -5,17 +5,27 @@ Central application window that coordinates all components
 
 import customtkinter as ctk
 import threading
+import time
 from core.hand_tracker import HandTracker
 from core.gesture_recognizer import GestureRecognizer
 from core.mouse_controller import MouseController
+from core.input_backends import create_input_backend
+from core.screen_layout import ScreenLayout
+from core.quality_controller import AdaptiveQualityController
+from core import autotune
+from core import calibration
 from ui.camera_view import CameraView
 from ui.control_panel import ControlPanel
 from ui.system_tray import SystemTray
 from ui.settings_window import SettingsWindow
 from ui.cursor_effects import CursorEffects
 from ui.about_dialog import AboutDialog
+from ui.fitts_test_window import FittsTestWindow
+from ui.calibration_window import CalibrationWindow
 from utils.speech import SpeechAnnouncer
 from ui.compact_window import CompactWindow
+from utils import config
+from utils.logger import log_info, log_error
 from utils.config import (
     WINDOW_TITLE,
     MIN_WINDOW_WIDTH,
@@ -25,10 +35,12 @@ from utils.config import (
     THEME_MODE,
     THEME_COLOR,
     UI_UPDATE_INTERVAL,
+    STATS_UPDATE_INTERVAL,
     ENABLE_SYSTEM_TRAY,
     STATUS_READY,
     STATUS_PAUSED,
-    STATUS_NO_HAND
+    STATUS_NO_HAND,
+    STATUS_IDLE
 )
 
 
@@ -74,12 +86,30 @@ class MainWindow(ctk.CTk):
         self.update_id = None
         self.tracking_thread = None
         self.thread_lock = threading.Lock()
+        self.last_stats_update = 0
+
+        # Adaptive quality (resolution, model and preview rate follow measured frame time)
+        self.quality_controller = AdaptiveQualityController() if config.ADAPTIVE_QUALITY_ENABLED else None
+        self.preview_interval = UI_UPDATE_INTERVAL
+        self.last_preview_time = 0
+
+        # Idle power mode state
+        self.is_idle = False
+        self.last_hand_time = time.monotonic()
+        self.idle_wake_count = 0
 
         # Settings window reference
         self.settings_window = None
+        self.fitts_window = None
+
+        # Monitor layout of the whole desktop (refreshed when displays change)
+        self.screen_layout = ScreenLayout(self.winfo_screenwidth(), self.winfo_screenheight())
+
+        # Mouse injection backend (pyautogui, XTest, uinput or recording)
+        self.input_backend = create_input_backend(self.winfo_screenwidth(), self.winfo_screenheight())
 
         # Cursor visual effects
-        self.cursor_effects = CursorEffects()
+        self.cursor_effects = CursorEffects(self.input_backend)
 
         # Text-to-Speech Engine
         self.speech_announcer = SpeechAnnouncer()  # <--- INITIALIZE SPEECH ENGINE
@@ -97,6 +127,19 @@ class MainWindow(ctk.CTk):
         self.camera_view = CameraView(self, self.hand_tracker)
         self.camera_view.pack(padx=10, pady=10)
 
+        # Tuned configuration for this CPU and camera (benchmarked on first start if missing)
+        self.hardware_key = autotune.get_hardware_key()
+        self.hardware_profile = autotune.load_profile(self.hardware_key)
+        self.is_autotuning = False
+        if self.hardware_profile:
+            self._apply_hardware_profile(self.hardware_profile)
+
+        # Pointer calibration of this user and camera (lens correction and fitted warp)
+        self.calibration_key = calibration.get_calibration_key()
+        self.calibration = calibration.load_calibration(self.calibration_key)
+        self.is_calibrating = False
+        self._apply_calibration()
+
         # Create control panel with callbacks
         callbacks = {
             'start': self.start_tracking,
@@ -226,6 +269,15 @@ class MainWindow(ctk.CTk):
     def _initialize_and_track(self):
         """Initialize camera and start tracking (runs in background thread)"""
         try:
+            # First start on this hardware - benchmark before the camera is taken
+            if self.hardware_profile is None and config.AUTOTUNE_ENABLED:
+                self._run_autotune()
+
+            # Every session starts at full quality
+            if self.quality_controller:
+                self.quality_controller.reset()
+                self._apply_quality_settings(self.quality_controller.get_settings())
+
             # Start camera in background
             if not self.camera_view.start_camera():
                 print("ERROR: Camera failed to start")
@@ -243,8 +295,12 @@ class MainWindow(ctk.CTk):
                 self.hand_tracker,
                 self.gesture_recognizer,
                 cam_width,
-                cam_height
+                cam_height,
+                self.input_backend,
+                self.screen_layout
             )
+            if self.calibration:
+                self.mouse_controller.set_calibration(calibration.CalibrationWarp.from_calibration(self.calibration))
 
             self.after(0, lambda: self.control_panel.update_status("Tracking started"))
 
@@ -262,27 +318,160 @@ class MainWindow(ctk.CTk):
     def _tracking_loop(self):
         """Background thread for camera capture and hand tracking"""
 
+        self.is_idle = False
+        self.last_hand_time = time.monotonic()
+
         while self.is_running:
             try:
-                # Get and process frame
+                loop_start = time.monotonic()
+
+                frames_inferred = self.hand_tracker.frames_inferred
+
+                # Get and process the newest frame (waits for the capture thread)
                 frame = self.camera_view.update_frame()
 
                 if frame is not None:
                     # Store frame for UI display (thread-safe)
                     with self.thread_lock:
+                        previous_frame = self.current_frame
                         self.current_frame = frame
 
+                    # The UI only reads current_frame under the lock, so the old buffer is free again
+                    self.camera_view.release_frame(previous_frame)
+
                     # Update mouse control (this is the heavy processing)
-                    if self.mouse_controller:  # Check if it exists before calling update
+                    if self.mouse_controller and not self.is_calibrating:  # Calibration owns the fingertip
                         self.mouse_controller.update()
-                # Small delay to prevent CPU overload
-                import time
-                time.sleep(0.01)  # 10ms delay = ~100 FPS max
+
+                    self._update_idle_state(loop_start)
+
+                    # Let the quality controller react to the time since capture, measured only on
+                    # frames that ran inference (gated and optical-flow frames are nearly free)
+                    inferred = self.hand_tracker.frames_inferred != frames_inferred
+                    if self.quality_controller and inferred and not self.is_idle:
+                        now = time.monotonic()
+                        new_settings = self.quality_controller.record_frame(
+                            now - self.camera_view.frame_timestamp, now
+                        )
+                        if new_settings:
+                            self._apply_quality_settings(new_settings)
+
+                if self.is_idle:
+                    # Low-rate detection - only look for a hand a few times per second
+                    remaining = 1.0 / config.IDLE_FPS - (time.monotonic() - loop_start)
+                    if remaining > 0:
+                        time.sleep(remaining)
 
             except Exception as e:
                 print(f"Error in tracking loop: {e}")
                 break
 
+    def _apply_quality_settings(self, settings):
+        """Push a quality level to the camera, tracker and preview"""
+        self.camera_view.set_capture_resolution(*settings['capture'])
+        self.hand_tracker.set_inference_size(*settings['inference'])
+        self.hand_tracker.set_model_complexity(settings['model_complexity'])
+        self.preview_interval = settings['preview_interval']
+
+    def _apply_hardware_profile(self, profile):
+        """Use a tuned configuration instead of the config.py defaults"""
+        autotune.apply_cv_threads(profile.get('cv_threads'))
+        self.camera_view.fourcc = profile.get('fourcc')
+        self.hand_tracker.set_inference_size(*profile['inference'])
+        self.hand_tracker.set_model_complexity(profile['model_complexity'])
+        # A profile benchmarked without a hand never timed the landmark model - no ceiling from it
+        if self.quality_controller and profile.get('landmarks_timed', True):
+            self.quality_controller.set_ceiling(profile['inference'], profile['model_complexity'])
+
+    def _apply_calibration(self):
+        """Use the saved calibration (or the config defaults) for tracking and mapping"""
+        lens_distortion = config.LENS_DISTORTION
+        if self.calibration and self.calibration.get('lens_distortion'):
+            lens_distortion = self.calibration['lens_distortion']
+        self.hand_tracker.set_lens_distortion(lens_distortion)
+
+        if self.mouse_controller:
+            warp = calibration.CalibrationWarp.from_calibration(self.calibration) if self.calibration else None
+            self.mouse_controller.set_calibration(warp)
+
+    def open_calibration(self):
+        """Record fingertip positions at screen targets and fit a new warp"""
+        if self.is_calibrating:
+            return
+        if not self.is_tracking:
+            self.control_panel.update_status("Start tracking before calibrating")
+            return
+
+        # The modal settings dialog would keep the overlay from getting key presses
+        if self.settings_window and self.settings_window.winfo_exists():
+            self.settings_window.close_window()
+
+        self.is_calibrating = True
+        CalibrationWindow(self, self.hand_tracker, self.screen_layout, self._finish_calibration, self._cancel_calibration)
+
+    def _finish_calibration(self, camera_points, screen_points):
+        """Fit, store and apply the recorded calibration"""
+        _, _, desktop_width, desktop_height = self.screen_layout.get_bounds()
+        self.calibration = calibration.create_calibration(camera_points, screen_points, (desktop_width, desktop_height))
+        calibration.save_calibration(self.calibration_key, self.calibration)
+        self._apply_calibration()
+        self.is_calibrating = False
+        self.control_panel.update_status(f"Calibrated (error {self.calibration['rms_error_px']:.0f} px)")
+
+    def _cancel_calibration(self):
+        """Keep the previous calibration"""
+        self.is_calibrating = False
+
+    def clear_calibration(self):
+        """Forget the calibration and go back to the centered active area"""
+        self.calibration = None
+        calibration.save_calibration(self.calibration_key, None)
+        self._apply_calibration()
+        log_info("Pointer calibration removed")
+
+    def _run_autotune(self, probe_camera=True):
+        """Benchmark this machine, store and apply the result (runs in a background thread)"""
+        self.is_autotuning = True
+        try:
+            def show_progress(message):
+                self.after(0, lambda: self.control_panel.update_status(f"Tuning: {message}"))
+
+            profile = autotune.run_autotune(probe_camera=probe_camera, status_callback=show_progress)
+
+            autotune.save_profile(self.hardware_key, profile)
+            self.hardware_profile = profile
+            self._apply_hardware_profile(profile)
+        except Exception as e:
+            log_error("Hardware autotune failed", e)
+        finally:
+            self.is_autotuning = False
+
+    def run_autotune_from_settings(self):
+        """Re-run the hardware benchmark on demand"""
+        if self.is_autotuning:
+            return
+
+        # The benchmark needs the camera and an otherwise quiet CPU
+        self.stop_tracking()
+        threading.Thread(target=self._run_autotune, daemon=True).start()
+
+    def _update_idle_state(self, now):
+        """Enter idle mode after IDLE_TIMEOUT without a hand, leave it when one shows up"""
+        if self.hand_tracker.hand_detected:
+            self.last_hand_time = now
+            if self.is_idle:
+                self.idle_wake_count += 1
+                if self.idle_wake_count >= config.IDLE_WAKE_DETECTIONS:
+                    self.is_idle = False
+                    log_info("Hand detected - leaving idle mode")
+            return
+
+        self.idle_wake_count = 0
+        if (not self.is_idle and config.IDLE_MODE_ENABLED and
+                now - self.last_hand_time >= config.IDLE_TIMEOUT):
+            self.is_idle = True
+            log_info("No hand detected for a while - entering idle mode")
+
 
     def stop_tracking(self):
         """Stop hand tracking and mouse control"""
@@ -307,9 +496,10 @@ class MainWindow(ctk.CTk):
         # Stop camera
         self.camera_view.stop_camera()
 
-        # Reset mouse controller
+        # Reset mouse controller (a new one is created on the next start)
         if self.mouse_controller:
             self.mouse_controller.reset()
+            self.mouse_controller.close()
 
         # Stop cursor effects
         self.cursor_effects.stop()
@@ -328,12 +518,20 @@ class MainWindow(ctk.CTk):
             return
 
         try:
+            # Suspend overlay updates while idle
+            self.cursor_effects.set_suspended(self.is_idle)
+
             # Display the frame if available
             if hasattr(self, 'current_frame') and self.current_frame is not None:
-                with self.thread_lock:
-                    frame_to_display = self.current_frame.copy()
+                # Skip the copy and render entirely when idle or when the preview is hidden, compact or in tray
+                now = time.monotonic()
+                preview_due = (now - self.last_preview_time) * 1000 >= self.preview_interval
+                if preview_due and not self.is_idle and self.camera_view.is_preview_shown():
+                    self.last_preview_time = now
+                    with self.thread_lock:
+                        frame_to_display = self.camera_view.snapshot_frame(self.current_frame)
 
-                self.camera_view.display_frame(frame_to_display)
+                    self.camera_view.display_frame(frame_to_display)
 
                 # Update gesture display
                 if hasattr(self, 'gesture_recognizer') and self.gesture_recognizer:
@@ -348,17 +546,61 @@ class MainWindow(ctk.CTk):
                         self.speech_announcer.announce_gesture(current_gesture)
 
                 # Update status based on hand detection
-                if self.hand_tracker.hand_detected:
+                if self.is_idle:
+                    self.control_panel.update_status(STATUS_IDLE)
+                elif self.hand_tracker.hand_detected:
                     self.control_panel.update_status("Tracking: Hand Detected")
                 else:
                     self.control_panel.update_status(STATUS_NO_HAND)
 
+            # Refresh pipeline statistics once in a while
+            now = time.monotonic()
+            if now - self.last_stats_update >= STATS_UPDATE_INTERVAL:
+                self.last_stats_update = now
+                self._update_stats()
+
+                # Monitors plugged in, removed or rearranged
+                self.screen_layout.check_for_changes()
+
         except Exception as e:
             print(f"Error in UI update: {e}")
 
         # Schedule next UI update
         self.update_id = self.after(UI_UPDATE_INTERVAL, self._update_ui)
 
+    def _update_stats(self):
+        """Show capture pipeline statistics in the control panel"""
+        stats = self.camera_view.get_stats()
+        stats.update(self.hand_tracker.get_stats())
+        if self.mouse_controller:
+            stats.update(self.mouse_controller.get_stats())
+        if self.gesture_recognizer:
+            stats.update(self.gesture_recognizer.get_stats())
+        text = (
+            f"Capture: {stats['capture_fps']:.1f} FPS | "
+            f"Dropped: {stats['frames_dropped']} | "
+            f"Allocs/frame: {stats['allocations_per_frame']:.2f}"
+        )
+        if 'skip_rate' in stats:
+            text += f" | Skipped: {stats['skip_rate'] * 100:.0f}%"
+        if self.quality_controller:
+            text += f" | Quality level: {self.quality_controller.level}"
+        if 'flow_rate' in stats:
+            text += f" | Flow: {stats['flow_rate'] * 100:.0f}% ({stats['flow_reanchors']} re-anchors)"
+        if 'roi_rate' in stats:
+            text += f" | ROI: {stats['roi_rate'] * 100:.0f}%"
+        if 'moves_coalesced' in stats:
+            text += f" | Moves coalesced: {stats['moves_coalesced']}"
+        if 'prediction_error' in stats:
+            text += f" | Prediction error: {stats['prediction_error']:.0f} px"
+        if 'presses_predicted' in stats:
+            text += f" | Predicted presses: {stats['presses_predicted']} ({stats['presses_cancelled']} cancelled)"
+        if stats.get('worker_restarts'):
+            text += f" | Worker restarts: {stats['worker_restarts']}"
+        if 'frames_in_flight' in stats:
+            text += f" | In flight: {stats['frames_in_flight']}"
+        self.control_panel.update_stats(text)
+
     def pause_tracking(self):
         """Pause tracking without stopping camera"""
         if self.is_tracking:
@@ -409,11 +651,25 @@ class MainWindow(ctk.CTk):
         """Open settings dialog"""
         # Check if settings window exists and is still open
         if self.settings_window is None or not self.settings_window.winfo_exists():
-            self.settings_window = SettingsWindow(self, self.apply_new_settings)
+            self.settings_window = SettingsWindow(
+                self,
+                self.apply_new_settings,
+                self.run_autotune_from_settings,
+                self.open_fitts_test,
+                self.open_calibration,
+                self.clear_calibration
+            )
         else:
             # Window already exists, just bring it to front
             self.settings_window.focus()
 
+    def open_fitts_test(self):
+        """Open the absolute vs relative pointing test"""
+        if self.fitts_window is None or not self.fitts_window.winfo_exists():
+            self.fitts_window = FittsTestWindow(self)
+        else:
+            self.fitts_window.focus()
+
     def open_about(self):
         """Open about dialog"""
         try:
@@ -429,8 +685,12 @@ class MainWindow(ctk.CTk):
         if 'MOVEMENT_SENSITIVITY' in new_values:
             config.MOVEMENT_SENSITIVITY = new_values['MOVEMENT_SENSITIVITY']
 
+        if 'POINTER_MODE' in new_values:
+            config.POINTER_MODE = new_values['POINTER_MODE']
+
         if 'SMOOTHING_FACTOR' in new_values:
             config.SMOOTHING_FACTOR = new_values['SMOOTHING_FACTOR']
+            self.hand_tracker.set_smoothing_factor(new_values['SMOOTHING_FACTOR'])
 
         if 'SCROLL_SPEED_SLOW' in new_values:
             config.SCROLL_SPEED_SLOW = new_values['SCROLL_SPEED_SLOW']
@@ -450,6 +710,40 @@ class MainWindow(ctk.CTk):
         if 'DOUBLE_CLICK_TIME' in new_values:
             config.DOUBLE_CLICK_TIME = new_values['DOUBLE_CLICK_TIME']
 
+        # Click on press and pinch prediction
+        if 'CLICK_ON_PRESS' in new_values:
+            config.CLICK_ON_PRESS = new_values['CLICK_ON_PRESS']
+
+        if 'PINCH_PREDICTION_ENABLED' in new_values:
+            config.PINCH_PREDICTION_ENABLED = new_values['PINCH_PREDICTION_ENABLED']
+
+        # Gesture hold/release timings (CLICK_ENTER_MS, DRAG_EXIT_MS, ...)
+        timing_keys = [key for key in new_values if key.endswith(('_ENTER_MS', '_EXIT_MS'))]
+        for key in timing_keys:
+            setattr(config, key, new_values[key])
+        if timing_keys:
+            self.gesture_recognizer.apply_timings()
+
+        # Idle power mode
+        if 'IDLE_MODE_ENABLED' in new_values:
+            config.IDLE_MODE_ENABLED = new_values['IDLE_MODE_ENABLED']
+
+        if 'IDLE_TIMEOUT' in new_values:
+            config.IDLE_TIMEOUT = new_values['IDLE_TIMEOUT']
+
+        if 'IDLE_FPS' in new_values:
+            config.IDLE_FPS = new_values['IDLE_FPS']
+
+        if 'IDLE_WAKE_DETECTIONS' in new_values:
+            config.IDLE_WAKE_DETECTIONS = new_values['IDLE_WAKE_DETECTIONS']
+
+        # Cursor prediction
+        if 'PREDICTION_ENABLED' in new_values:
+            config.PREDICTION_ENABLED = new_values['PREDICTION_ENABLED']
+
+        if 'PREDICTION_HORIZON_MS' in new_values:
+            config.PREDICTION_HORIZON_MS = new_values['PREDICTION_HORIZON_MS']
+
         # --- NEW: Speech Setting ---
         # --- AUDIO SETTINGS BLOCK ---
         # Update Speech Enable/Disable
@@ -471,6 +765,9 @@ class MainWindow(ctk.CTk):
             if 'SMOOTHING_FACTOR' in new_values:
                 self.mouse_controller.smoother.smoothing_factor = new_values['SMOOTHING_FACTOR']
 
+            if 'PREDICTION_HORIZON_MS' in new_values:
+                self.mouse_controller.predictor.horizon_ms = new_values['PREDICTION_HORIZON_MS']
+
         print(f"Settings applied! Speech Enabled: {config.ENABLE_SPEECH}")
 
         # Sync Speech switch in Compact Window if settings changed it
@@ -507,5 +804,9 @@ class MainWindow(ctk.CTk):
         # Release hand tracker
         self.hand_tracker.release()
 
+        # Release the input device and the display connection
+        self.input_backend.close()
+        self.screen_layout.close()
+
         # Destroy window
         self.destroy()
\ No newline at end of file
@@ -7,13 +7,38 @@ import customtkinter as ctk
 import json
 import os
 
+# Gestures with hold/release timing sliders: (settings key, label, default enter ms, default exit ms)
+# Slider 10-100 → 0-450 milliseconds
+TIMING_GESTURES = (
+	('click', "Click", 0, 30),
+	('right_click', "Right-Click", 0, 100),
+	('drag', "Drag", 100, 200),
+	('scroll', "Scroll", 60, 100),
+	('clutch', "Clutch", 30, 60),
+)
+
+
+def timing_defaults():
+	"""Slider positions of the default gesture timings"""
+	defaults = {}
+	for name, _, enter_ms, exit_ms in TIMING_GESTURES:
+		defaults[f'{name}_enter'] = 10 + enter_ms // 5
+		defaults[f'{name}_exit'] = 10 + exit_ms // 5
+	return defaults
+
 
 class SettingsWindow(ctk.CTkToplevel):
 	"""Settings dialog with sliders for adjustable parameters"""
 
-	def __init__(self, parent, config_callback):
+	def __init__(self, parent, config_callback, autotune_callback=None, fitts_callback=None,
+				 calibration_callback=None, clear_calibration_callback=None):
 		super().__init__(parent)
 
+		self.autotune_callback = autotune_callback  # Function to re-run the hardware benchmark
+		self.fitts_callback = fitts_callback  # Function to open the pointing test
+		self.calibration_callback = calibration_callback  # Function to start pointer calibration
+		self.clear_calibration_callback = clear_calibration_callback  # Function to remove it
+
 		self.config_callback = config_callback  # Function to update main app config
 		self.settings_file = "user_settings.json"
 		self.config_callback = config_callback
@@ -23,23 +48,37 @@ class SettingsWindow(ctk.CTkToplevel):
 		self.settings = {}
 		self.scroll_frame = None
 		self.movement_slider = None
+		self.relative_switch = None
 		self.smoothing_slider = None
+		self.prediction_switch = None
+		self.prediction_slider = None
 		self.pinch_slider = None
 		self.double_click_slider = None
+		self.press_switch = None
+		self.predict_pinch_switch = None
+		self.timing_sliders = {}  # settings key → (slider, value label)
 		self.scroll_activation_slider = None
 		self.scroll_slow_slider = None
 		self.scroll_medium_slider = None
 		self.scroll_fast_slider = None
+		self.idle_switch = None
+		self.idle_timeout_slider = None
+		self.idle_fps_slider = None
+		self.idle_wake_slider = None
 
 		# Value labels for sliders (to update on reset)
 		self.movement_value_label = None
 		self.smoothing_value_label = None
+		self.prediction_value_label = None
 		self.pinch_value_label = None
 		self.double_click_value_label = None
 		self.scroll_activation_value_label = None
 		self.scroll_slow_value_label = None
 		self.scroll_medium_value_label = None
 		self.scroll_fast_value_label = None
+		self.idle_timeout_value_label = None
+		self.idle_fps_value_label = None
+		self.idle_wake_value_label = None
 
 		# Window configuration
 		self.title("Hand Mouse Controller - Settings")
@@ -81,7 +120,17 @@ class SettingsWindow(ctk.CTkToplevel):
 			'double_click_time': 50,  # unchanged
 			'enable_speech': 1,		  #1 for True/On
 			'speech_volume': 90,
+			'relative_pointer': 0,  # 0 = absolute mapping
+			'click_on_press': 0,  # 0 = click when the pinch is released
+			'predict_pinch': 0,
+			'enable_prediction': 1,  # 1 for True/On
+			'prediction_horizon': 64,  # → 60 ms
+			'enable_idle_mode': 1,  # 1 for True/On
+			'idle_timeout': 14,  # → 10 seconds
+			'idle_fps': 36,  # → 5 FPS
+			'idle_wake_detections': 10,  # → wake on first detection
 		}
+		default_settings.update(timing_defaults())
 
 		try:
 			if os.path.exists(self.settings_file):
@@ -123,9 +172,18 @@ class SettingsWindow(ctk.CTkToplevel):
 		# Mouse Control Section
 		self.create_section_header("Mouse Control")
 
+		self.relative_switch = ctk.CTkSwitch(
+			self.scroll_frame,
+			text="Relative Pointer (hand speed moves the cursor, ring pinch to reposition)",
+			command=lambda: self.update_setting('relative_pointer', self.relative_switch.get())
+		)
+		if self.settings.get('relative_pointer', 0):
+			self.relative_switch.select()
+		self.relative_switch.pack(pady=10, padx=20, anchor="w")
+
 		self.movement_slider, self.movement_value_label = self.create_slider(
 			"Movement Sensitivity",
-			"How fast the cursor moves",
+			"How fast the cursor moves in relative pointer mode",
 			self.settings['movement_sensitivity'],
 			lambda v: self.update_setting('movement_sensitivity', v)
 		)
@@ -137,6 +195,63 @@ class SettingsWindow(ctk.CTkToplevel):
 			lambda v: self.update_setting('smoothing', v)
 		)
 
+		self.prediction_switch = ctk.CTkSwitch(
+			self.scroll_frame,
+			text="Enable Cursor Prediction (compensates tracking delay)",
+			command=lambda: self.update_setting('enable_prediction', self.prediction_switch.get())
+		)
+		if self.settings.get('enable_prediction', 1):
+			self.prediction_switch.select()
+		self.prediction_switch.pack(pady=10, padx=20, anchor="w")
+
+		self.prediction_slider, self.prediction_value_label = self.create_slider(
+			"Prediction Horizon",
+			"How far ahead the cursor may be predicted (0-100 ms)",
+			self.settings['prediction_horizon'],
+			lambda v: self.update_setting('prediction_horizon', v)
+		)
+
+		if self.fitts_callback:
+			fitts_button = ctk.CTkButton(
+				self.scroll_frame,
+				text="Pointing Test (Absolute vs Relative)",
+				command=self.fitts_callback,
+				width=250
+			)
+			fitts_button.pack(pady=10, padx=20, anchor="w")
+
+		if self.calibration_callback:
+			calibration_description = ctk.CTkLabel(
+				self.scroll_frame,
+				text="Point at targets across the screen so the cursor follows your natural reach",
+				font=("Arial", 10),
+				text_color="gray",
+				anchor="w"
+			)
+			calibration_description.pack(padx=20, fill="x")
+
+			calibration_frame = ctk.CTkFrame(self.scroll_frame, fg_color="transparent")
+			calibration_frame.pack(pady=10, padx=20, anchor="w")
+
+			calibrate_button = ctk.CTkButton(
+				calibration_frame,
+				text="Calibrate Pointer",
+				command=self.calibration_callback,
+				width=150
+			)
+			calibrate_button.pack(side="left", padx=(0, 10))
+
+			if self.clear_calibration_callback:
+				clear_button = ctk.CTkButton(
+					calibration_frame,
+					text="Remove Calibration",
+					command=self.clear_calibration_callback,
+					fg_color="gray",
+					hover_color="darkgray",
+					width=150
+				)
+				clear_button.pack(side="left")
+
 		# Gesture Recognition Section
 		self.create_section_header("Gesture Recognition")
 
@@ -154,6 +269,43 @@ class SettingsWindow(ctk.CTkToplevel):
 			lambda v: self.update_setting('double_click_time', v)
 		)
 
+		self.press_switch = ctk.CTkSwitch(
+			self.scroll_frame,
+			text="Click on Press (button down when the pinch closes, up when it opens)",
+			command=lambda: self.update_setting('click_on_press', self.press_switch.get())
+		)
+		if self.settings.get('click_on_press', 0):
+			self.press_switch.select()
+		self.press_switch.pack(pady=10, padx=20, anchor="w")
+
+		self.predict_pinch_switch = ctk.CTkSwitch(
+			self.scroll_frame,
+			text="Predict Pinch (skip the click hold time for fast pinches)",
+			command=lambda: self.update_setting('predict_pinch', self.predict_pinch_switch.get())
+		)
+		if self.settings.get('predict_pinch', 0):
+			self.predict_pinch_switch.select()
+		self.predict_pinch_switch.pack(pady=10, padx=20, anchor="w")
+
+		# Gesture Timing Section
+		self.create_section_header("Gesture Timing")
+
+		for name, label, _, _ in TIMING_GESTURES:
+			enter_key = f'{name}_enter'
+			exit_key = f'{name}_exit'
+			self.timing_sliders[enter_key] = self.create_slider(
+				f"{label} Hold Time",
+				"How long the pose must be held before it counts (0-450 ms)",
+				self.settings[enter_key],
+				lambda v, key=enter_key: self.update_setting(key, v)
+			)
+			self.timing_sliders[exit_key] = self.create_slider(
+				f"{label} Release Time",
+				"How long the pose must be gone before it ends (0-450 ms)",
+				self.settings[exit_key],
+				lambda v, key=exit_key: self.update_setting(key, v)
+			)
+
 		# Scroll Settings Section
 		self.create_section_header("Scroll Settings")
 
@@ -205,6 +357,60 @@ class SettingsWindow(ctk.CTkToplevel):
 			self.speech_switch.select()
 		self.speech_switch.pack(pady=10, padx=20, anchor="w")
 
+		# Power Saving Section
+		self.create_section_header("Power Saving")
+
+		self.idle_switch = ctk.CTkSwitch(
+			self.scroll_frame,
+			text="Enable Idle Mode (low frame rate when no hand is visible)",
+			command=lambda: self.update_setting('enable_idle_mode', self.idle_switch.get())
+		)
+		if self.settings.get('enable_idle_mode', 1):
+			self.idle_switch.select()
+		self.idle_switch.pack(pady=10, padx=20, anchor="w")
+
+		self.idle_timeout_slider, self.idle_timeout_value_label = self.create_slider(
+			"Idle Timeout",
+			"How long without a hand before idle mode starts (5-120 seconds)",
+			self.settings['idle_timeout'],
+			lambda v: self.update_setting('idle_timeout', v)
+		)
+
+		self.idle_fps_slider, self.idle_fps_value_label = self.create_slider(
+			"Idle Frame Rate",
+			"Frames checked per second while idle (1-15 FPS)",
+			self.settings['idle_fps'],
+			lambda v: self.update_setting('idle_fps', v)
+		)
+
+		self.idle_wake_slider, self.idle_wake_value_label = self.create_slider(
+			"Wake Detections",
+			"Consecutive hand detections needed to leave idle mode (1-10)",
+			self.settings['idle_wake_detections'],
+			lambda v: self.update_setting('idle_wake_detections', v)
+		)
+
+		# Performance Section
+		if self.autotune_callback:
+			self.create_section_header("Performance")
+
+			autotune_description = ctk.CTkLabel(
+				self.scroll_frame,
+				text="Benchmark this computer and camera to pick the fastest tracking setup",
+				font=("Arial", 10),
+				text_color="gray",
+				anchor="w"
+			)
+			autotune_description.pack(padx=20, fill="x")
+
+			autotune_button = ctk.CTkButton(
+				self.scroll_frame,
+				text="Run Hardware Autotune",
+				command=self.autotune_callback,
+				width=200
+			)
+			autotune_button.pack(pady=10, padx=20, anchor="w")
+
 		# Buttons
 		button_frame = ctk.CTkFrame(self)
 		button_frame.pack(pady=10, fill="x", padx=20)
@@ -340,17 +546,20 @@ class SettingsWindow(ctk.CTkToplevel):
 
 	def convert_to_actual_values(self):
 		"""Convert slider values (10-100) to actual configuration values"""
-		return {
+		values = {
 			# Movement sensitivity: 10-100 → 0.8-5.0
 			'MOVEMENT_SENSITIVITY': 0.8 + (self.settings['movement_sensitivity'] - 10) * (5.0 - 0.8) / 90,
 
+			# Pointer mode
+			'POINTER_MODE': "relative" if self.settings.get('relative_pointer', 0) else "absolute",
+
 			# Smoothing: 10-100 → 0.5-0.9 (unchanged)
 			'SMOOTHING_FACTOR': 0.5 + (self.settings['smoothing'] - 10) * (0.9 - 0.5) / 90,
 
-			# Scroll speeds: Updated ranges
-			'SCROLL_SPEED_SLOW': 1 + int((self.settings['scroll_speed_slow'] - 10) * 49 / 90),  # 1-50
-			'SCROLL_SPEED_MEDIUM': 1 + int((self.settings['scroll_speed_medium'] - 10) * 29 / 90),  # 1-30
-			'SCROLL_SPEED_FAST': 1 + int((self.settings['scroll_speed_fast'] - 10) * 39 / 90),  # 1-40
+			# Scroll speeds: steps per frame at 30 FPS → units per second
+			'SCROLL_SPEED_SLOW': 30 * (1 + int((self.settings['scroll_speed_slow'] - 10) * 49 / 90)),  # 30-1500
+			'SCROLL_SPEED_MEDIUM': 30 * (1 + int((self.settings['scroll_speed_medium'] - 10) * 29 / 90)),  # 30-900
+			'SCROLL_SPEED_FAST': 30 * (1 + int((self.settings['scroll_speed_fast'] - 10) * 39 / 90)),  # 30-1200
 
 			# Scroll activation: 10-100 → 20-100 pixels (unchanged)
 			'SCROLL_ACTIVATION_THRESHOLD': 20 + int((self.settings['scroll_activation'] - 10) * 80 / 90),
@@ -361,13 +570,42 @@ class SettingsWindow(ctk.CTkToplevel):
 			# Double-click time: 10-100 → 0.1-1.0 seconds
 			'DOUBLE_CLICK_TIME': 0.1 + (self.settings['double_click_time'] - 10) * (1.0 - 0.1) / 90,
 
+			# Click on press and pinch onset prediction
+			'CLICK_ON_PRESS': bool(self.settings.get('click_on_press', 0)),
+			'PINCH_PREDICTION_ENABLED': bool(self.settings.get('predict_pinch', 0)),
+
 			# Add this line to pass the speech setting through
 			'ENABLE_SPEECH': bool(self.settings.get('enable_speech', 1)),
 
 			# Add this line (converts 0-100 to 0.0-1.0)
 			'SPEECH_VOLUME': self.settings.get('speech_volume', 50) / 100.0,
+
+			# Cursor prediction
+			'PREDICTION_ENABLED': bool(self.settings.get('enable_prediction', 1)),
+
+			# Prediction horizon: 10-100 → 0-100 milliseconds
+			'PREDICTION_HORIZON_MS': (self.settings['prediction_horizon'] - 10) * 100 / 90,
+
+			# Idle power mode
+			'IDLE_MODE_ENABLED': bool(self.settings.get('enable_idle_mode', 1)),
+
+			# Idle timeout: 10-100 → 5-120 seconds
+			'IDLE_TIMEOUT': 5 + (self.settings['idle_timeout'] - 10) * (120 - 5) / 90,
+
+			# Idle FPS: 10-100 → 1-15 frames per second
+			'IDLE_FPS': 1 + round((self.settings['idle_fps'] - 10) * 14 / 90),
+
+			# Wake detections: 10-100 → 1-10 frames
+			'IDLE_WAKE_DETECTIONS': 1 + int((self.settings['idle_wake_detections'] - 10) * 9 / 90),
 		}
 
+		# Gesture timings: 10-100 → 0-450 milliseconds (e.g. DRAG_ENTER_MS)
+		for name, _, _, _ in TIMING_GESTURES:
+			for phase in ('enter', 'exit'):
+				values[f'{name.upper()}_{phase.upper()}_MS'] = (self.settings[f'{name}_{phase}'] - 10) * 5
+
+		return values
+
 	def reset_to_defaults(self):
 		"""Reset all settings to default values"""
 		defaults = {
@@ -378,8 +616,13 @@ class SettingsWindow(ctk.CTkToplevel):
 			'scroll_speed_fast': 60,
 			'scroll_activation': 50,
 			'pinch_sensitivity': 50,
-			'double_click_time': 50
+			'double_click_time': 50,
+			'prediction_horizon': 64,
+			'idle_timeout': 14,
+			'idle_fps': 36,
+			'idle_wake_detections': 10
 		}
+		defaults.update(timing_defaults())
 
 		# Update settings dictionary
 		self.settings.clear()
@@ -389,9 +632,18 @@ class SettingsWindow(ctk.CTkToplevel):
 		self.movement_slider.set(defaults['movement_sensitivity'])
 		self.movement_value_label.configure(text=f"{defaults['movement_sensitivity']}")
 
+		self.relative_switch.deselect()
+		self.update_setting('relative_pointer', 0)
+
 		self.smoothing_slider.set(defaults['smoothing'])
 		self.smoothing_value_label.configure(text=f"{defaults['smoothing']}")
 
+		self.prediction_switch.select()
+		self.update_setting('enable_prediction', 1)
+
+		self.prediction_slider.set(defaults['prediction_horizon'])
+		self.prediction_value_label.configure(text=f"{defaults['prediction_horizon']}")
+
 		self.scroll_slow_slider.set(defaults['scroll_speed_slow'])
 		self.scroll_slow_value_label.configure(text=f"{defaults['scroll_speed_slow']}")
 
@@ -410,6 +662,16 @@ class SettingsWindow(ctk.CTkToplevel):
 		self.double_click_slider.set(defaults['double_click_time'])
 		self.double_click_value_label.configure(text=f"{defaults['double_click_time']}")
 
+		self.press_switch.deselect()
+		self.update_setting('click_on_press', 0)
+
+		self.predict_pinch_switch.deselect()
+		self.update_setting('predict_pinch', 0)
+
+		for key, (slider, value_label) in self.timing_sliders.items():
+			slider.set(defaults[key])
+			value_label.configure(text=f"{defaults[key]}")
+
 		self.speech_switch.select()
 		self.update_setting('enable_speech', 1)
 
@@ -417,6 +679,18 @@ class SettingsWindow(ctk.CTkToplevel):
 		self.volume_value_label.configure(text="90")
 		self.update_setting('speech_volume', 90)
 
+		self.idle_switch.select()
+		self.update_setting('enable_idle_mode', 1)
+
+		self.idle_timeout_slider.set(defaults['idle_timeout'])
+		self.idle_timeout_value_label.configure(text=f"{defaults['idle_timeout']}")
+
+		self.idle_fps_slider.set(defaults['idle_fps'])
+		self.idle_fps_value_label.configure(text=f"{defaults['idle_fps']}")
+
+		self.idle_wake_slider.set(defaults['idle_wake_detections'])
+		self.idle_wake_value_label.configure(text=f"{defaults['idle_wake_detections']}")
+
 		# Save and apply
 		self.apply_settings()
 
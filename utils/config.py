@@ -3,18 +3,75 @@ Configuration settings for Hand Mouse Controller
 All adjustable parameters in one place
 """
 
+import os
+
+# Application directory (bundled files are looked up here, not in the working directory)
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 # Camera Settings
 CAMERA_INDEX = 0  # Default camera (0 = primary webcam)
 CAMERA_WIDTH = 640
 CAMERA_HEIGHT = 480
 FPS = 30
 USE_DSHOW = True  # Use DirectShow on Windows (faster initialization)
+FRAME_WAIT_TIMEOUT = 0.1  # Seconds the tracking thread waits for a new frame
+FRAME_POOL_SIZE = 6  # Reusable frame buffers shared by capture, tracking and UI
+MIRROR_IN_LANDMARK_SPACE = True  # Mirror landmark x (1 - x) instead of flipping every frame
 
 
 # Hand Detection Settings
 MIN_DETECTION_CONFIDENCE = 0.7
 MIN_TRACKING_CONFIDENCE = 0.5
 MAX_NUM_HANDS = 1  # Only track one hand
+MODEL_COMPLEXITY = 1  # MediaPipe Hands model: 0 = lite (faster), 1 = full
+
+
+# Inference Input (hand-ROI cropping and downscaling)
+INFERENCE_WIDTH = 320  # Image size actually handed to MediaPipe
+INFERENCE_HEIGHT = 240
+ENABLE_HAND_ROI = True  # Crop around the last known hand instead of sending the full frame
+ROI_PADDING = 0.35  # Padding on each side, as a fraction of the hand size
+ROI_MIN_SIZE = 0.35  # Minimum crop height as a fraction of the frame height
+ROI_MAX_AREA = 0.6  # Use the full frame if the crop would cover more than this
+
+
+# Optical-Flow Propagation (landmarks carried forward between MediaPipe inferences)
+INFERENCE_INTERVAL = 2  # Run MediaPipe every Nth frame (1 = every frame, no propagation)
+FLOW_SIZE = (320, 240)  # Grayscale image size used for optical flow
+FLOW_WINDOW = (15, 15)  # Lucas-Kanade search window in pixels
+FLOW_PYRAMID_LEVELS = 2  # Pyramid levels above the base image
+FLOW_MAX_ERROR = 20.0  # Re-anchor with a full inference if any point's flow error exceeds this
+
+
+# Tracker Backend
+# "solutions" = legacy MediaPipe Hands (in process)
+# "process"   = legacy MediaPipe Hands in a worker process (frames shared via shared memory)
+# "tasks"     = MediaPipe Tasks HandLandmarker in asynchronous LIVE_STREAM mode
+TRACKER_BACKEND = "solutions"
+HAND_LANDMARKER_MODEL_PATH = os.path.join(APP_DIR, "models", "hand_landmarker.task")  # Required by the "tasks" backend
+
+
+# Tracker Worker Process (used by the "process" backend)
+TRACKER_PROCESS_SLOTS = 2  # Frame slots in the shared-memory ring
+TRACKER_HEARTBEAT_INTERVAL = 0.5  # Seconds between worker heartbeats when idle
+TRACKER_HEARTBEAT_TIMEOUT = 3.0  # Restart the worker if its heartbeat is older than this
+TRACKER_STARTUP_TIMEOUT = 20.0  # Seconds allowed for the worker to import MediaPipe
+TRACKER_RESPONSE_TIMEOUT = 1.0  # Seconds to wait for a single frame result
+
+
+# Motion Gate (skip inference while the scene is static)
+MOTION_GATE_ENABLED = True
+MOTION_GATE_SIZE = (64, 48)  # Downsampled grayscale size used for frame differencing
+MOTION_PIXEL_THRESHOLD = 15  # Gray level change for a pixel to count as moving
+MOTION_AREA_THRESHOLD = 0.002  # Fraction of moving pixels needed to run inference
+MOTION_GATE_MAX_STALENESS = 0.5  # Seconds - always re-run inference at least this often
+
+
+# Idle Power Mode (low-rate detection when no hand has been seen for a while)
+IDLE_MODE_ENABLED = True
+IDLE_TIMEOUT = 10.0  # Seconds without a hand before entering idle mode
+IDLE_FPS = 5  # Frames processed per second while idle
+IDLE_WAKE_DETECTIONS = 1  # Consecutive hand detections needed to return to full rate
 
 
 # Gesture Recognition Thresholds
@@ -22,27 +79,134 @@ PINCH_THRESHOLD = 0.045  # Distance ratio for detecting pinch
 CLICK_COOLDOWN = 0.3  # Seconds between clicks
 DOUBLE_CLICK_TIME = 0.7  # Maximum seconds between clicks for double-click
 
+# Gesture Timing (milliseconds of capture time, so gestures feel the same at any frame rate)
+# Enter = how long a pose must be held before the gesture starts
+# Exit  = how long the pose must be gone before the gesture ends
+CLICK_ENTER_MS = 0  # Thumb + index pinch
+CLICK_EXIT_MS = 30  # The click fires once the pinch has been open this long
+RIGHT_CLICK_ENTER_MS = 0  # Thumb + middle pinch (fires on enter)
+RIGHT_CLICK_EXIT_MS = 100
+DRAG_ENTER_MS = 100  # Thumb + pinky pinch
+DRAG_EXIT_MS = 200  # Rides out short tracking dropouts without dropping the item
+SCROLL_ENTER_MS = 60  # Clenched fist
+SCROLL_EXIT_MS = 100
+CLUTCH_ENTER_MS = 30  # Thumb + ring pinch
+CLUTCH_EXIT_MS = 60
+
+# Click on Press (mouse down when the index pinch closes, up when it opens, instead of a
+# whole click on release)
+CLICK_ON_PRESS = False
+# Pinch prediction: a pinch that was seen closing fast skips CLICK_ENTER_MS and presses as soon as
+# the fingers touch (no effect with CLICK_ENTER_MS = 0). The button only goes down on a real pinch,
+# so a prediction that does not come true never clicks.
+PINCH_PREDICTION_ENABLED = False
+PINCH_PREDICTION_MS = 40  # How far ahead the closing motion is extrapolated
+PINCH_MIN_CLOSING_SPEED = 0.5  # Frame widths per second the fingertips must approach at
+PINCH_MIN_OPENING_SPEED = 0.2  # Frame widths per second apart that cancel a prediction (ignores jitter)
+PINCH_PREDICTION_TIMEOUT_MS = 100  # A prediction the real pinch does not confirm in time is dropped
+
 
 
 # Mouse Control Settings
 SCREEN_REDUCTION_FACTOR = 0.7  # Use 70% of screen for safety margin
-MOVEMENT_SENSITIVITY = 1.2  # Cursor speed multiplier
+MULTI_MONITOR_ENABLED = True  # Map the hand over every monitor (Xrandr / Win32), not just the primary
+MOVEMENT_SENSITIVITY = 1.2  # Cursor speed multiplier (relative pointer mode)
+# "absolute" = hand position inside the active area maps straight to the screen
+# "relative" = hand velocity drives cursor velocity through the gain curve (like a mouse)
+POINTER_MODE = "absolute"
+POINTER_GAIN_MIN = 0.3  # Gain for slow, precise movement (x MOVEMENT_SENSITIVITY)
+POINTER_GAIN_MAX = 2.0  # Gain for fast travel (x MOVEMENT_SENSITIVITY)
+POINTER_GAIN_INFLECTION = 0.5  # Hand speed (frame widths/second) halfway between the two gains
+POINTER_GAIN_STEEPNESS = 8.0  # How quickly the gain rises around the inflection speed
 SMOOTHING_FACTOR = 0.7  # 0 = no smoothing, 1 = max smoothing
+# "one_euro" = speed-adaptive One Euro filter on all landmarks (frame-rate independent)
+# "ema"      = fixed exponential moving average on the cursor only
+SMOOTHING_MODE = "one_euro"
+ONE_EURO_MIN_CUTOFF = 1.0  # Hz at SMOOTHING_FACTOR - lower = steadier when the hand is still
+ONE_EURO_BETA = 20.0  # Cutoff increase per (frame widths / second) of landmark speed
+ONE_EURO_D_CUTOFF = 1.0  # Hz cutoff of the speed estimate
+
+
+# Cursor Prediction (compensates the time between camera capture and cursor move)
+PREDICTION_ENABLED = True
+PREDICTION_HORIZON_MS = 60  # Maximum extrapolation; the measured latency is used below this
+PREDICTION_ALPHA = 0.6  # Position correction gain of the alpha-beta filter
+PREDICTION_BETA = 0.2  # Velocity correction gain of the alpha-beta filter
+PREDICTION_MIN_SPEED = 150  # Pixels/second where prediction reaches half strength
+
+
+# Mouse Input Backend
+# "pyautogui" = cross-platform (with the fail-safe corner)
+# "xtest"     = X11 XTest extension via python-xlib (lowest overhead on X11)
+# "uinput"    = Linux virtual pointer via python-evdev (X11 and Wayland, needs /dev/uinput access)
+# "recording" = records events in memory without moving the real cursor (tests and benchmarks)
+INPUT_BACKEND = "pyautogui"
+OUTPUT_RATE_HZ = 120  # Cursor moves per second (match the display refresh rate, 0 = camera rate)
 
 
 # Scroll Settings (Fist-based joystick scroll)
+# Speed rises continuously through the slow/medium/fast points and is independent of frame rate
 SCROLL_ACTIVATION_THRESHOLD = 20  # Pixels to move from neutral to start scrolling
-SCROLL_SPEED_SLOW = 9  # Scroll steps per frame (slow scroll)
-SCROLL_SPEED_MEDIUM = 11  # Scroll steps per frame (medium scroll)
-SCROLL_SPEED_FAST = 13  # Scroll steps per frame (fast scroll)
+SCROLL_SPEED_SLOW = 270  # Scroll units per second at the activation threshold
+SCROLL_SPEED_MEDIUM = 330  # Scroll units per second at SCROLL_ZONE_MEDIUM
+SCROLL_SPEED_FAST = 390  # Scroll units per second at SCROLL_ZONE_FAST and beyond
 SCROLL_ZONE_MEDIUM = 100  # Pixels from neutral for medium speed
 SCROLL_ZONE_FAST = 150  # Pixels from neutral for fast speed
+HORIZONTAL_SCROLL_ENABLED = True  # Moving the fist sideways scrolls horizontally
+SCROLL_OUTPUT_RATE_HZ = 60  # Scroll events per second sent by the output stage
+SCROLL_RATE_TIMEOUT = 0.5  # Stop scrolling if the rate is not refreshed within this many seconds
 
 
 # UI Settings
 PREVIEW_WIDTH = 480
 PREVIEW_HEIGHT = 360
 UI_UPDATE_INTERVAL = 30  # milliseconds
+STATS_UPDATE_INTERVAL = 1.0  # Seconds between pipeline statistics refreshes
+
+
+# Adaptive Quality (steps quality down when frames miss the 1/FPS budget)
+ADAPTIVE_QUALITY_ENABLED = True
+QUALITY_LEVELS = [
+    # Level 0 is the configured quality, later levels are progressively cheaper
+    {'capture': (CAMERA_WIDTH, CAMERA_HEIGHT), 'inference': (INFERENCE_WIDTH, INFERENCE_HEIGHT),
+     'model_complexity': MODEL_COMPLEXITY, 'preview_interval': UI_UPDATE_INTERVAL},
+    {'capture': (CAMERA_WIDTH, CAMERA_HEIGHT), 'inference': (256, 192),
+     'model_complexity': MODEL_COMPLEXITY, 'preview_interval': 60},
+    {'capture': (CAMERA_WIDTH, CAMERA_HEIGHT), 'inference': (256, 192),
+     'model_complexity': 0, 'preview_interval': 100},
+    {'capture': (320, 240), 'inference': (192, 144),
+     'model_complexity': 0, 'preview_interval': 200},
+]
+QUALITY_DOWN_RATIO = 1.0  # Step down when average frame time exceeds budget * this
+QUALITY_UP_RATIO = 0.6  # Step up when average frame time is below budget * this
+QUALITY_DOWN_FRAMES = 15  # Consecutive slow frames before stepping down
+QUALITY_UP_FRAMES = 90  # Consecutive fast frames before stepping up (hysteresis)
+QUALITY_COOLDOWN = 3.0  # Minimum seconds between level changes
+
+
+# Pointer Calibration (per user and camera, cached next to user_settings.json)
+# A saved calibration replaces the centered SCREEN_REDUCTION_FACTOR area with a fitted warp
+CALIBRATIONS_FILE = "calibrations.json"
+CALIBRATION_GRID = (3, 3)  # Targets across and down the desktop
+CALIBRATION_MARGIN = 0.1  # Distance of the outer targets from the desktop edges (fraction)
+CALIBRATION_DWELL = 1.0  # Seconds the fingertip must hold still to record a target
+CALIBRATION_STABILITY = 0.01  # Largest fingertip wander while holding (frame widths)
+CALIBRATION_LUT_SIZE = (64, 48)  # Lookup grid over the camera frame
+LENS_DISTORTION = None  # Webcam (k1, k2, p1, p2, k3) from an OpenCV calibration, None = no undistortion
+CAMERA_HORIZONTAL_FOV = 60  # Degrees, used for the camera matrix when undistorting
+
+
+# Hardware Autotune (benchmarked once per CPU and camera, cached next to user_settings.json)
+AUTOTUNE_ENABLED = True  # Run the benchmark on the first start on new hardware
+HARDWARE_PROFILES_FILE = "hardware_profiles.json"
+AUTOTUNE_CLIP_PATH = os.path.join(APP_DIR, "assets", "autotune_clip.mp4")  # Optional recorded clip (recorded from the camera otherwise)
+AUTOTUNE_LATENCY_TARGET_MS = 20  # 90th percentile tracker time per frame to accept a configuration
+AUTOTUNE_FRAMES = 40  # Frames timed per configuration
+AUTOTUNE_WARMUP_FRAMES = 5  # Frames run before timing starts
+AUTOTUNE_MODEL_COMPLEXITIES = (1, 0)  # Best first
+AUTOTUNE_INFERENCE_SIZES = ((320, 240), (256, 192), (192, 144))  # Best first
+AUTOTUNE_THREAD_COUNTS = (None, 1, 2, 4)  # OpenCV threads (None = OpenCV default)
+AUTOTUNE_FOURCCS = ("MJPG", "YUYV")  # Capture formats to try
 
 
 # Colors for visualization (BGR format for OpenCV)
@@ -75,6 +239,31 @@ GESTURE_DOUBLE_CLICK = "double_click"
 GESTURE_RIGHT_CLICK = "right_click"
 GESTURE_DRAG = "drag"
 GESTURE_SCROLL = "scroll"
+GESTURE_CLUTCH = "clutch"  # Thumb + ring pinch: move the hand without moving the cursor
+GESTURE_PRESS = "press"  # Thumb + index pinch held in click-on-press mode (left button down)
+
+# Gesture Table (highest priority first - while a pose is held, the rows below it are not evaluated)
+# pose:   ("pinch", finger, finger) or ("fist",) - fingers are thumb, index, middle, ring, pinky
+# emit:   "enter" = gesture once when the pose starts, "hold" = gesture on every frame while it
+#         is held, "release" = gesture once when it ends
+# timing: prefix of the *_ENTER_MS / *_EXIT_MS settings (or give "enter_ms" / "exit_ms" directly)
+# double: gesture for a second release within DOUBLE_CLICK_TIME
+# press:  gesture held instead while CLICK_ON_PRESS is on
+# button: mouse button clicked when the gesture fires (for added gestures), e.g. middle click on
+#         a thumb + ring pinch: {'name': 'middle_click', 'pose': ('pinch', 'thumb', 'ring'),
+#         'emit': 'release', 'enter_ms': 0, 'exit_ms': 30, 'gesture': "middle_click", 'button': 'middle'}
+GESTURE_TABLE = [
+    {'name': 'right_click', 'pose': ('pinch', 'thumb', 'middle'), 'emit': 'enter', 'timing': 'RIGHT_CLICK',
+     'gesture': GESTURE_RIGHT_CLICK},
+    {'name': 'clutch', 'pose': ('pinch', 'thumb', 'ring'), 'emit': 'hold', 'timing': 'CLUTCH',
+     'gesture': GESTURE_CLUTCH},
+    {'name': 'scroll', 'pose': ('fist',), 'emit': 'hold', 'timing': 'SCROLL',
+     'gesture': GESTURE_SCROLL},
+    {'name': 'drag', 'pose': ('pinch', 'thumb', 'pinky'), 'emit': 'hold', 'timing': 'DRAG',
+     'gesture': GESTURE_DRAG},
+    {'name': 'click', 'pose': ('pinch', 'thumb', 'index'), 'emit': 'release', 'timing': 'CLICK',
+     'gesture': GESTURE_CLICK, 'double': GESTURE_DOUBLE_CLICK, 'press': GESTURE_PRESS},
+]
 
 
 # Advanced UI Features
@@ -105,6 +294,7 @@ STATUS_TRACKING = "Tracking Active"
 STATUS_PAUSED = "Paused"
 STATUS_NO_CAMERA = "Camera Not Found"
 STATUS_NO_HAND = "No Hand Detected"
+STATUS_IDLE = "Idle (Low Power)"
 
 
 # Text-to-Speech Settings
@@ -0,0 +1,100 @@
+"""
+Fitts' law pointing test
+Target layout and effective throughput (ISO 9241-9 multidirectional tapping task)
+"""
+
+import numpy as np
+
+# Effective width = 4.133 standard deviations of the endpoints (96% hit rate)
+EFFECTIVE_WIDTH_FACTOR = 4.133
+
+
+def target_positions(count, diameter, center):
+	"""
+	Targets evenly spaced around a circle
+
+	Args:
+		count: Number of targets (odd, so the order visits every target)
+		diameter: Circle diameter in pixels
+		center: (x, y) of the circle center
+
+	Returns:
+		(count, 2) array of target centers
+	"""
+	angles = np.arange(count) * 2 * np.pi / count - np.pi / 2
+	return np.column_stack((np.cos(angles), np.sin(angles))) * diameter / 2 + center
+
+
+def target_order(count):
+	"""
+	Visiting order that crosses the circle on every movement
+
+	Args:
+		count: Number of targets (odd)
+
+	Returns:
+		List of target indices, one full round plus the starting target
+	"""
+	step = (count + 1) // 2
+	return [(i * step) % count for i in range(count + 1)]
+
+
+class FittsBlock:
+	"""Movements of one block (one pointer mode, one target size)"""
+
+	def __init__(self, target_width):
+		self.target_width = target_width
+		self.trials = []  # (from, to, endpoint, movement time)
+
+	def record(self, start, target, endpoint, movement_time):
+		"""
+		Add one movement
+
+		Args:
+			start: Center of the target the movement started from
+			target: Center of the target aimed at
+			endpoint: Where the click landed
+			movement_time: Seconds since the previous click
+		"""
+		self.trials.append((np.asarray(start, dtype=np.float64), np.asarray(target, dtype=np.float64),
+							np.asarray(endpoint, dtype=np.float64), movement_time))
+
+	def get_results(self):
+		"""
+		Effective throughput of the block
+
+		Returns:
+			Dictionary with throughput (bits/s), effective index of difficulty (bits),
+			effective width and distance (pixels), mean movement time (s) and error rate,
+			or None with fewer than two movements
+		"""
+		if len(self.trials) < 2:
+			return None
+
+		deviations = []
+		distances = []
+		errors = 0
+		for start, target, endpoint, _ in self.trials:
+			axis = target - start
+			length = np.linalg.norm(axis)
+
+			# Endpoint deviation along the task axis (overshoot positive)
+			deviation = np.dot(endpoint - start, axis) / length - length
+			deviations.append(deviation)
+			distances.append(length + deviation)
+			if np.linalg.norm(endpoint - target) > self.target_width / 2:
+				errors += 1
+
+		effective_width = EFFECTIVE_WIDTH_FACTOR * np.std(deviations, ddof=1)
+		effective_distance = np.mean(distances)
+		effective_id = np.log2(effective_distance / max(effective_width, 1.0) + 1)
+		movement_time = np.mean([trial[3] for trial in self.trials])
+
+		return {
+			'throughput': float(effective_id / movement_time),
+			'effective_id': float(effective_id),
+			'effective_width': float(effective_width),
+			'effective_distance': float(effective_distance),
+			'movement_time': float(movement_time),
+			'error_rate': errors / len(self.trials)
+		}
@@ -0,0 +1,78 @@
+"""
+Latest-frame mailbox
+Hands camera frames from the capture thread to the tracking thread
+"""
+
+import threading
+
+
+class FrameMailbox:
+	"""Single-slot mailbox that only ever holds the newest camera frame"""
+
+	def __init__(self):
+		self.condition = threading.Condition()
+		self.frame = None
+		self.timestamp = None
+
+		# Statistics
+		self.frames_posted = 0
+		self.frames_dropped = 0  # Frames replaced before anyone picked them up
+
+	def put(self, frame, timestamp):
+		"""
+		Post a new frame, replacing any frame that was not consumed yet
+
+		Args:
+			frame: BGR image from camera
+			timestamp: Capture time (time.monotonic() seconds)
+
+		Returns:
+			The stale frame that was replaced (so its buffer can be reused), or None
+		"""
+		with self.condition:
+			stale_frame = self.frame
+			if stale_frame is not None:
+				# Nobody took the previous frame - it is stale now
+				self.frames_dropped += 1
+
+			self.frame = frame
+			self.timestamp = timestamp
+			self.frames_posted += 1
+			self.condition.notify()
+
+		return stale_frame
+
+	def get(self, timeout=None):
+		"""
+		Take the newest frame, waiting for one if the slot is empty
+
+		Args:
+			timeout: Maximum seconds to wait (None = wait forever)
+
+		Returns:
+			Tuple (frame, timestamp), or (None, None) on timeout
+		"""
+		with self.condition:
+			if self.frame is None:
+				self.condition.wait(timeout)
+
+			if self.frame is None:
+				return None, None
+
+			frame, timestamp = self.frame, self.timestamp
+			self.frame = None
+			self.timestamp = None
+			return frame, timestamp
+
+	def clear(self):
+		"""Discard any pending frame and wake up waiting readers"""
+		with self.condition:
+			self.frame = None
+			self.timestamp = None
+			self.condition.notify_all()
+
+	def reset_stats(self):
+		"""Reset frame counters"""
+		with self.condition:
+			self.frames_posted = 0
+			self.frames_dropped = 0
@@ -0,0 +1,109 @@
+"""
+Frame buffer pool
+Reuses preallocated image buffers so the capture path does not allocate per frame
+"""
+
+import threading
+import numpy as np
+
+# Global allocation counter shared by every pool and reserved buffer
+_allocation_lock = threading.Lock()
+_allocation_count = 0
+
+
+def _count_allocation():
+	"""Record that a new image buffer had to be allocated"""
+	global _allocation_count
+	with _allocation_lock:
+		_allocation_count += 1
+
+
+def get_allocation_count():
+	"""
+	Get the number of image buffers allocated so far
+
+	Returns:
+		Total allocation count since startup
+	"""
+	return _allocation_count
+
+
+def reserve_buffer(buffer, shape, dtype=np.uint8):
+	"""
+	Reuse a buffer if it already has the right shape, otherwise allocate a new one
+
+	Args:
+		buffer: Existing buffer (or None)
+		shape: Required array shape
+		dtype: Required array type
+
+	Returns:
+		A buffer with the requested shape and type
+	"""
+	shape = tuple(shape)
+	if buffer is not None and buffer.shape == shape and buffer.dtype == dtype:
+		return buffer
+
+	_count_allocation()
+	return np.empty(shape, dtype=dtype)
+
+
+class FramePool:
+	"""Fixed set of reusable frame buffers shared between pipeline stages"""
+
+	def __init__(self, shape, size, dtype=np.uint8):
+		self.size = size
+		self.dtype = dtype
+		self.lock = threading.Lock()
+		self.shape = None
+		self.free_buffers = []
+
+		self.resize(shape)
+
+	def resize(self, shape):
+		"""
+		Change buffer shape and preallocate a fresh set of buffers
+
+		Args:
+			shape: New frame shape (height, width, channels)
+		"""
+		shape = tuple(shape)
+		with self.lock:
+			if shape == self.shape:
+				return
+			self.shape = shape
+			self.free_buffers = []
+			for _ in range(self.size):
+				_count_allocation()
+				self.free_buffers.append(np.empty(shape, dtype=self.dtype))
+
+	def acquire(self):
+		"""
+		Take a buffer from the pool
+
+		Returns:
+			Array with the pool's shape (allocated only if the pool ran dry)
+		"""
+		with self.lock:
+			if self.free_buffers:
+				return self.free_buffers.pop()
+			shape = self.shape
+
+		_count_allocation()
+		return np.empty(shape, dtype=self.dtype)
+
+	def release(self, buffer):
+		"""
+		Return a buffer to the pool
+
+		Args:
+			buffer: Array previously taken with acquire() (None is ignored)
+		"""
+		if buffer is None:
+			return
+
+		with self.lock:
+			# Buffers from an old shape, or extras allocated while the pool was dry, are dropped
+			if buffer.shape != self.shape or len(self.free_buffers) >= self.size:
+				return
+			self.free_buffers.append(buffer)
@@ -4,27 +4,129 @@ Reduces jitter from hand tracking
 """
 
 from collections import deque
-from utils.config import SMOOTHING_FACTOR
+import numpy as np
+from utils.config import (
+    SMOOTHING_FACTOR,
+    SMOOTHING_MODE,
+    ONE_EURO_MIN_CUTOFF,
+    ONE_EURO_BETA,
+    ONE_EURO_D_CUTOFF,
+    PREDICTION_HORIZON_MS,
+    PREDICTION_ALPHA,
+    PREDICTION_BETA,
+    PREDICTION_MIN_SPEED,
+    PINCH_PREDICTION_MS,
+    PINCH_MIN_CLOSING_SPEED,
+    PINCH_MIN_OPENING_SPEED
+)
+
+# Smoothing modes (SMOOTHING_MODE values)
+SMOOTHING_EMA = "ema"
+SMOOTHING_ONE_EURO = "one_euro"
+
+
+class OneEuroFilter:
+	"""
+	Speed-adaptive low-pass filter (Casiez et al. One Euro filter)
+	Works element-wise on arrays of any shape and uses real sample timestamps,
+	so it behaves the same at any frame rate
+	"""
+	
+	def __init__(self, min_cutoff=ONE_EURO_MIN_CUTOFF, beta=ONE_EURO_BETA, d_cutoff=ONE_EURO_D_CUTOFF):
+		self.min_cutoff = min_cutoff  # Hz - cutoff while still (lower = steadier)
+		self.beta = beta  # Cutoff increase per unit of speed (higher = less lag when fast)
+		self.d_cutoff = d_cutoff  # Hz - cutoff used for the speed estimate
+		
+		self.value = None
+		self.derivative = None
+		self.last_timestamp = None
+	
+	# noinspection PyMethodMayBeStatic
+	def _alpha(self, cutoff, dt):
+		"""Smoothing factor of a first-order low-pass filter for this time step"""
+		tau = 1.0 / (2 * np.pi * cutoff)
+		return 1.0 / (1.0 + tau / dt)
+	
+	def filter(self, values, timestamp):
+		"""
+		Filter one sample
+
+		Args:
+			values: Array (or scalar) of raw values
+			timestamp: Sample time in seconds
+
+		Returns:
+			Filtered values as a new array
+		"""
+		values = np.asarray(values, dtype=np.float64)
+		
+		if self.value is None:
+			self.value = values.copy()
+			self.derivative = np.zeros_like(self.value)
+			self.last_timestamp = timestamp
+			return self.value.copy()
+		
+		dt = timestamp - self.last_timestamp
+		if dt <= 0:
+			return self.value.copy()  # Same sample again
+		self.last_timestamp = timestamp
+		
+		# Smoothed speed decides how much smoothing the values get
+		raw_derivative = (values - self.value) / dt
+		self.derivative += self._alpha(self.d_cutoff, dt) * (raw_derivative - self.derivative)
+		cutoff = self.min_cutoff + self.beta * np.abs(self.derivative)
+		
+		self.value += self._alpha(cutoff, dt) * (values - self.value)
+		return self.value.copy()
+	
+	def reset(self):
+		"""Forget the filter history"""
+		self.value = None
+		self.derivative = None
+		self.last_timestamp = None
 
 
 class MovementSmoother:
-	"""Applies exponential moving average to smooth cursor movement"""
+	"""
+	Smooths cursor movement or hand landmarks
+	"ema" applies a fixed exponential moving average per call, "one_euro" applies a
+	timestamp-aware One Euro filter; smoothing_factor drives both
+	"""
 	
-	def __init__(self, smoothing_factor=SMOOTHING_FACTOR):
-		self.smoothing_factor = smoothing_factor
+	def __init__(self, smoothing_factor=SMOOTHING_FACTOR, mode=SMOOTHING_MODE):
+		self.mode = mode
+		self.filter = OneEuroFilter()
 		self.prev_x = None
 		self.prev_y = None
+		self.smoothing_factor = smoothing_factor
+	
+	@property
+	def smoothing_factor(self):
+		return self._smoothing_factor
 	
-	def smooth_position(self, x, y):
+	@smoothing_factor.setter
+	def smoothing_factor(self, value):
+		self._smoothing_factor = value
+		
+		# Same slider for the One Euro filter: the default factor gives ONE_EURO_MIN_CUTOFF,
+		# more smoothing lowers the resting cutoff
+		self.filter.min_cutoff = ONE_EURO_MIN_CUTOFF * (1 - value) / (1 - SMOOTHING_FACTOR)
+	
+	def smooth_position(self, x, y, timestamp=None):
 		"""
-		Apply exponential smoothing to coordinates
+		Apply smoothing to coordinates
 
 		Args:
 			x, y: Current raw coordinates from hand tracking
+			timestamp: Capture time in seconds (required by the One Euro filter)
 
 		Returns:
 			Tuple of smoothed (x, y) coordinates
 		"""
+		if self.mode == SMOOTHING_ONE_EURO and timestamp is not None:
+			smooth_x, smooth_y = self.filter.filter((x, y), timestamp)
+			return int(smooth_x), int(smooth_y)
+		
 		if self.prev_x is None:
 			# First time - no previous position to smooth with
 			self.prev_x = x
@@ -41,10 +143,229 @@ class MovementSmoother:
 		
 		return int(smooth_x), int(smooth_y)
 	
+	def smooth_points(self, points, timestamp):
+		"""
+		Filter a whole landmark array in one vectorized step
+
+		Args:
+			points: (21, 3) landmark array (overwritten with the filtered values)
+			timestamp: Capture time in seconds
+
+		Returns:
+			The same array, now filtered
+		"""
+		points[:] = self.filter.filter(points, timestamp)
+		return points
+	
 	def reset(self):
 		"""Reset smoothing history"""
 		self.prev_x = None
 		self.prev_y = None
+		self.filter.reset()
+
+
+class CursorPredictor:
+	"""
+	Alpha-beta (constant velocity) filter that extrapolates the cursor forward by the
+	pipeline latency, so it does not trail the finger by the time since capture
+	"""
+	
+	def __init__(self, horizon_ms=PREDICTION_HORIZON_MS, alpha=PREDICTION_ALPHA, beta=PREDICTION_BETA):
+		self.horizon_ms = horizon_ms  # Upper bound on how far ahead to extrapolate
+		self.alpha = alpha  # Position correction gain
+		self.beta = beta  # Velocity correction gain
+		
+		self.position = None  # Filtered position (pixels)
+		self.velocity = np.zeros(2)  # Pixels per second
+		self.last_timestamp = None
+		self.confidence = 0.0
+		
+		# Predictions waiting for the sample that shows where the finger really went
+		self.pending = deque(maxlen=32)
+		self.average_error = None
+	
+	def predict(self, x, y, timestamp, now):
+		"""
+		Filter a sample and extrapolate it to the present
+
+		Args:
+			x, y: Measured position (pixels)
+			timestamp: Capture time of the measurement (time.monotonic() seconds)
+			now: Current time.monotonic()
+
+		Returns:
+			Tuple of predicted (x, y) coordinates
+		"""
+		measurement = np.array([x, y], dtype=np.float64)
+		
+		if self.position is None:
+			self.position = measurement
+			self.last_timestamp = timestamp
+			return int(x), int(y)
+		
+		dt = timestamp - self.last_timestamp
+		if dt > 0:
+			self._record_error(measurement, timestamp)
+			
+			# Alpha-beta update with the real time between samples
+			expected = self.position + self.velocity * dt
+			residual = measurement - expected
+			previous_speed = np.linalg.norm(self.velocity)
+			self.position = expected + self.alpha * residual
+			self.velocity = self.velocity + (self.beta / dt) * residual
+			self.last_timestamp = timestamp
+			
+			# Damp prediction for slow movement and while the hand is braking
+			speed = np.linalg.norm(self.velocity)
+			self.confidence = speed ** 2 / (speed ** 2 + PREDICTION_MIN_SPEED ** 2)
+			if previous_speed > 0 and speed < previous_speed:
+				self.confidence *= speed / previous_speed
+		
+		# Extrapolate over the measured latency, but never beyond the configured horizon
+		horizon = min(max(now - self.last_timestamp, 0.0), self.horizon_ms / 1000.0)
+		predicted = self.position + self.velocity * horizon * self.confidence
+		self.pending.append((self.last_timestamp + horizon, predicted))
+		return int(predicted[0]), int(predicted[1])
+	
+	def _record_error(self, measurement, timestamp):
+		"""Compare predictions made for this moment with where the finger actually is"""
+		while self.pending and self.pending[0][0] <= timestamp:
+			_, predicted = self.pending.popleft()
+			error = float(np.linalg.norm(predicted - measurement))
+			if self.average_error is None:
+				self.average_error = error
+			else:
+				self.average_error = 0.05 * error + 0.95 * self.average_error
+	
+	def get_average_error(self):
+		"""
+		Average distance between predicted and actual positions
+
+		Returns:
+			Error in pixels, or None before the first comparison
+		"""
+		return self.average_error
+	
+	def reset(self):
+		"""Reset filter state (keeps the error statistics)"""
+		self.position = None
+		self.velocity = np.zeros(2)
+		self.last_timestamp = None
+		self.confidence = 0.0
+		self.pending.clear()
+
+
+class PinchPredictor:
+	"""
+	Follows the distance between two fingertips and tells when it is closing fast enough to
+	cross the pinch threshold within the prediction horizon
+	"""
+	
+	def __init__(self, horizon_ms=PINCH_PREDICTION_MS, min_speed=PINCH_MIN_CLOSING_SPEED,
+				 min_opening_speed=PINCH_MIN_OPENING_SPEED):
+		self.horizon_ms = horizon_ms
+		self.min_speed = min_speed  # Closing speed below this never predicts a pinch
+		self.min_opening_speed = min_opening_speed  # Slower separation is landmark jitter
+		self.distance = None
+		self.velocity = 0.0  # Distance change per second (negative = closing)
+		self.last_timestamp = None
+	
+	def update(self, distance, timestamp):
+		"""
+		Add a distance sample (repeated timestamps are ignored)
+
+		Args:
+			distance: Fingertip distance (frame widths)
+			timestamp: Capture time of the landmarks in seconds
+		"""
+		if distance is None or timestamp is None:
+			self.reset()
+			return
+		if self.last_timestamp is not None and timestamp <= self.last_timestamp:
+			return
+		
+		if self.distance is not None:
+			raw_velocity = (distance - self.distance) / (timestamp - self.last_timestamp)
+			self.velocity = 0.5 * raw_velocity + 0.5 * self.velocity
+		self.distance = distance
+		self.last_timestamp = timestamp
+	
+	def will_close(self, threshold):
+		"""
+		Check whether the distance will drop below the threshold within the horizon
+
+		Args:
+			threshold: Pinch distance threshold
+		"""
+		if self.distance is None or -self.velocity < self.min_speed:
+			return False
+		return self.distance + self.velocity * self.horizon_ms / 1000.0 < threshold
+	
+	def is_opening(self):
+		"""True once the fingertips clearly move apart again"""
+		return self.velocity > self.min_opening_speed
+	
+	def reset(self):
+		"""Forget the distance history"""
+		self.distance = None
+		self.velocity = 0.0
+		self.last_timestamp = None
+
+
+class GestureDebouncer:
+	"""
+	Hold/release hysteresis for one hand pose, measured in capture time instead of frames
+	The pose becomes active after being seen for enter_ms and inactive after being gone for exit_ms
+	"""
+	
+	def __init__(self, enter_ms, exit_ms):
+		self.enter_ms = enter_ms
+		self.exit_ms = exit_ms
+		self.active = False
+		self.entered = False  # Became active on the last update
+		self.exited = False  # Became inactive on the last update
+		self.change_start = None  # When the raw pose started to disagree with the state
+	
+	def update(self, detected, timestamp):
+		"""
+		Feed the raw pose of one frame
+
+		Args:
+			detected: Whether the pose is seen in this frame
+			timestamp: Capture time in seconds (time.monotonic())
+
+		Returns:
+			Debounced state
+		"""
+		self.entered = self.exited = False
+		
+		if detected == self.active:
+			self.change_start = None
+			return self.active
+		
+		if self.change_start is None:
+			self.change_start = timestamp
+		
+		hold_ms = self.enter_ms if detected else self.exit_ms
+		if (timestamp - self.change_start) * 1000 >= hold_ms:
+			self.active = detected
+			self.entered = detected
+			self.exited = not detected
+			self.change_start = None
+		return self.active
+	
+	def enter_now(self):
+		"""Become active right away, skipping the rest of the enter hold"""
+		if not self.active:
+			self.active = True
+			self.entered = True
+			self.change_start = None
+	
+	def reset(self):
+		"""Drop the pose without reporting an exit"""
+		self.active = False
+		self.entered = self.exited = False
+		self.change_start = None
 
 
 class GestureStabilizer: